@@ -0,0 +1,11 @@
+"""SmartZone controller collector."""
+from app.collector.smartzone import SmartZoneClient, SmartZoneError
+from app.collector.collector import SmartZoneCollector, DeltaTracker, PollStats
+
+__all__ = [
+    "SmartZoneClient",
+    "SmartZoneError",
+    "SmartZoneCollector",
+    "DeltaTracker",
+    "PollStats",
+]
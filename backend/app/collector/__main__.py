@@ -0,0 +1,44 @@
+"""Run the SmartZone collector: python -m app.collector"""
+import argparse
+import asyncio
+from app.config import settings
+from app.collector.smartzone import SmartZoneClient
+from app.collector.collector import SmartZoneCollector
+from app.database.influx_client import influx_service
+from app.services.venue_registry import venue_registry
+
+
+async def main(args: argparse.Namespace) -> None:
+    client = SmartZoneClient(
+        args.url or settings.smartzone_url,
+        settings.smartzone_username,
+        settings.smartzone_password,
+        verify_tls=settings.smartzone_verify_tls,
+        page_size=settings.collector_page_size,
+        max_connections=settings.collector_concurrency * 2,
+    )
+    collector = SmartZoneCollector(
+        client,
+        venue_registry.get(args.venue_id or settings.collector_venue_id),
+        concurrency=settings.collector_concurrency,
+        full_refresh=settings.collector_full_refresh_seconds,
+    )
+    influx_service.connect()
+    try:
+        if args.once:
+            stats = await collector.poll_once()
+            print(f"Wrote {stats.points} points ({stats.fields_written}/{stats.fields_total} fields)")
+        else:
+            await collector.run_forever(args.interval or settings.collector_interval_seconds)
+    finally:
+        await client.close()
+        influx_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll a SmartZone controller into InfluxDB")
+    parser.add_argument("--url", type=str, default=None, help="SmartZone API base URL (overrides SMARTZONE_URL)")
+    parser.add_argument("--venue-id", type=str, default=None, help="Venue the controller belongs to")
+    parser.add_argument("--interval", type=float, default=None, help="Seconds between polls")
+    parser.add_argument("--once", action="store_true", help="Run a single poll and exit")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,281 @@
+"""SmartZone -> InfluxDB collector with per-field delta detection."""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from influxdb_client import Point
+from app.collector.smartzone import SmartZoneClient
+from app.database.influx_client import influx_service
+from app.services.venue_registry import VenueScope
+
+
+@dataclass
+class Record:
+    """One point to write, before delta filtering."""
+    measurement: str
+    key: Tuple[str, ...]
+    tags: Dict[str, str]
+    fields: Dict[str, Any]
+
+
+@dataclass
+class PollStats:
+    """Outcome of one collection cycle."""
+    zones: int = 0
+    records: int = 0
+    points: int = 0
+    fields_total: int = 0
+    fields_written: int = 0
+    failed_zones: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass
+class _Written:
+    tags: Dict[str, str]
+    fields: Dict[str, Any]
+    at: float
+
+
+class DeltaTracker:
+    """Remembers what was last written per series and returns only changes.
+
+    A series is rewritten in full when its tags change (it is a new series in
+    InfluxDB) or when ``full_refresh`` seconds have passed, so ``last()``
+    queries over a bounded range still find every live AP and client.
+    """
+
+    def __init__(self, full_refresh: float):
+        self.full_refresh = full_refresh
+        self._last: Dict[Tuple[str, ...], _Written] = {}
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def _stale(self, prev: Optional[_Written], record: Record, now: float) -> bool:
+        return prev is None or prev.tags != record.tags or now - prev.at >= self.full_refresh
+
+    def diff(self, record: Record, now: float) -> Dict[str, Any]:
+        """Fields of ``record`` that need writing; ``commit`` them once written."""
+        prev = self._last.get(record.key)
+        if self._stale(prev, record, now):
+            return record.fields
+        return {k: v for k, v in record.fields.items() if prev.fields.get(k) != v}
+
+    def commit(self, written: Iterable[Tuple[Record, Dict[str, Any]]], now: float) -> None:
+        """Remember ``(record, fields)`` pairs returned by ``diff`` as stored.
+
+        Called only after the write succeeded, so fields of a failed write
+        are sent again by the next cycle.
+        """
+        for record, fields in written:
+            prev = self._last.get(record.key)
+            if self._stale(prev, record, now):
+                self._last[record.key] = _Written(record.tags, dict(record.fields), now)
+            else:
+                prev.fields.update(fields)
+
+    def retain(self, keys: Iterable[Tuple[str, ...]]) -> None:
+        """Forget series not present in the latest snapshot."""
+        live = set(keys)
+        for key in [k for k in self._last if k not in live]:
+            del self._last[key]
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def ap_records(ap: Dict[str, Any]) -> List[Record]:
+    """Map a SmartZone AP entry to ap_metrics and radio_metrics records."""
+    mac = str(ap.get("apMac"))
+    zone_id = str(ap.get("zoneId"))
+    records = [Record(
+        measurement="ap_metrics",
+        key=("ap_metrics", mac),
+        tags={
+            "apMac": mac,
+            "apName": str(ap.get("deviceName") or mac),
+            "model": str(ap.get("model") or ""),
+            "zoneId": zone_id,
+            "zoneName": str(ap.get("zoneName") or zone_id),
+            "status": str(ap.get("status") or "offline").lower(),
+            "ip": str(ap.get("ip") or ""),
+        },
+        fields={
+            "clientCount": _int(ap.get("numClients")),
+            "channelUtilization": _int(ap.get("channelUtilization")),
+            "airtimeUtilization": _int(ap.get("airtime")),
+            "cpuUtilization": _int(ap.get("cpuPercentage")),
+            "memoryUtilization": _int(ap.get("memoryPercentage")),
+            "firmwareVersion": str(ap.get("firmwareVersion") or ""),
+            "serialNumber": str(ap.get("serial") or ""),
+        },
+    )]
+    for radio in ap.get("radios") or []:
+        band = str(radio.get("band"))
+        records.append(Record(
+            measurement="radio_metrics",
+            key=("radio_metrics", mac, band),
+            tags={"apMac": mac, "zoneId": zone_id, "band": band},
+            fields={
+                "channel": _int(radio.get("channel")),
+                "txPower": _int(radio.get("txPower")),
+                "noiseFloor": _int(radio.get("noiseFloor")),
+                "clientCount": _int(radio.get("numClients")),
+            },
+        ))
+    return records
+
+
+def client_record(client: Dict[str, Any], zone_id: str) -> Record:
+    """Map a SmartZone client entry to a client_metrics record."""
+    mac = str(client.get("clientMac"))
+    rx = _int(client.get("rxBytes"))
+    tx = _int(client.get("txBytes"))
+    return Record(
+        measurement="client_metrics",
+        key=("client_metrics", mac),
+        tags={
+            "macAddress": mac,
+            "apMac": str(client.get("apMac") or ""),
+            "apName": str(client.get("apName") or ""),
+            "zoneId": zone_id,
+            "wlan": str(client.get("ssid") or ""),
+            "os": str(client.get("osType") or "Unknown"),
+            "deviceType": str(client.get("deviceType") or "other"),
+        },
+        fields={
+            "hostname": str(client.get("hostname") or ""),
+            "modelName": str(client.get("modelName") or "Unknown"),
+            "ipAddress": str(client.get("ipAddress") or ""),
+            "dataUsage": round((rx + tx) / 1_000_000, 1),
+            "rxBytes": rx,
+            "txBytes": tx,
+        },
+    )
+
+
+def zone_record(zone: Dict[str, Any], aps: List[Dict[str, Any]], clients: List[Dict[str, Any]]) -> Record:
+    """Derive zone_metrics counters from the zone's AP and client lists."""
+    total = len(aps)
+    connected = sum(1 for ap in aps if str(ap.get("status")).lower() == "online")
+    return Record(
+        measurement="zone_metrics",
+        key=("zone_metrics", str(zone["id"])),
+        tags={"zoneId": str(zone["id"]), "zoneName": str(zone.get("name") or zone["id"])},
+        fields={
+            "totalAPs": total,
+            "connectedAPs": connected,
+            "disconnectedAPs": total - connected,
+            "clients": len(clients),
+            "apAvailability": round(connected / total * 100, 1) if total else 0.0,
+            "clientsPerAP": round(len(clients) / connected, 2) if connected else 0.0,
+        },
+    )
+
+
+class SmartZoneCollector:
+    """Polls a controller concurrently and writes changed fields only."""
+
+    def __init__(
+        self,
+        client: SmartZoneClient,
+        venue: VenueScope,
+        concurrency: int = 8,
+        full_refresh: float = 600.0,
+    ):
+        self.client = client
+        self.venue = venue
+        self.concurrency = concurrency
+        self.tracker = DeltaTracker(full_refresh)
+
+    async def _zone(self, zone: Dict[str, Any], semaphore: asyncio.Semaphore) -> List[Record]:
+        async with semaphore:
+            aps, clients = await asyncio.gather(
+                self.client.zone_aps(zone["id"]),
+                self.client.zone_clients(zone["id"]),
+            )
+        records = [zone_record(zone, aps, clients)]
+        for ap in aps:
+            records.extend(ap_records(ap))
+        records.extend(client_record(c, str(zone["id"])) for c in clients)
+        return records
+
+    async def collect(self, stats: PollStats) -> List[Record]:
+        """Fetch a full snapshot of all zones, at most ``concurrency`` at once."""
+        zones = await self.client.zones()
+        stats.zones = len(zones)
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        results = await asyncio.gather(
+            *(self._zone(z, semaphore) for z in zones), return_exceptions=True
+        )
+        records: List[Record] = []
+        for zone, result in zip(zones, results):
+            if isinstance(result, BaseException):
+                stats.failed_zones.append(str(zone.get("id")))
+                continue
+            records.extend(result)
+        return records
+
+    def to_points(
+        self, records: List[Record], stats: PollStats, now: float
+    ) -> Tuple[List[Point], List[Tuple[Record, Dict[str, Any]]]]:
+        """Apply delta detection and build the points to write.
+
+        Returns the points and the ``(record, changed fields)`` pairs to
+        ``commit`` to the tracker once the points are written.
+        """
+        points: List[Point] = []
+        written: List[Tuple[Record, Dict[str, Any]]] = []
+        for record in records:
+            changed = self.tracker.diff(record, now)
+            stats.fields_total += len(record.fields)
+            if not changed:
+                continue
+            stats.fields_written += len(changed)
+            point = Point(record.measurement).tag("venueId", self.venue.id)
+            for k, v in record.tags.items():
+                point = point.tag(k, v)
+            for k, v in changed.items():
+                point = point.field(k, v)
+            points.append(point.time(int(now * 1e9)))
+            written.append((record, changed))
+        return points, written
+
+    async def poll_once(self) -> PollStats:
+        """Run one collection cycle and write the changes."""
+        stats = PollStats()
+        started = time.monotonic()
+        records = await self.collect(stats)
+        stats.records = len(records)
+        now = time.time()
+        points, written = self.to_points(records, stats, now)
+        if not stats.failed_zones:
+            # a failed zone is missing from the snapshot, not gone
+            self.tracker.retain(r.key for r in records)
+        if points:
+            await asyncio.to_thread(influx_service.write, self.venue.bucket, points)
+        self.tracker.commit(written, now)
+        stats.points = len(points)
+        stats.seconds = time.monotonic() - started
+        return stats
+
+    async def run_forever(self, interval: float) -> None:
+        """Poll on a fixed interval until cancelled."""
+        while True:
+            started = time.monotonic()
+            try:
+                stats = await self.poll_once()
+                print(
+                    f"Collected {stats.zones} zones, {stats.records} records: wrote "
+                    f"{stats.points} points ({stats.fields_written}/{stats.fields_total} fields) "
+                    f"in {stats.seconds:.2f}s"
+                    + (f", failed zones: {', '.join(stats.failed_zones)}" if stats.failed_zones else "")
+                )
+            except Exception as e:
+                print(f"Warning: collection cycle failed: {e}")
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
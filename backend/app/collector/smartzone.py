@@ -0,0 +1,109 @@
+"""Async client for the SmartZone public REST API."""
+import asyncio
+from typing import Any, Dict, List, Optional
+import httpx
+
+
+class SmartZoneError(Exception):
+    """Raised when the controller rejects a request."""
+
+
+class SmartZoneClient:
+    """Minimal SmartZone (vSZ/SZ) public API client.
+
+    One ``httpx.AsyncClient`` is shared by all requests so connections to the
+    controller are pooled and reused across polls. List endpoints are paged
+    transparently.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: Optional[str],
+        verify_tls: bool = True,
+        page_size: int = 500,
+        max_connections: int = 16,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.page_size = page_size
+        self._ticket: Optional[str] = None
+        self._login_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            verify=verify_tls,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+    async def login(self, stale: Optional[str] = None) -> None:
+        """Obtain a service ticket.
+
+        Concurrent callers share one login: if the ticket was already replaced
+        since ``stale`` was observed, nothing is done.
+        """
+        async with self._login_lock:
+            if self._ticket is not None and self._ticket != stale:
+                return
+            resp = await self._http.post(
+                "/serviceTicket",
+                json={"username": self.username, "password": self.password or ""},
+            )
+            if resp.status_code != 200:
+                raise SmartZoneError(f"Login failed: HTTP {resp.status_code}")
+            self._ticket = resp.json()["serviceTicket"]
+
+    async def _request(
+        self, method: str, path: str, params: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Dict[str, Any]:
+        if self._ticket is None:
+            await self.login()
+        for attempt in range(2):
+            ticket = self._ticket
+            resp = await self._http.request(
+                method, path, params={**(params or {}), "serviceTicket": ticket}, **kwargs
+            )
+            if resp.status_code == 401 and attempt == 0:
+                await self.login(stale=ticket)
+                continue
+            if resp.status_code >= 400:
+                raise SmartZoneError(f"{method} {path}: HTTP {resp.status_code}")
+            return resp.json()
+        raise SmartZoneError(f"{method} {path}: unauthorized")
+
+    async def _query_all(self, path: str, filters: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            body = {"filters": filters, "limit": self.page_size, "page": page}
+            data = await self._request("POST", path, json=body)
+            items.extend(data.get("list") or [])
+            if not data.get("hasMore"):
+                return items
+            page += 1
+
+    async def zones(self) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        index = 0
+        while True:
+            params = {"index": index, "listSize": self.page_size}
+            data = await self._request("GET", "/rkszones", params=params)
+            items.extend(data.get("list") or [])
+            if not data.get("hasMore"):
+                return items
+            index += self.page_size
+
+    async def zone_aps(self, zone_id: str) -> List[Dict[str, Any]]:
+        return await self._query_all("/query/ap", [{"type": "ZONE", "value": zone_id}])
+
+    async def zone_clients(self, zone_id: str) -> List[Dict[str, Any]]:
+        return await self._query_all("/query/client", [{"type": "ZONE", "value": zone_id}])
@@ -1,9 +1,20 @@
 """Configuration settings for the FastAPI application."""
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import BaseModel, field_validator
 from typing import Optional, List, Union
 
 
+class VenueConfig(BaseModel):
+    """A venue served by the API and where its metrics are stored.
+
+    Venues with a ``bucket`` get their own bucket; venues without one share
+    ``influxdb_bucket`` and are partitioned by the ``venueId`` tag.
+    """
+    id: str
+    name: str
+    bucket: Optional[str] = None
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -20,6 +31,106 @@ class Settings(BaseSettings):
     )
     influxdb_org: str = "wifi-org"
     influxdb_bucket: str = "wifi-streaming"
+    influxdb_connect_retry_seconds: float = 5.0
+
+    # Venues (JSON via env: VENUES='[{"id": "v1", "name": "...", "bucket": "..."}]').
+    # When empty, a single default venue reading the whole bucket is served.
+    venues: List[VenueConfig] = []
+    default_venue_id: str = "main-venue"
+    default_venue_name: str = "GA29532-P - Signal House"
+    venue_fanout_concurrency: int = 8
+
+    # Anomaly detection (EWMA z-score over zone/AP metrics)
+    anomaly_detection_enabled: bool = False
+    anomaly_poll_interval_seconds: int = 60
+    anomaly_ewma_alpha: float = 0.1
+    anomaly_z_threshold: float = 3.0
+    anomaly_warmup_samples: int = 10
+    anomaly_cooldown_seconds: float = 900.0
+    anomaly_max_series: int = 100_000
+
+    # Ingestion (POST /api/ingest -> bounded buffer -> batched writes)
+    ingest_queue_max_lines: int = 200_000
+    ingest_batch_size: int = 5_000
+    ingest_flush_interval_seconds: float = 1.0
+    ingest_max_retries: int = 5
+    ingest_retry_backoff_seconds: float = 0.5
+    ingest_max_body_bytes: int = 16 * 1024 * 1024
+
+    # SmartZone collector (python -m app.collector)
+    smartzone_url: str = "http://localhost:8443/wsg/api/public/v9_1"
+    smartzone_username: str = "admin"
+    smartzone_password: Optional[str] = None
+    smartzone_verify_tls: bool = True
+    collector_venue_id: Optional[str] = None
+    collector_interval_seconds: float = 60.0
+    collector_concurrency: int = 8
+    collector_page_size: int = 500
+    collector_full_refresh_seconds: float = 600.0
+
+    # RF analytics: reuse the per-venue radio snapshot for this long
+    rf_snapshot_ttl_seconds: float = 60.0
+
+    # Zone rankings: hourly per-zone t-digests, kept for twice the longest window
+    zone_rankings_max_window_days: int = 30
+    zone_digest_compression: float = 50.0
+
+    # Distinct clients: hourly per-zone HyperLogLog sketches built in the background
+    unique_clients_enabled: bool = True
+    unique_clients_poll_interval_seconds: float = 300.0
+    unique_clients_retention_days: int = 7
+    unique_clients_hll_precision: int = 12
+
+    # AP history: per-AP ring buffers of recent ap_metrics samples (opt-in; about
+    # 40 KiB per AP at capacity 1440, for at most ap_history_max_aps APs per venue)
+    ap_history_enabled: bool = False
+    ap_history_poll_interval_seconds: float = 60.0
+    ap_history_capacity: int = 1440
+    ap_history_backfill_hours: int = 24
+    ap_history_max_aps: int = 2000
+
+    # Influx query scheduler: slots per class, shed load once the queue is full
+    influx_max_concurrency: int = 16
+    influx_interactive_concurrency: int = 12
+    influx_export_concurrency: int = 2
+    influx_background_concurrency: int = 4
+    influx_max_queued: int = 200
+    influx_queue_timeout_seconds: float = 10.0
+
+    # Query result cache: LRU in memory plus a SQLite file that survives restarts
+    # (empty cache_path disables the disk tier; a TTL of 0 disables caching for that route)
+    cache_path: str = ".cache/query_cache.sqlite3"
+    cache_max_entries: int = 512
+    cache_max_stale_seconds: float = 3600.0
+    venue_cache_ttl_seconds: float = 30.0
+    anomalies_cache_ttl_seconds: float = 60.0
+    clients_cache_ttl_seconds: float = 30.0
+    os_distribution_cache_ttl_seconds: float = 120.0
+    hosts_cache_ttl_seconds: float = 120.0
+    cause_codes_cache_ttl_seconds: float = 120.0
+
+    # Background refresh: jobs wait their interval +/- refresh_jitter (a fraction of it)
+    # between runs and are cancelled after refresh_timeout_seconds (0: no timeout).
+    # Precomputed views are reloaded into the query cache on these intervals (0 disables)
+    refresh_jitter: float = 0.1
+    refresh_timeout_seconds: float = 120.0
+    venue_refresh_seconds: float = 20.0
+    os_distribution_refresh_seconds: float = 60.0
+    hosts_refresh_seconds: float = 60.0
+    cause_codes_refresh_seconds: float = 60.0
+
+    # Result budgets: rows / response bytes read per query before the result is
+    # truncated and flagged (X-Result-Truncated); 0 disables a limit
+    clients_max_rows: int = 400_000
+    clients_max_bytes: int = 128 * 1024 * 1024
+    anomalies_max_rows: int = 60_000
+    anomalies_max_bytes: int = 32 * 1024 * 1024
+    os_distribution_max_rows: int = 200_000
+    os_distribution_max_bytes: int = 64 * 1024 * 1024
+
+    # Time series: cap points per series by widening the interval
+    time_series_max_points: int = 1440
+    time_series_max_range_days: int = 90
 
     # Authentication
     jwt_secret_key: str = "your-secret-key-change-in-production"
@@ -0,0 +1,226 @@
+"""Lazy parser for InfluxDB annotated CSV query responses."""
+import codecs
+import csv
+import io
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+READ_CHUNK_BYTES = 64 * 1024
+
+# Columns that describe the response framing rather than the data
+_SKIP_COLUMNS = frozenset({"", "result", "table"})
+
+
+class FluxQueryError(Exception):
+    """Raised when InfluxDB reports an error inside the CSV response."""
+
+
+def _parse_time(value: str) -> datetime:
+    # RFC3339 with up to nanosecond precision and a "Z" suffix
+    if value.endswith("Z"):
+        value = value[:-1]
+    if "." in value:
+        head, frac = value.split(".", 1)
+        value = f"{head}.{frac[:6]:0<6}"
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def _parse_bool(value: str) -> bool:
+    return value == "true"
+
+
+# (data columns as (index, name, datatype, default), data rows) of one table block
+CSVBlock = Tuple[List[Tuple[int, str, str, Optional[str]]], List[List[str]]]
+
+_CONVERTERS: Dict[str, Optional[Callable[[str], Any]]] = {
+    "string": None,
+    "tag": None,
+    "long": int,
+    "unsignedLong": int,
+    "double": float,
+    "boolean": _parse_bool,
+    "dateTime:RFC3339": _parse_time,
+    "dateTime:RFC3339Nano": _parse_time,
+    "duration": int,
+}
+
+
+def converter(datatype: str) -> Optional[Callable[[str], Any]]:
+    """Parser for non-empty cells of an annotated CSV ``datatype``; None keeps the text."""
+    return _CONVERTERS.get(datatype)
+
+
+def iter_annotated_csv(rows: Iterable[List[str]]) -> Iterator[Dict[str, Any]]:
+    """Yield one dictionary per data row of an annotated CSV response.
+
+    ``rows`` are already split CSV rows (e.g. from ``QueryApi.query_csv``).
+    Only the current table's column layout is kept, so memory use is
+    independent of the number of rows. Empty cells become ``None`` unless
+    the table declares a ``#default`` for the column.
+    """
+    datatypes: List[str] = []
+    defaults: List[str] = []
+    columns: Optional[List[Tuple[int, str, Optional[Callable[[str], Any]], Any]]] = None
+
+    rows = iter(rows)
+    for row in rows:
+        if not row or (len(row) == 1 and not row[0]):
+            # blank line: the next table starts with new annotations
+            columns = None
+            continue
+        first = row[0]
+        if first == "#datatype":
+            datatypes = row
+            columns = None
+            continue
+        if first == "#default":
+            defaults = row
+            continue
+        if first.startswith("#"):
+            continue
+
+        if columns is None:
+            if "error" in row and "reference" in row:
+                raise FluxQueryError(_error_message(rows, row.index("error")))
+            columns = []
+            for i, name in enumerate(row):
+                if name in _SKIP_COLUMNS:
+                    continue
+                dtype = datatypes[i] if i < len(datatypes) else "string"
+                convert = _CONVERTERS.get(dtype)
+                default = defaults[i] if i < len(defaults) and defaults[i] != "" else None
+                if default is not None and convert is not None:
+                    default = convert(default)
+                columns.append((i, name, convert, default))
+            continue
+
+        record: Dict[str, Any] = {}
+        for i, name, convert, default in columns:
+            value = row[i] if i < len(row) else ""
+            if value == "":
+                record[name] = default
+            else:
+                record[name] = convert(value) if convert is not None else value
+        yield record
+
+
+def iter_annotated_blocks(rows: Iterable[List[str]]) -> Iterator[CSVBlock]:
+    """Yield each annotated table block with its cells left as strings.
+
+    A block is one ``#datatype``/header section of the response (possibly
+    several tables sharing a layout). Yields ``(columns, data rows)`` where
+    ``columns`` lists ``(index, name, datatype, default)`` for the data
+    columns; cells are not converted, so columnar readers can parse each
+    column in one step.
+    """
+    datatypes: List[str] = []
+    defaults: List[str] = []
+    columns: Optional[List[Tuple[int, str, str, Optional[str]]]] = None
+    data: List[List[str]] = []
+
+    rows = iter(rows)
+    for row in rows:
+        if not row or (len(row) == 1 and not row[0]) or row[0] == "#datatype":
+            if columns is not None and data:
+                yield columns, data
+            columns, data = None, []
+            if row and row[0] == "#datatype":
+                datatypes = row
+            continue
+        first = row[0]
+        if first == "#default":
+            defaults = row
+            continue
+        if first.startswith("#"):
+            continue
+
+        if columns is None:
+            if "error" in row and "reference" in row:
+                raise FluxQueryError(_error_message(rows, row.index("error")))
+            columns = [
+                (
+                    i,
+                    name,
+                    datatypes[i] if i < len(datatypes) else "string",
+                    defaults[i] if i < len(defaults) and defaults[i] != "" else None,
+                )
+                for i, name in enumerate(row)
+                if name not in _SKIP_COLUMNS
+            ]
+            continue
+        data.append(row)
+    if columns is not None and data:
+        yield columns, data
+
+
+def _error_message(rows: Iterator[List[str]], column: int) -> str:
+    """Return the message of the error table whose header was just read."""
+    for row in rows:
+        if len(row) > column and row[column]:
+            return row[column]
+    return "unknown query error"
+
+
+class FluxRowStream:
+    """Rows of one streamed query response, parsed as they arrive.
+
+    Counts the response bytes received so far (``bytes_read``) and releases
+    the HTTP response when exhausted. ``close`` before the end drops the
+    connection, which stops InfluxDB from sending the rest.
+    """
+
+    def __init__(self, response: Any):
+        self._response = response
+        self.bytes_read = 0
+        self._closed = False
+        self._csv = csv.reader(self._lines())
+        self._rows = iter_annotated_csv(self._csv)
+
+    def _lines(self) -> Iterator[str]:
+        # decode and split whole chunks rather than line by line; a partial
+        # last line (including a CR whose LF is in the next chunk) is carried over
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        tail = ""
+        for chunk in self._response.stream(READ_CHUNK_BYTES):
+            self.bytes_read += len(chunk)
+            lines = io.StringIO(tail + decoder.decode(chunk), newline="").readlines()
+            tail = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+            yield from lines
+        tail += decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def __iter__(self) -> "FluxRowStream":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        try:
+            return next(self._rows)
+        except StopIteration:
+            self.close(finished=True)
+            raise
+        except BaseException:
+            self.close()
+            raise
+
+    def blocks(self) -> Iterator[CSVBlock]:
+        """The response as raw table blocks (see ``iter_annotated_blocks``) instead of row dictionaries.
+
+        Use either this or row iteration, not both.
+        """
+        try:
+            yield from iter_annotated_blocks(self._csv)
+        except BaseException:
+            self.close()
+            raise
+        self.close(finished=True)
+
+    def close(self, finished: bool = False) -> None:
+        """Release the response; unless ``finished``, the connection is dropped."""
+        if self._closed:
+            return
+        self._closed = True
+        if finished:
+            self._response.release_conn()
+        else:
+            self._response.close()
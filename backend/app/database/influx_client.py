@@ -1,32 +1,59 @@
-"""InfluxDB client for reading metrics."""
-from influxdb_client import InfluxDBClient
-from influxdb_client.client.write_api import SYNCHRONOUS
-from typing import Optional, List, Dict, Any
+"""InfluxDB client for reading and writing metrics."""
+import threading
+from typing import Optional, List, Dict, Any, Callable, Iterator
 from app.config import settings
+from app.database.flux_csv import FluxRowStream
+from app.database.query_scheduler import BACKGROUND, EXPORT, INTERACTIVE, QueryScheduler
 
 
 class InfluxDBService:
     """Service for interacting with InfluxDB."""
     
     def __init__(self):
-        self.client: Optional[InfluxDBClient] = None
+        self.client = None
         self.write_api = None
         self.query_api = None
+        self._connect_lock = threading.Lock()
+        self.scheduler = QueryScheduler(
+            max_concurrency=settings.influx_max_concurrency,
+            class_limits={
+                INTERACTIVE: settings.influx_interactive_concurrency,
+                EXPORT: settings.influx_export_concurrency,
+                BACKGROUND: settings.influx_background_concurrency,
+            },
+            max_queued=settings.influx_max_queued,
+            queue_timeout=settings.influx_queue_timeout_seconds,
+        )
     
     def connect(self):
-        """Connect to InfluxDB."""
-        self.client = InfluxDBClient(
-            url=settings.influxdb_url,
-            token=settings.influxdb_token,
-            org=settings.influxdb_org
-        )
-        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
-        self.query_api = self.client.query_api()
+        """Connect to InfluxDB.
+
+        ``influxdb_client`` is imported here rather than at module load so
+        the app can start serving before the client library is loaded.
+        Safe to call from several threads; only the first call connects.
+        """
+        with self._connect_lock:
+            if self.client is not None:
+                return
+            from influxdb_client import InfluxDBClient
+            from influxdb_client.client.write_api import SYNCHRONOUS
+
+            client = InfluxDBClient(
+                url=settings.influxdb_url,
+                token=settings.influxdb_token,
+                org=settings.influxdb_org
+            )
+            self.write_api = client.write_api(write_options=SYNCHRONOUS)
+            self.query_api = client.query_api()
+            self.client = client
     
     def close(self):
         """Close InfluxDB connection."""
         if self.client:
             self.client.close()
+            self.client = None
+            self.write_api = None
+            self.query_api = None
     
     def query(self, query: str):
         """Execute a Flux query."""
@@ -34,26 +61,65 @@ class InfluxDBService:
             self.connect()
         return self.query_api.query(query)
 
+    def write(self, bucket: str, record: Any, write_precision: str = "ns"):
+        """Write points or line protocol to ``bucket`` (blocking)."""
+        if not self.write_api:
+            self.connect()
+        self.write_api.write(
+            bucket=bucket,
+            org=settings.influxdb_org,
+            record=record,
+            write_precision=write_precision,
+        )
+
+    def query_stream(self, query: str) -> FluxRowStream:
+        """Execute a Flux query and lazily yield one dictionary per record.
+
+        Rows are parsed straight from the annotated CSV response as they are
+        consumed; no ``FluxTable``/``FluxRecord`` objects are built, so memory
+        use does not grow with the size of the result and the first row is
+        available as soon as it arrives. Closing the stream early abandons
+        the rest of the response.
+        """
+        if not self.query_api:
+            self.connect()
+        return FluxRowStream(self.query_api.query_raw(query))
+
     def query_dicts(self, query: str) -> List[Dict[str, Any]]:
         """Execute a Flux query and return list of dictionaries.
 
         Each record is converted into a dictionary combining values and tags.
+        Prefer ``query_stream`` when the rows are only iterated once.
         """
-        tables = self.query(query)
-        rows: List[Dict[str, Any]] = []
-        for table in tables:
-            for record in table.records:
-                data = {
-                    "_measurement": record.get_measurement(),
-                    "_field": record.get_field(),
-                    "_time": record.get_time(),
-                    "_value": record.get_value(),
-                }
-                for key in record.values:
-                    if key not in data:
-                        data[key] = record.values[key]
-                rows.append(data)
-        return rows
+        return list(self.query_stream(query))
+
+    async def query_async(
+        self,
+        query: str,
+        consume: Callable[[Iterator[Dict[str, Any]]], Any] = list,
+        query_class: str = INTERACTIVE,
+    ) -> Any:
+        """Run a query through the scheduler without blocking the event loop.
+
+        ``consume`` receives the lazy row iterator on a worker thread and its
+        return value is the result. Concurrent calls with the same query and
+        ``consume`` run once and share that result. Raises ``QueryRejected``
+        when the query is shed.
+        """
+        return await self.scheduler.run(
+            (query, consume), lambda: consume(self.query_stream(query)), query_class
+        )
+
+    def query_scheduled(
+        self,
+        query: str,
+        consume: Callable[[Iterator[Dict[str, Any]]], Any] = list,
+        query_class: str = BACKGROUND,
+    ) -> Any:
+        """Blocking ``query_async`` for code running in worker threads."""
+        return self.scheduler.run_threadsafe(
+            (query, consume), lambda: consume(self.query_stream(query)), query_class
+        )
     
     def get_health(self) -> bool:
         """Check if InfluxDB is healthy."""
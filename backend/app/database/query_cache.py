@@ -0,0 +1,221 @@
+"""Two-tier (memory + local SQLite) cache for expensive query results."""
+import asyncio
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.config import settings
+
+Loader = Callable[[], Awaitable[Any]]
+
+# Part of every result key. Bump when cached values change shape in a way
+# the code hash in ``app.routes.dependencies`` cannot see (e.g. a library
+# upgrade changing pickled types); older disk entries are then never read.
+CACHE_SCHEMA = 1
+
+
+@dataclass
+class CacheStats:
+    """Counters exposed by the health endpoint."""
+    hits: int = 0
+    stale: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+
+class DiskCache:
+    """Pickled cache entries in a local SQLite file, shared by all workers.
+
+    Entries carry wall-clock expiry so they survive restarts. The file is a
+    private, trusted cache: it is unpickled without validation and must not
+    be writable by anyone else. Entries that fail to load are dropped.
+    """
+
+    def __init__(self, path: str, max_stale: float):
+        self.path = path
+        self.max_stale = max_stale
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            # entries too stale to ever be served again
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time() - self.max_stale,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return ``(value, expires_at)`` or ``None``."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                return pickle.loads(row[0]), row[1]
+            except Exception:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+    def put(self, key: str, value: Any, expires_at: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, blob, time.time(), expires_at),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class QueryCache:
+    """Stale-while-revalidate cache with an LRU memory tier and an optional disk tier.
+
+    * A fresh entry (younger than its ``ttl``) is returned directly.
+    * An expired entry up to ``max_stale`` seconds past its expiry is still
+      returned, and one background refresh per key reloads it.
+    * Memory misses fall through to the disk tier, so a restarted worker
+      answers from the previous process's results while it refreshes them.
+    * Otherwise the caller waits for the load; concurrent misses for a key
+      share one load.
+
+    Cached values are shared between requests; treat them as read-only.
+    All methods except ``close`` must be called on the event loop.
+    """
+
+    def __init__(self, max_entries: int, max_stale: float, disk: Optional[DiskCache] = None):
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self.disk = disk
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable key across processes and restarts for the given parts."""
+        return hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if self.disk is None:
+            return None
+        try:
+            entry = await asyncio.to_thread(self.disk.get, key)
+        except Exception as e:
+            # an unreadable disk tier is a miss, never a failed request
+            print(f"Warning: cache entry not read: {e}")
+            return None
+        if entry is not None:
+            self.stats.disk_hits += 1
+            self._remember(key, *entry)
+        return entry
+
+    async def _load(self, key: str, load: Loader, ttl: float) -> Any:
+        try:
+            value = await load()
+            expires_at = time.time() + ttl
+            self._remember(key, value, expires_at)
+            if self.disk is not None:
+                try:
+                    await asyncio.to_thread(self.disk.put, key, value, expires_at)
+                except Exception as e:
+                    print(f"Warning: cache entry not persisted: {e}")
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def _start_load(self, key: str, load: Loader, ttl: float) -> asyncio.Task:
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = asyncio.ensure_future(self._load(key, load, ttl))
+            # the waiting caller may have gone away; don't warn about unretrieved errors
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.stats.refresh_errors += 1
+            print(f"Warning: background cache refresh failed: {task.exception()}")
+
+    async def get(self, key: str, load: Loader, ttl: float, refresh: Optional[Loader] = None) -> Any:
+        """Return the cached value for ``key``, loading it with ``load`` when needed.
+
+        ``refresh`` (default ``load``) reloads stale entries in the
+        background, e.g. under a lower query priority.
+        """
+        entry = await self._lookup(key)
+        if entry is not None:
+            value, expires_at = entry
+            now = time.time()
+            if now < expires_at:
+                self.stats.hits += 1
+                return value
+            if now < expires_at + self.max_stale:
+                self.stats.stale += 1
+                if key not in self._loading:
+                    self.stats.refreshes += 1
+                    self._start_load(key, refresh or load, ttl).add_done_callback(self._refresh_done)
+                return value
+        self.stats.misses += 1
+        return await asyncio.shield(self._start_load(key, load, ttl))
+
+    async def refresh(self, key: str, load: Loader, ttl: float) -> Any:
+        """Reload ``key`` now regardless of its age, sharing a load already in progress.
+
+        Used by scheduled jobs that keep an entry fresh ahead of requests.
+        """
+        self.stats.refreshes += 1
+        return await asyncio.shield(self._start_load(key, load, ttl))
+
+    def close(self) -> None:
+        """Cancel pending refreshes and close the disk tier."""
+        for task in list(self._loading.values()):
+            task.cancel()
+        if self.disk is not None:
+            self.disk.close()
+
+
+# Global instance
+query_cache = QueryCache(
+    max_entries=settings.cache_max_entries,
+    max_stale=settings.cache_max_stale_seconds,
+    disk=DiskCache(settings.cache_path, settings.cache_max_stale_seconds) if settings.cache_path else None,
+)
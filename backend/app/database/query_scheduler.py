@@ -0,0 +1,234 @@
+"""Admission control for InfluxDB queries."""
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+INTERACTIVE = "interactive"
+EXPORT = "export"
+BACKGROUND = "background"
+
+# Highest priority first
+QUERY_CLASSES = (INTERACTIVE, EXPORT, BACKGROUND)
+
+
+class QueryRejected(Exception):
+    """Raised when a query is shed instead of queued."""
+
+    def __init__(self, query_class: str, retry_after: int):
+        super().__init__(f"{query_class} query rejected: Influx query capacity exhausted")
+        self.query_class = query_class
+        self.retry_after = retry_after
+
+
+@dataclass
+class SchedulerStats:
+    """Counters exposed by the health endpoint."""
+    started: int = 0
+    deduplicated: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    running: Dict[str, int] = field(default_factory=lambda: {c: 0 for c in QUERY_CLASSES})
+    queued: Dict[str, int] = field(default_factory=lambda: {c: 0 for c in QUERY_CLASSES})
+
+
+@dataclass
+class _Flight:
+    """One execution shared by concurrent callers of the same query."""
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class Lease:
+    """A held query slot; ``release`` may be called more than once."""
+
+    def __init__(self, scheduler: "QueryScheduler", query_class: str):
+        self._scheduler = scheduler
+        self._query_class = query_class
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._scheduler.release(self._query_class)
+
+
+class QueryScheduler:
+    """Bounds concurrent Influx queries per class and in total.
+
+    * Identical in-flight queries share one execution (single-flight).
+    * Each class has its own concurrency limit, and all classes share
+      ``max_concurrency`` slots; freed slots go to interactive queries
+      first, then exports, then background work.
+    * At most ``max_queued`` queries wait. When the queue is full a new
+      query displaces a waiting lower-priority one, otherwise it is
+      rejected with ``QueryRejected``; so is a query that waits longer than
+      ``queue_timeout`` seconds. Callers answer 503 before InfluxDB falls over.
+
+    All methods except ``run_threadsafe`` must be called on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        class_limits: Dict[str, int],
+        max_queued: int,
+        queue_timeout: float,
+    ):
+        self.max_concurrency = max_concurrency
+        self.class_limits = class_limits
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.stats = SchedulerStats()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {c: deque() for c in QUERY_CLASSES}
+        self._inflight: Dict[Hashable, _Flight] = {}
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+    def start(self) -> None:
+        """Bind to the running event loop so worker threads can submit queries."""
+        self.loop = asyncio.get_running_loop()
+
+    def _running_total(self) -> int:
+        return sum(self.stats.running.values())
+
+    def _can_run(self, query_class: str) -> bool:
+        return (
+            self._running_total() < self.max_concurrency
+            and self.stats.running[query_class] < self.class_limits.get(query_class, self.max_concurrency)
+        )
+
+    def _dispatch(self) -> None:
+        for query_class in QUERY_CLASSES:
+            waiters = self._waiters[query_class]
+            while waiters and self._can_run(query_class):
+                waiter = waiters.popleft()
+                self.stats.queued[query_class] -= 1
+                if waiter.done():
+                    continue
+                self.stats.running[query_class] += 1
+                waiter.set_result(None)
+
+    async def acquire(self, query_class: str) -> None:
+        """Wait for a slot in ``query_class`` or raise ``QueryRejected``."""
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        if self._can_run(query_class) and not self._waiters[query_class]:
+            self.stats.running[query_class] += 1
+            return
+        if sum(self.stats.queued.values()) >= self.max_queued and not self._shed_below(query_class):
+            self.stats.rejected += 1
+            raise QueryRejected(query_class, self.retry_after)
+
+        waiter = self.loop.create_future()
+        self._waiters[query_class].append(waiter)
+        self.stats.queued[query_class] += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget(query_class, waiter)
+            self.stats.timed_out += 1
+            raise QueryRejected(query_class, self.retry_after)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was granted just as the caller went away
+                self.release(query_class)
+            else:
+                self._forget(query_class, waiter)
+            raise
+
+    def _shed_below(self, query_class: str) -> bool:
+        """Reject the newest waiter of a lower-priority class to make room."""
+        for lower in reversed(QUERY_CLASSES[QUERY_CLASSES.index(query_class) + 1:]):
+            waiters = self._waiters[lower]
+            while waiters:
+                waiter = waiters.pop()
+                self.stats.queued[lower] -= 1
+                if not waiter.done():
+                    self.stats.rejected += 1
+                    waiter.set_exception(QueryRejected(lower, self.retry_after))
+                    return True
+        return False
+
+    def _forget(self, query_class: str, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters[query_class].remove(waiter)
+            self.stats.queued[query_class] -= 1
+        except ValueError:
+            pass
+
+    def release(self, query_class: str) -> None:
+        """Return a slot taken by ``acquire``."""
+        self.stats.running[query_class] -= 1
+        self._dispatch()
+
+    async def lease(self, query_class: str) -> Lease:
+        """Acquire a slot held until the returned lease is released."""
+        await self.acquire(query_class)
+        return Lease(self, query_class)
+
+    async def run(self, key: Hashable, fn: Callable[[], Any], query_class: str = INTERACTIVE) -> Any:
+        """Run blocking ``fn`` in a worker thread under a ``query_class`` slot.
+
+        Concurrent calls with an equal ``key`` share one execution and its
+        result, which callers must treat as read-only. The execution runs in
+        its own task: a caller that is cancelled (client gone, job timeout)
+        only stops waiting, and the query is cancelled once no caller is
+        left waiting for it.
+        """
+        flight = self._inflight.get(key)
+        if flight is None:
+            if self.loop is None:
+                self.loop = asyncio.get_running_loop()
+            flight = self._inflight[key] = _Flight(self.loop.create_task(self._execute(fn, query_class)))
+            flight.task.add_done_callback(partial(self._landed, key, flight))
+        else:
+            self.stats.deduplicated += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # later calls start a fresh execution instead of joining this one
+                self._forget_flight(key, flight)
+                flight.task.cancel()
+
+    async def _execute(self, fn: Callable[[], Any], query_class: str) -> Any:
+        await self.acquire(query_class)
+        self.stats.started += 1
+        # a cancelled flight cannot stop its worker thread, so the slot is
+        # held until the thread returns rather than until the flight ends
+        work = asyncio.ensure_future(asyncio.to_thread(fn))
+        work.add_done_callback(partial(self._returned, query_class))
+        return await asyncio.shield(work)
+
+    def _returned(self, query_class: str, work: asyncio.Future) -> None:
+        self.release(query_class)
+        if not work.cancelled():
+            # the flight re-raises it unless it was cancelled first
+            work.exception()
+
+    def _forget_flight(self, key: Hashable, flight: "_Flight") -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    def _landed(self, key: Hashable, flight: "_Flight", task: asyncio.Task) -> None:
+        self._forget_flight(key, flight)
+        if not task.cancelled():
+            # the waiters re-raise it; don't warn when there are none
+            task.exception()
+
+    def run_threadsafe(self, key: Hashable, fn: Callable[[], Any], query_class: str = BACKGROUND) -> Any:
+        """Blocking variant of ``run`` for worker threads.
+
+        Without a bound event loop (CLI tools, scripts) ``fn`` runs directly.
+        """
+        if self.loop is None or not self.loop.is_running():
+            return fn()
+        return asyncio.run_coroutine_threadsafe(self.run(key, fn, query_class), self.loop).result()
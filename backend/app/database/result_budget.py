@@ -0,0 +1,50 @@
+"""Row and byte budgets for query results."""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator
+
+
+@dataclass
+class BoundedResult:
+    """A consumed query result and whether the budget cut it short."""
+    value: Any
+    truncated: bool
+
+
+@dataclass(frozen=True)
+class Bounded:
+    """Consumer wrapper that stops reading a result at a row or byte budget.
+
+    ``consume`` sees at most ``max_rows`` rows, and no rows after the
+    response has exceeded ``max_bytes`` (0 disables either limit). The
+    stream is closed as soon as the budget is hit, so the rest of the
+    response is never transferred. Equal wrappers compare and hash equal,
+    so identical budgeted queries still share one execution.
+    """
+    consume: Callable[[Iterator[Dict[str, Any]]], Any]
+    max_rows: int = 0
+    max_bytes: int = 0
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.consume.__module__}.{self.consume.__qualname__}:{self.max_rows}:{self.max_bytes}"
+
+    def __call__(self, rows: Iterator[Dict[str, Any]]) -> BoundedResult:
+        truncated = False
+
+        def limited() -> Iterator[Dict[str, Any]]:
+            nonlocal truncated
+            for n, row in enumerate(rows, 1):
+                if (self.max_rows and n > self.max_rows) or (
+                    self.max_bytes and getattr(rows, "bytes_read", 0) > self.max_bytes
+                ):
+                    truncated = True
+                    return
+                yield row
+
+        try:
+            value = self.consume(limited())
+        finally:
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+        return BoundedResult(value, truncated)
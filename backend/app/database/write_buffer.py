@@ -0,0 +1,172 @@
+"""Bounded, batching write buffer in front of InfluxDB."""
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+from app.config import settings
+from app.database.influx_client import influx_service
+
+
+class BufferFull(Exception):
+    """Raised when a batch does not fit in the write buffer."""
+
+
+@dataclass
+class WriteStats:
+    """Counters exposed by the ingest stats endpoint."""
+    accepted: int = 0
+    written: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    retries: int = 0
+    batches: int = 0
+
+
+class WriteBuffer:
+    """Accepts line-protocol chunks and flushes them to InfluxDB in batches.
+
+    ``submit`` never blocks: it either enqueues the whole chunk or raises
+    ``BufferFull`` once ``max_lines`` are pending, so callers can shed load
+    (HTTP 503) instead of piling up memory. A single background task drains
+    the queue, grouping chunks per (bucket, precision) into batches of up to
+    ``batch_size`` lines and writing them from a worker thread with retries.
+    """
+
+    def __init__(
+        self,
+        max_lines: int,
+        batch_size: int,
+        flush_interval: float,
+        max_retries: int,
+        retry_backoff: float,
+    ):
+        self.max_lines = max_lines
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stats = WriteStats()
+        self._chunks: Deque[Tuple[str, str, List[str]]] = deque()
+        self._pending = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        """Lines accepted but not yet written."""
+        return self._pending
+
+    def submit(self, bucket: str, lines: List[str], precision: str = "ns") -> None:
+        """Enqueue ``lines`` for ``bucket`` or raise ``BufferFull``."""
+        if self._pending + len(lines) > self.max_lines:
+            self.stats.rejected += len(lines)
+            raise BufferFull()
+        self._chunks.append((bucket, precision, lines))
+        self._pending += len(lines)
+        self.stats.accepted += len(lines)
+        if self._wakeup and self._pending >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop."""
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher after writing everything still queued.
+
+        The flusher finishes the flush it is in (including retries) rather
+        than being cancelled, so no taken batch is lost.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _take_batch(self) -> Optional[Tuple[str, str, List[str]]]:
+        """Pop up to ``batch_size`` lines queued for the destination of the oldest chunk.
+
+        Chunks for other destinations, and the rest of a chunk split at the
+        batch boundary, stay queued in order.
+        """
+        if not self._chunks:
+            return None
+        bucket, precision, _ = self._chunks[0]
+        batch: List[str] = []
+        rest: Deque[Tuple[str, str, List[str]]] = deque()
+        while self._chunks and len(batch) < self.batch_size:
+            chunk = self._chunks.popleft()
+            if chunk[0] != bucket or chunk[1] != precision:
+                rest.append(chunk)
+                continue
+            room = self.batch_size - len(batch)
+            batch.extend(chunk[2][:room])
+            if len(chunk[2]) > room:
+                rest.append((bucket, precision, chunk[2][room:]))
+        rest.extend(self._chunks)
+        self._chunks = rest
+        return bucket, precision, batch
+
+    async def flush(self) -> None:
+        """Write queued lines now, one batch at a time, until the queue is empty.
+
+        A batch whose write is cancelled goes back to the front of the queue
+        (InfluxDB overwrites identical points, so a write that did land is
+        harmless to repeat).
+        """
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+            bucket, precision, batch = taken
+            try:
+                await self._write(bucket, precision, batch)
+            except asyncio.CancelledError:
+                self._chunks.appendleft(taken)
+                raise
+            self._pending -= len(batch)
+
+    async def _write(self, bucket: str, precision: str, batch: List[str]) -> None:
+        from influxdb_client.rest import ApiException
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await asyncio.to_thread(influx_service.write, bucket, "\n".join(batch), precision)
+                self.stats.written += len(batch)
+                self.stats.batches += 1
+                return
+            except ApiException as e:
+                # malformed data will never succeed; only retry throttling/server errors
+                if e.status is not None and e.status < 500 and e.status != 429:
+                    break
+            except Exception:
+                pass
+            if attempt < self.max_retries:
+                self.stats.retries += 1
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+        self.stats.dropped += len(batch)
+        print(f"Warning: dropped {len(batch)} lines for bucket {bucket} after failed writes")
+
+
+# Global instance
+write_buffer = WriteBuffer(
+    max_lines=settings.ingest_queue_max_lines,
+    batch_size=settings.ingest_batch_size,
+    flush_interval=settings.ingest_flush_interval_seconds,
+    max_retries=settings.ingest_max_retries,
+    retry_backoff=settings.ingest_retry_backoff_seconds,
+)
@@ -1,21 +1,15 @@
 """FastAPI application main entry point."""
+import asyncio
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.config import settings
 from app.database.influx_client import influx_service
-from app.routes import (
-    venue,
-    access_points,
-    cause_codes,
-    anomalies,
-    clients,
-    hosts,
-    os_distribution,
-    load,
-    time_series
-)
+from app.database.query_cache import query_cache
+from app.database.write_buffer import write_buffer
+from app.routes.loader import RouterLoader, WaitForRouters
+from app.services.refresh_scheduler import refresh_scheduler
 
 # Create FastAPI app
 app = FastAPI(
@@ -26,6 +20,10 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# API routers are imported and mounted after startup (see app/routes/loader.py)
+router_loader = RouterLoader(app)
+app.add_middleware(WaitForRouters, loader=router_loader)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -35,30 +33,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(venue.router, prefix=settings.api_prefix)
-app.include_router(access_points.router, prefix=settings.api_prefix)
-app.include_router(cause_codes.router, prefix=settings.api_prefix)
-app.include_router(anomalies.router, prefix=settings.api_prefix)
-app.include_router(clients.router, prefix=settings.api_prefix)
-app.include_router(hosts.router, prefix=settings.api_prefix)
-app.include_router(os_distribution.router, prefix=settings.api_prefix)
-app.include_router(load.router, prefix=settings.api_prefix)
-app.include_router(time_series.router, prefix=settings.api_prefix)
+
+async def connect_influx() -> None:
+    """Connect to InfluxDB in the background, retrying until it is healthy."""
+    while True:
+        await asyncio.to_thread(influx_service.connect)
+        if await asyncio.to_thread(influx_service.get_health):
+            return
+        print("Warning: InfluxDB connection health check failed; retrying")
+        await asyncio.sleep(settings.influxdb_connect_retry_seconds)
+
+
+async def schedule_background_jobs() -> None:
+    """Register the refresh jobs that need the route modules once they are mounted.
+
+    The routes import the views and services (and NumPy) in a worker
+    thread, so waiting for them keeps those imports off the startup path.
+    """
+    await router_loader.load()
+    from app.routes.views import register_views
+    register_views(refresh_scheduler)
+    if settings.unique_clients_enabled:
+        from app.services.unique_clients import unique_clients
+        refresh_scheduler.register(
+            "unique-clients", unique_clients.poll, settings.unique_clients_poll_interval_seconds
+        )
+    if settings.ap_history_enabled:
+        from app.services.ap_history import ap_history
+        refresh_scheduler.register("ap-history", ap_history.poll, settings.ap_history_poll_interval_seconds)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize services on startup."""
-    influx_service.connect()
-    health = influx_service.get_health()
-    if not health:
-        print("Warning: InfluxDB connection health check failed")
+    """Initialize services on startup.
+
+    Nothing here waits on InfluxDB or on importing the routes: both happen
+    in the background, and `/health/ready` reports when they are done.
+    """
+    influx_service.scheduler.start()
+    write_buffer.start()
+    app.state.influx_task = asyncio.create_task(connect_influx())
+    app.state.router_task = asyncio.create_task(router_loader.load())
+    refresh_scheduler.start()
+    if settings.anomaly_detection_enabled:
+        from app.services.anomaly_detection import anomaly_service
+        refresh_scheduler.register(
+            "anomaly-detection", anomaly_service.poll, settings.anomaly_poll_interval_seconds
+        )
+    app.state.jobs_task = asyncio.create_task(schedule_background_jobs())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
+    for name in ("jobs_task", "influx_task", "router_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    refresh_scheduler.stop()
+    await write_buffer.stop()
+    query_cache.close()
     influx_service.close()
 
 
@@ -75,11 +109,59 @@ async def root():
 @app.get("/health", tags=["health"])
 async def health_check():
     """Health check endpoint."""
-    db_health = influx_service.get_health()
+    db_health = await asyncio.to_thread(influx_service.get_health)
+    scheduler = influx_service.scheduler.stats
+    cache = query_cache.stats
     return {
         "status": "healthy" if db_health else "degraded",
-        "database": "connected" if db_health else "disconnected"
+        "database": "connected" if db_health else "disconnected",
+        "queries": {
+            "running": scheduler.running,
+            "queued": scheduler.queued,
+            "deduplicated": scheduler.deduplicated,
+            "rejected": scheduler.rejected + scheduler.timed_out,
+        },
+        "cache": {
+            "hits": cache.hits,
+            "stale": cache.stale,
+            "diskHits": cache.disk_hits,
+            "misses": cache.misses,
+            "refreshErrors": cache.refresh_errors,
+        },
+        "jobs": {
+            name: {
+                "runs": job.stats.runs,
+                "failures": job.stats.failures,
+                "timeouts": job.stats.timeouts,
+                "skipped": job.stats.skipped,
+                "running": job.running,
+                "lastSeconds": None if job.stats.last_seconds is None else round(job.stats.last_seconds, 3),
+                "lastError": job.stats.last_error,
+            }
+            for name, job in refresh_scheduler.jobs.items()
+        }
+    }
+
+
+@app.get("/health/live", tags=["health"])
+async def liveness():
+    """Liveness probe: the process is up and serving. Never touches InfluxDB."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["health"])
+async def readiness():
+    """Readiness probe: routes are mounted and InfluxDB is reachable (503 otherwise)."""
+    db_health = router_loader.loaded and await asyncio.to_thread(influx_service.get_health)
+    body = {
+        "status": "ready" if db_health else "not ready",
+        "routes": "loaded" if router_loader.loaded else "loading",
+        "database": "connected" if db_health else "disconnected",
+        "routesLoadSeconds": router_loader.seconds,
     }
+    if not db_health:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
 
 
 @app.exception_handler(RequestValidationError)
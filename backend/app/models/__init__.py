@@ -1,24 +1,35 @@
 """Pydantic models for API requests and responses."""
-from app.models.venue import VenueResponse, Zone
-from app.models.access_point import AccessPointResponse, AccessPoint, Radio
-from app.models.cause_code import CauseCodeResponse
+from app.models.venue import VenueResponse, Zone, VenueInfo, VenueSummary, FleetResponse
+from app.models.access_point import AccessPointResponse, AccessPoint, Radio, APHistoryResponse
+from app.models.cause_code import CauseCodeResponse, CauseCodeAnalyticsResponse, CauseCodeTrend
 from app.models.anomaly import AnomalyResponse
-from app.models.client import ClientResponse
+from app.models.client import ClientResponse, ClientUsageResponse, UniqueClientsResponse
 from app.models.host_usage import HostUsageResponse
 from app.models.os_distribution import OSDistributionResponse
 from app.models.load import LoadResponse, BandData, LoadDataPoint
-from app.models.time_series import TimeSeriesResponse, TimeSeriesPoint
+from app.models.time_series import TimeSeriesResponse, TimeSeriesPoint, MultiSeriesResponse, ZoneSeries
+from app.models.ingest import IngestResponse, IngestStats
+from app.models.rf import RFAnalysisResponse, ZoneRFAnalysis, ChannelAPsResponse
+from app.models.zone_ranking import ZoneRankingsResponse, ZoneRanking
 from app.models.common import ErrorResponse, PaginationResponse
 
 __all__ = [
     "VenueResponse",
     "Zone",
+    "VenueInfo",
+    "VenueSummary",
+    "FleetResponse",
     "AccessPointResponse",
     "AccessPoint",
     "Radio",
+    "APHistoryResponse",
     "CauseCodeResponse",
+    "CauseCodeAnalyticsResponse",
+    "CauseCodeTrend",
     "AnomalyResponse",
     "ClientResponse",
+    "ClientUsageResponse",
+    "UniqueClientsResponse",
     "HostUsageResponse",
     "OSDistributionResponse",
     "LoadResponse",
@@ -26,6 +37,15 @@ __all__ = [
     "LoadDataPoint",
     "TimeSeriesResponse",
     "TimeSeriesPoint",
+    "MultiSeriesResponse",
+    "ZoneSeries",
+    "IngestResponse",
+    "IngestStats",
+    "RFAnalysisResponse",
+    "ZoneRFAnalysis",
+    "ChannelAPsResponse",
+    "ZoneRankingsResponse",
+    "ZoneRanking",
     "ErrorResponse",
     "PaginationResponse",
 ]
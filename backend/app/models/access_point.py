@@ -1,6 +1,7 @@
 """Access point models."""
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
+from datetime import datetime
 
 
 class Radio(BaseModel):
@@ -37,3 +38,16 @@ class AccessPointResponse(BaseModel):
     list: List[AccessPoint]
 
 
+class APHistoryResponse(BaseModel):
+    """Columnar metric history for one AP.
+
+    ``series`` maps each metric to window means aligned with ``timestamps``;
+    ``None`` marks windows without data for that metric. ``source`` is
+    ``"memory"`` (ring buffer) or ``"influx"``.
+    """
+    mac: str
+    metrics: List[str]
+    interval: str
+    source: str
+    timestamps: List[datetime]
+    series: Dict[str, List[Optional[float]]]
@@ -1,6 +1,7 @@
 """Cause code models."""
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List
+from datetime import datetime
 
 
 class CauseCode(BaseModel):
@@ -15,3 +16,21 @@ class CauseCode(BaseModel):
 CauseCodeResponse = List[CauseCode]
 
 
+class CauseCodeTrend(BaseModel):
+    """Cause-code analytics for one group (zone, code or both)."""
+    group: Dict[str, str]
+    count: int
+    share: float
+    impactScore: float
+    weightedImpact: float
+    trend: float
+    series: List[int]
+
+
+class CauseCodeAnalyticsResponse(BaseModel):
+    """Response model for cause-code analytics endpoint."""
+    window: str
+    interval: str
+    groupBy: List[str]
+    buckets: List[datetime]
+    items: List[CauseCodeTrend]
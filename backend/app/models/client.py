@@ -1,6 +1,6 @@
 """Client/device models."""
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Client(BaseModel):
@@ -21,5 +21,38 @@ class ClientResponse(BaseModel):
     """Response model for clients endpoint."""
     data: List[Client]
     pagination: dict
+    truncated: bool = False
 
 
+class ClientUsageResponse(BaseModel):
+    """Usage totals per group, as parallel arrays.
+
+    Entry ``i`` of every list in ``groups`` plus ``dataUsage[i]`` and
+    ``clients[i]`` describe one group; groups are ordered by usage.
+    """
+    groupBy: List[str]
+    window: str
+    agg: str
+    groups: Dict[str, List[str]]
+    dataUsage: List[float]
+    clients: List[int]
+
+
+class ZoneUniqueClients(BaseModel):
+    """Approximate distinct clients seen in one zone."""
+    zoneId: str
+    uniqueClients: int
+
+
+class UniqueClientsResponse(BaseModel):
+    """Approximate distinct clients over a window (HyperLogLog, ~1.6% error).
+
+    ``hoursCovered`` below ``hoursInWindow`` means older hours are still
+    being digested and the counts are lower bounds.
+    """
+    window: str
+    zoneIds: Optional[List[str]] = None
+    uniqueClients: int
+    zones: List[ZoneUniqueClients]
+    hoursCovered: int
+    hoursInWindow: int
@@ -0,0 +1,20 @@
+"""Ingestion models."""
+from pydantic import BaseModel
+
+
+class IngestResponse(BaseModel):
+    """Response model for ingest endpoint."""
+    accepted: int
+    pending: int
+
+
+class IngestStats(BaseModel):
+    """Write buffer counters."""
+    pending: int
+    capacity: int
+    accepted: int
+    written: int
+    dropped: int
+    rejected: int
+    retries: int
+    batches: int
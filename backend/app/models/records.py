@@ -0,0 +1,61 @@
+"""Compact internal records for large query results.
+
+Routes aggregate Influx rows into these ``__slots__`` records instead of
+per-row dictionaries, and convert to the Pydantic response models only for
+the rows actually returned. Low-cardinality tag values (zone, AP, WLAN, OS,
+...) are interned so thousands of records share one string object each.
+"""
+import sys
+from typing import Any, Optional
+from app.models.client import Client
+
+
+def intern_tag(value: Any, default: str = "") -> str:
+    """Return an interned string for a tag value."""
+    if value is None:
+        return default
+    return sys.intern(str(value))
+
+
+class ClientRecord:
+    """Latest state of one client."""
+    __slots__ = (
+        "macAddress", "hostname", "modelName", "ipAddress", "wlan",
+        "apName", "apMac", "dataUsage", "os", "deviceType",
+    )
+
+    def __init__(self, macAddress: str, wlan: Any, apName: Any, apMac: Any, os: Any, deviceType: Any):
+        self.macAddress = str(macAddress)
+        self.wlan = intern_tag(wlan)
+        self.apName = intern_tag(apName)
+        self.apMac = intern_tag(apMac)
+        self.os = intern_tag(os, "Unknown")
+        self.deviceType = intern_tag(deviceType, "other")
+        self.hostname = ""
+        self.modelName = "Unknown"
+        self.ipAddress = ""
+        self.dataUsage = 0.0
+
+    def set_field(self, name: Optional[str], value: Any) -> None:
+        """Apply one ``_field``/``_value`` pair; unknown fields are ignored."""
+        if name == "dataUsage":
+            self.dataUsage = float(value or 0.0)
+        elif name == "modelName":
+            self.modelName = intern_tag(value, "Unknown")
+        elif name in ("hostname", "ipAddress"):
+            setattr(self, name, "" if value is None else str(value))
+
+    def to_model(self) -> Client:
+        return Client(
+            hostname=self.hostname,
+            modelName=self.modelName,
+            ipAddress=self.ipAddress,
+            macAddress=self.macAddress,
+            wlan=self.wlan,
+            apName=self.apName,
+            apMac=self.apMac,
+            dataUsage=self.dataUsage,
+            os=self.os,
+            deviceType=self.deviceType,
+        )
+
@@ -0,0 +1,44 @@
+"""RF channel-plan models."""
+from pydantic import BaseModel
+from typing import List
+
+
+class CoChannelGroup(BaseModel):
+    """Radios of one zone sharing a band and channel."""
+    band: str
+    channel: int
+    apCount: int
+
+
+class NoiseOutlier(BaseModel):
+    """Radio whose noise floor is well above its zone/band median."""
+    apMac: str
+    band: str
+    channel: int
+    noiseFloor: float
+    medianNoiseFloor: float
+    score: float
+
+
+class ZoneRFAnalysis(BaseModel):
+    """RF analysis for one zone."""
+    zoneId: str
+    radios: int
+    coChannel: List[CoChannelGroup]
+    utilizationHistogram: List[int]
+    noiseOutliers: List[NoiseOutlier]
+
+
+class RFAnalysisResponse(BaseModel):
+    """Response model for the RF analysis endpoint."""
+    radios: int
+    histogramEdges: List[int]
+    zones: List[ZoneRFAnalysis]
+
+
+class ChannelAPsResponse(BaseModel):
+    """APs with a radio on one channel of a zone."""
+    zoneId: str
+    band: str
+    channel: int
+    aps: List[str]
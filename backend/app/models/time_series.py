@@ -1,6 +1,6 @@
 """Time series models."""
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -15,3 +15,23 @@ class TimeSeriesPoint(BaseModel):
 TimeSeriesResponse = List[TimeSeriesPoint]
 
 
+class ZoneSeries(BaseModel):
+    """Columnar series for one zone.
+
+    ``series`` maps ``"<metric>.<agg>"`` to values aligned with ``timestamps``;
+    ``None`` marks windows without data for that column.
+    """
+    zoneId: str
+    zoneName: str
+    timestamps: List[datetime]
+    series: Dict[str, List[Optional[float]]]
+
+
+class MultiSeriesResponse(BaseModel):
+    """Several metrics and aggregations per zone from a single query."""
+    metrics: List[str]
+    aggs: List[str]
+    interval: str
+    zones: List[ZoneSeries]
+
+
@@ -19,14 +19,37 @@ class Zone(BaseModel):
     netflixScore: float
 
 
-class VenueResponse(BaseModel):
-    """Response model for venue endpoint."""
+class VenueInfo(BaseModel):
+    """Registered venue."""
+    id: str
+    name: str
+
+
+class VenueSummary(BaseModel):
+    """Venue-level metrics without the zone breakdown."""
+    id: str
     name: str
     totalZones: int
     totalAPs: int
     totalClients: int
     avgExperienceScore: float
     slaCompliance: float
+
+
+class VenueResponse(VenueSummary):
+    """Response model for venue endpoint."""
     zones: List[Zone]
 
 
+class FleetResponse(BaseModel):
+    """Cross-venue rollup."""
+    totalVenues: int
+    totalZones: int
+    totalAPs: int
+    totalClients: int
+    avgExperienceScore: float
+    slaCompliance: float
+    venues: List[VenueSummary]
+    unavailable: List[str]
+
+
@@ -0,0 +1,28 @@
+"""Zone ranking models."""
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ZoneRanking(BaseModel):
+    """Percentiles, trend and rank of one zone over the window."""
+    zoneId: str
+    zoneName: str
+    rank: int
+    previousRank: Optional[int] = None
+    rankChange: Optional[int] = None
+    p5: float
+    p50: float
+    p95: float
+    previousP50: Optional[float] = None
+    change: Optional[float] = None
+    samples: int
+    trend: List[Optional[float]]
+
+
+class ZoneRankingsResponse(BaseModel):
+    """Response model for the zone rankings endpoint."""
+    metric: str
+    window: str
+    order: str
+    segments: int
+    zones: List[ZoneRanking]
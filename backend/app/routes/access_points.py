@@ -1,14 +1,81 @@
 """Access point routes."""
-from fastapi import APIRouter, Path, HTTPException
-from app.models.access_point import AccessPointResponse, AccessPoint, Radio
-from app.database.influx_client import influx_service
-from app.config import settings
+import asyncio
+from fastapi import APIRouter, Depends, Path, HTTPException
+from typing import List
+import numpy as np
+from app.models.access_point import AccessPoint, AccessPointResponse, Radio
+from app.routes.dependencies import run_query, venue_scope
+from app.services.transforms import ColumnReader, Columns, codes_in, factorize, first_index, group_keys, pivot, runs
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/zones", tags=["access-points"])
 
+AP_TAGS = ("apName", "model", "status", "ip", "zoneId", "zoneName")
+AP_COLUMNS = ColumnReader(tags=("apMac", "_field") + AP_TAGS, numeric=False)
+RADIO_COLUMNS = ColumnReader(tags=("apMac", "band", "_field"))
+AP_INT_FIELDS = ("clientCount", "channelUtilization", "airtimeUtilization", "cpuUtilization", "memoryUtilization")
+AP_TEXT_FIELDS = ("firmwareVersion", "serialNumber")
+RADIO_FIELDS = ("channel", "txPower", "noiseFloor", "clientCount")
+
+
+def _ints(grid: np.ndarray) -> np.ndarray:
+    """Integer grid from pivoted values, missing values as 0."""
+    grid = grid.copy()
+    grid[np.equal(grid, None)] = 0
+    return np.nan_to_num(grid.astype(np.float64)).astype(np.int64)
+
+
+def _access_points(ap: Columns, radio: Columns) -> List[AccessPoint]:
+    """Pivot latest AP and radio fields into one model per AP, ordered by MAC.
+
+    Tags come from each AP's first row; radios (ordered by band) are
+    attached through the AP's index, and radios of unknown APs are dropped.
+    """
+    macs, mac = factorize(ap.tags["apMac"])
+    field = ap.tags["_field"]
+    counts = _ints(pivot(mac, len(macs), codes_in(field, AP_INT_FIELDS), len(AP_INT_FIELDS), ap.value, fill=None))
+    text = pivot(mac, len(macs), codes_in(field, AP_TEXT_FIELDS), len(AP_TEXT_FIELDS), ap.value, fill=None)
+    first = first_index(mac, len(macs))
+    tags = {name: ap.tags[name][first].tolist() for name in AP_TAGS}
+
+    owner = codes_in(radio.tags["apMac"], macs.tolist())
+    radio = radio.take(owner >= 0)
+    bands, band = factorize(radio.tags["band"])
+    group, n_radios, (radio_ap, radio_band) = group_keys((owner[owner >= 0], len(macs)), (band, len(bands)))
+    radio_grid = _ints(pivot(group, n_radios, codes_in(radio.tags["_field"], RADIO_FIELDS), len(RADIO_FIELDS), radio.value))
+    bounds = runs(radio_ap, len(macs))
+    band_names = bands.tolist()
+
+    aps: List[AccessPoint] = []
+    for i, (ap_mac, row, (firmware, serial)) in enumerate(zip(macs.tolist(), counts.tolist(), text.tolist())):
+        rows = slice(bounds[i], bounds[i + 1])
+        radios = [
+            Radio(band=band_names[b], channel=channel, txPower=tx_power, noiseFloor=noise_floor, clientCount=clients)
+            for b, (channel, tx_power, noise_floor, clients) in zip(
+                radio_band[rows].tolist(), radio_grid[rows].tolist()
+            )
+        ]
+        aps.append(AccessPoint(
+            mac=ap_mac,
+            name=tags["apName"][i],
+            model=tags["model"][i],
+            status=tags["status"][i],
+            ip=tags["ip"][i],
+            zoneId=tags["zoneId"][i],
+            zoneName=tags["zoneName"][i],
+            firmwareVersion="" if firmware is None else str(firmware),
+            serialNumber="" if serial is None else str(serial),
+            **dict(zip(AP_INT_FIELDS, row)),
+            radios=radios,
+        ))
+    return aps
+
 
 @router.get("/{zone_id}/aps", response_model=AccessPointResponse)
-async def get_access_points(zone_id: str = Path(..., description="Zone identifier")):
+async def get_access_points(
+    zone_id: str = Path(..., description="Zone identifier"),
+    venue: VenueScope = Depends(venue_scope)
+):
     """
     Get access points for a specific zone.
     
@@ -17,85 +84,27 @@ async def get_access_points(zone_id: str = Path(..., description="Zone identifie
     """
     try:
         ap_query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
+            f"from(bucket: \"{venue.bucket}\")\n"
             "  |> range(start: -30m)\n"
-            "  |> filter(fn: (r) => r[\\\"_measurement\\\"] == \\\"ap_metrics\\\")\n"
-            f"  |> filter(fn: (r) => r[\\\"zoneId\\\"] == \\\"{zone_id}\\\")\n"
-            "  |> group(columns: [\\\"apMac\\\"])\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"ap_metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => r[\"zoneId\"] == \"{zone_id}\")\n"
+            "  |> group(columns: [\"apMac\", \"_field\"])\n"
             "  |> last()\n"
         )
-        ap_rows = influx_service.query_dicts(ap_query)
         radio_query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
+            f"from(bucket: \"{venue.bucket}\")\n"
             "  |> range(start: -30m)\n"
-            "  |> filter(fn: (r) => r[\\\"_measurement\\\"] == \\\"radio_metrics\\\")\n"
-            f"  |> filter(fn: (r) => r[\\\"zoneId\\\"] == \\\"{zone_id}\\\")\n"
-            "  |> group(columns: [\\\"apMac\\\",\\\"band\\\"])\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"radio_metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => r[\"zoneId\"] == \"{zone_id}\")\n"
+            "  |> group(columns: [\"apMac\", \"band\", \"_field\"])\n"
             "  |> last()\n"
         )
-        radio_rows = influx_service.query_dicts(radio_query)
-
-        ap_index: dict[str, dict] = {}
-        for r in ap_rows:
-            mac = r.get("apMac")
-            if mac not in ap_index:
-                ap_index[mac] = {
-                    "mac": mac,
-                    "name": r.get("apName"),
-                    "model": r.get("model"),
-                    "status": r.get("status"),
-                    "ip": r.get("ip"),
-                    "zoneId": r.get("zoneId"),
-                    "zoneName": r.get("zoneName"),
-                    "firmwareVersion": None,
-                    "serialNumber": None,
-                    "clientCount": 0,
-                    "channelUtilization": 0,
-                    "airtimeUtilization": 0,
-                    "cpuUtilization": 0,
-                    "memoryUtilization": 0,
-                    "radios": {},
-                }
-            field_name = r.get("_field")
-            ap_index[mac][field_name] = r.get("_value")
-
-        for rr in radio_rows:
-            mac = rr.get("apMac")
-            band = rr.get("band")
-            if mac in ap_index:
-                if band not in ap_index[mac]["radios"]:
-                    ap_index[mac]["radios"][band] = {}
-                ap_index[mac]["radios"][band][rr.get("_field")] = rr.get("_value")
-
-        aps: list[AccessPoint] = []
-        for mac, ap in ap_index.items():
-            radios: list[Radio] = []
-            for band, rvals in ap["radios"].items():
-                radios.append(Radio(
-                    band=band,
-                    channel=int(rvals.get("channel", 0)),
-                    txPower=int(rvals.get("txPower", 0)),
-                    noiseFloor=int(rvals.get("noiseFloor", 0)),
-                    clientCount=int(rvals.get("clientCount", 0)),
-                ))
-            aps.append(AccessPoint(
-                mac=mac,
-                name=str(ap.get("apName")),
-                model=str(ap.get("model")),
-                status=str(ap.get("status")),
-                ip=str(ap.get("ip")),
-                zoneId=str(ap.get("zoneId")),
-                zoneName=str(ap.get("zoneName")),
-                firmwareVersion=str(ap.get("firmwareVersion")),
-                serialNumber=str(ap.get("serialNumber")),
-                clientCount=int(ap.get("clientCount", 0)),
-                channelUtilization=int(ap.get("channelUtilization", 0)),
-                airtimeUtilization=int(ap.get("airtimeUtilization", 0)),
-                cpuUtilization=int(ap.get("cpuUtilization", 0)),
-                memoryUtilization=int(ap.get("memoryUtilization", 0)),
-                radios=radios,
-            ))
-
+        ap_cols, radio_cols = await asyncio.gather(
+            run_query(ap_query, AP_COLUMNS), run_query(radio_query, RADIO_COLUMNS)
+        )
+        aps = _access_points(ap_cols, radio_cols)
         return AccessPointResponse(total=len(aps), list=aps)
 
     except HTTPException:
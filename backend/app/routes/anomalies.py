@@ -1,24 +1,30 @@
 """Anomaly routes."""
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from typing import Optional
-from app.models.anomaly import Anomaly
-from app.database.influx_client import influx_service
 from app.config import settings
+from app.models.anomaly import Anomaly
+from app.database.result_budget import Bounded
+from app.routes.dependencies import row_limit, run_query, unwrap_bounded, venue_scope
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/anomalies", tags=["anomalies"])
 
 
 @router.get("", response_model=list[Anomaly])
 async def get_anomalies(
+    response: Response,
     severity: Optional[str] = Query(None, description='Filter by severity ("critical" | "major" | "warning" | "info")'),
     zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
     limit: int = Query(50, description="Number of results"),
-    sort: str = Query("timestamp", description='Sort order "timestamp" | "severity"')
+    sort: str = Query("timestamp", description='Sort order "timestamp" | "severity"'),
+    venue: VenueScope = Depends(venue_scope)
 ):
     """
     Get detected network anomalies.
     
     Returns anomalies filtered by severity and/or zone, sorted by timestamp or severity.
+    Past the configured row/byte budget only the most recent anomalies are read
+    and the `X-Result-Truncated` header is set.
     """
     try:
         filters = []
@@ -28,17 +34,23 @@ async def get_anomalies(
             filters.append(f'r["zoneId"] == "{zoneId}"')
         filter_str = " and ".join(filters) if filters else "true"
         query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
+            f"from(bucket: \"{venue.bucket}\")\n"
             "  |> range(start: -7d)\n"
             "  |> filter(fn: (r) => r[\"_measurement\"] == \"anomalies\")\n"
+            f"{venue.scope_filter}"
             f"  |> filter(fn: (r) => {filter_str})\n"
-            "  |> group(columns: [\"anomalyId\"])\n"
+            "  |> group(columns: [\"anomalyId\", \"_field\"])\n"
             "  |> last()\n"
+            f"{row_limit(settings.anomalies_max_rows, newest_first=True)}"
+        )
+        result = await run_query(
+            query,
+            Bounded(list, settings.anomalies_max_rows, settings.anomalies_max_bytes),
+            cache_ttl=settings.anomalies_cache_ttl_seconds,
         )
-        rows = influx_service.query_dicts(query)
         items: list[Anomaly] = []
         tmp: dict[str, dict] = {}
-        for r in rows:
+        for r in unwrap_bounded(result, response):
             aid = str(r.get("anomalyId"))
             if aid not in tmp:
                 tmp[aid] = {
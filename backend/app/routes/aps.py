@@ -0,0 +1,110 @@
+"""Per-access-point routes."""
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, Depends, Path, Query, HTTPException
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.models.access_point import APHistoryResponse
+from app.routes.dependencies import run_query, venue_scope
+from app.routes.windows import flux_time, resolve_window, split
+from app.services.ap_history import AP_HISTORY_METRICS, ap_history
+from app.services.transforms import window_means
+from app.services.venue_registry import VenueScope
+
+router = APIRouter(prefix="/aps", tags=["access-points"])
+
+
+def _window_columns(rows: Iterator[Dict[str, Any]]) -> Dict[datetime, Dict[str, float]]:
+    """Consume aggregateWindow rows into ``{window end: {metric: mean}}``."""
+    windows: Dict[datetime, Dict[str, float]] = {}
+    for r in rows:
+        if r.get("_time") is not None and r.get("_value") is not None:
+            windows.setdefault(r["_time"], {})[r.get("_field")] = float(r["_value"])
+    return windows
+
+
+def _memory_history(
+    venue_id: str,
+    mac: str,
+    start: datetime,
+    stop: datetime,
+    interval: int,
+    metrics: List[str],
+) -> Optional[Tuple[List[datetime], Dict[str, List[Optional[float]]]]]:
+    """Windowed means from the AP's ring buffer, or None when memory does not cover the range."""
+    samples = ap_history.history(venue_id, mac, start.timestamp(), stop.timestamp())
+    if samples is None:
+        return None
+    times, values = samples
+    rows = [AP_HISTORY_METRICS.index(m) for m in metrics]
+    stamps, means = window_means(times, values[rows], start.timestamp(), stop.timestamp(), interval * 60)
+    timestamps = [datetime.fromtimestamp(t, start.tzinfo) for t in stamps.tolist()]
+    series = {
+        m: [None if np.isnan(v) else round(v, 2) for v in means[i].tolist()]
+        for i, m in enumerate(metrics)
+    }
+    return timestamps, series
+
+
+@router.get("/{mac}/history", response_model=APHistoryResponse)
+async def get_ap_history(
+    mac: str = Path(..., description="Access point MAC address"),
+    metrics: Optional[str] = Query(None, description=f'Comma-separated metrics (default: all): {", ".join(AP_HISTORY_METRICS)}'),
+    startTime: Optional[datetime] = Query(None, description="Start timestamp (ISO 8601)"),
+    endTime: Optional[datetime] = Query(None, description="End timestamp (ISO 8601)"),
+    range_: str = Query("1h", alias="range", pattern=r"^\d+[mhdw]$", description='Window ending at endTime when startTime is not given, e.g. "1h", "24h"'),
+    interval: int = Query(1, ge=1, description="Data point interval in minutes"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get CPU, memory, utilization and client-count history for one AP.
+
+    Ranges still held in the per-AP ring buffers are served from memory
+    without querying InfluxDB; older ranges fall back to an `aggregateWindow`
+    query. Values are the mean per `interval` window, as columns aligned with
+    `timestamps`; `source` tells which path answered.
+    """
+    metric_list = split(metrics) if metrics else list(AP_HISTORY_METRICS)
+    unknown = [m for m in metric_list if m not in AP_HISTORY_METRICS]
+    if not metric_list or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"metrics must be a comma-separated subset of {', '.join(AP_HISTORY_METRICS)}",
+        )
+    try:
+        start, stop, interval = resolve_window(startTime, endTime, range_, interval)
+        memory = await asyncio.to_thread(_memory_history, venue.id, mac, start, stop, interval, metric_list)
+        if memory is not None:
+            timestamps, series = memory
+            return APHistoryResponse(
+                mac=mac, metrics=metric_list, interval=f"{interval}m", source="memory",
+                timestamps=timestamps, series=series,
+            )
+
+        fields = " or ".join(f'r["_field"] == "{m}"' for m in metric_list)
+        query = (
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {flux_time(start)}, stop: {flux_time(stop)})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"ap_metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => r[\"apMac\"] == \"{mac}\")\n"
+            f"  |> filter(fn: (r) => {fields})\n"
+            "  |> group(columns: [\"_field\"])\n"
+            f"  |> aggregateWindow(every: {interval}m, fn: mean, createEmpty: false)\n"
+            "  |> keep(columns: [\"_time\", \"_field\", \"_value\"])\n"
+        )
+        windows = await run_query(query, _window_columns)
+        timestamps = sorted(windows)
+        return APHistoryResponse(
+            mac=mac, metrics=metric_list, interval=f"{interval}m", source="influx",
+            timestamps=timestamps,
+            series={
+                m: [round(windows[ts][m], 2) if m in windows[ts] else None for ts in timestamps]
+                for m in metric_list
+            },
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,34 +1,48 @@
 """Cause code routes."""
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException
 from typing import Optional
-from app.models.cause_code import CauseCode
-from app.database.influx_client import influx_service
+from datetime import datetime, timezone
 from app.config import settings
+from app.models.cause_code import CauseCode, CauseCodeAnalyticsResponse, CauseCodeTrend
+from app.routes.dependencies import refresh_query, run_query, venue_scope
+from app.services.venue_registry import VenueScope
+from app.services import cause_code_analytics
 
 router = APIRouter(prefix="/cause-codes", tags=["cause-codes"])
 
 
+def _cause_codes_query(venue: VenueScope) -> str:
+    """Latest count, impact score and description per cause code over 48 hours."""
+    return (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -48h)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"disconnect_codes\")\n"
+        f"{venue.scope_filter}"
+        "  |> group(columns: [\"code\", \"_field\"])\n"
+        "  |> last()\n"
+    )
+
+
+async def refresh_cause_codes(venue: VenueScope) -> None:
+    """Reload the cached cause-code rows at background priority (a refresh job)."""
+    await refresh_query(_cause_codes_query(venue), cache_ttl=settings.cause_codes_cache_ttl_seconds)
+
+
 @router.get("", response_model=list[CauseCode])
 async def get_cause_codes(
     limit: Optional[int] = Query(None, description="Number of results to return"),
-    sort: Optional[str] = Query("count", description='Sort by "count" or "impactScore"')
+    sort: Optional[str] = Query("count", description='Sort by "count" or "impactScore"'),
+    venue: VenueScope = Depends(venue_scope)
 ):
     """
     Get 802.11 disconnect cause codes with counts and impact scores.
     
-    Returns disconnect cause codes sorted by count or impact score.
+    Returns disconnect cause codes sorted by count or impact score. The
+    query result is cached and kept fresh by a background refresh job.
     """
     try:
-        query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
-            "  |> range(start: -48h)\n"
-            "  |> filter(fn: (r) => r[\"_measurement\"] == \"disconnect_codes\")\n"
-            "  |> group(columns: [\"code\"])\n"
-            "  |> last()\n"
-        )
-        rows = influx_service.query_dicts(query)
         by_code: dict[int, dict] = {}
-        for r in rows:
+        for r in await run_query(_cause_codes_query(venue), cache_ttl=settings.cause_codes_cache_ttl_seconds):
             code = int(r.get("code") or 0)
             if code not in by_code:
                 by_code[code] = {"code": code, "description": None, "count": 0, "impactScore": 0.0}
@@ -60,3 +74,75 @@ async def get_cause_codes(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/analytics", response_model=CauseCodeAnalyticsResponse)
+async def get_cause_code_analytics(
+    window: str = Query("48h", pattern=r"^\d+[mhdw]$", description='Time range, e.g. "24h", "7d"'),
+    interval: str = Query("1h", pattern=r"^\d+[mhd]$", description='Bucket size, e.g. "15m", "1h"'),
+    groupBy: str = Query("code", description='Comma-separated grouping: "zone", "code"'),
+    sort: str = Query("impact", description='Rank by "impact" | "count" | "share" | "trend"'),
+    limit: int = Query(50, ge=1, le=10000, description="Number of groups to return"),
+    zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get windowed cause-code trends and impact-weighted rankings.
+
+    Counts are bucketed per `interval` in a single Flux query and read as
+    column arrays; share of total, count-weighted impact and least-squares
+    trend are then computed per group.
+    """
+    dimensions = [d.strip() for d in groupBy.split(",") if d.strip()]
+    unknown = [d for d in dimensions if d not in cause_code_analytics.GROUP_COLUMNS]
+    if unknown or len(set(dimensions)) != len(dimensions):
+        raise HTTPException(status_code=400, detail=f"Invalid groupBy: {groupBy}")
+    if sort not in cause_code_analytics.SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
+    try:
+        zone_filter = f'  |> filter(fn: (r) => r["zoneId"] == "{zoneId}")\n' if zoneId else ""
+        query = (
+            f"data = from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: -{window})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"disconnect_codes\")\n"
+            f"{venue.scope_filter}"
+            f"{zone_filter}"
+            "counts = data\n"
+            "  |> filter(fn: (r) => r[\"_field\"] == \"count\")\n"
+            f"  |> aggregateWindow(every: {interval}, fn: sum, createEmpty: false, timeSrc: \"_start\")\n"
+            "impact = data\n"
+            "  |> filter(fn: (r) => r[\"_field\"] == \"impactScore\")\n"
+            f"  |> aggregateWindow(every: {interval}, fn: mean, createEmpty: false, timeSrc: \"_start\")\n"
+            "union(tables: [counts, impact])\n"
+        )
+        cols = cause_code_analytics.CauseCodeColumns.from_columns(
+            await run_query(query, cause_code_analytics.CAUSE_CODE_COLUMNS), dimensions
+        )
+        if not len(cols):
+            return CauseCodeAnalyticsResponse(
+                window=window, interval=interval, groupBy=dimensions, buckets=[], items=[]
+            )
+
+        ranking = cause_code_analytics.rank(cols, dimensions)
+        items = [
+            CauseCodeTrend(
+                group=ranking.groups[i],
+                count=int(ranking.total[i]),
+                share=round(float(ranking.share[i]) * 100, 2),
+                impactScore=round(float(ranking.impact[i]), 1),
+                weightedImpact=round(float(ranking.weighted[i]), 2),
+                trend=round(float(ranking.trend[i]), 3),
+                series=ranking.series[i].astype(int).tolist(),
+            )
+            for i in cause_code_analytics.order(ranking, sort, limit).tolist()
+        ]
+        return CauseCodeAnalyticsResponse(
+            window=window,
+            interval=interval,
+            groupBy=dimensions,
+            buckets=[datetime.fromtimestamp(t, tz=timezone.utc) for t in ranking.buckets.tolist()],
+            items=items,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
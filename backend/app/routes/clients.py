@@ -1,25 +1,55 @@
 """Client/device routes."""
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
-from app.models.client import ClientResponse, Client
-from app.database.influx_client import influx_service
+import time
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from typing import Any, Dict, Iterator, Optional
 from app.config import settings
+from app.models.client import ClientResponse, ClientUsageResponse, UniqueClientsResponse
+from app.models.records import ClientRecord
+from app.database.result_budget import Bounded
+from app.routes.dependencies import row_limit, run_query, unwrap_bounded, venue_scope
+from app.services.unique_clients import HOUR, unique_clients
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
+USAGE_GROUP_TAGS = ("zoneId", "apMac", "apName", "wlan", "os", "deviceType")
+
+
+def _index_clients(rows: Iterator[Dict[str, Any]]) -> Dict[str, ClientRecord]:
+    """Fold per-field rows into one record per client MAC."""
+    index: Dict[str, ClientRecord] = {}
+    for r in rows:
+        mac = r.get("macAddress")
+        rec = index.get(mac)
+        if rec is None:
+            rec = index[mac] = ClientRecord(
+                macAddress=mac if mac is not None else "",
+                wlan=r.get("wlan"),
+                apName=r.get("apName"),
+                apMac=r.get("apMac"),
+                os=r.get("os"),
+                deviceType=r.get("deviceType"),
+            )
+        rec.set_field(r.get("_field"), r.get("_value"))
+    return index
+
 
 @router.get("", response_model=ClientResponse)
 async def get_clients(
+    response: Response,
     zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
     apId: Optional[str] = Query(None, description="Filter by access point ID"),
     limit: int = Query(100, description="Number of results"),
     offset: int = Query(0, description="Pagination offset"),
-    sort: str = Query("dataUsage", description='Sort by "dataUsage" | "hostname" | "timestamp"')
+    sort: str = Query("dataUsage", description='Sort by "dataUsage" | "hostname" | "timestamp"'),
+    venue: VenueScope = Depends(venue_scope)
 ):
     """
     Get list of connected clients/devices.
     
     Returns clients filtered by zone and/or AP, sorted by data usage, hostname, or timestamp.
+    Reading stops at the configured row/byte budget; a cut-short result sets
+    `truncated` and the `X-Result-Truncated` header.
     """
     try:
         filters = []
@@ -29,48 +59,23 @@ async def get_clients(
             filters.append(f'r["apMac"] == "{apId}"')
         filter_str = " and ".join(filters) if filters else "true"
         query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
+            f"from(bucket: \"{venue.bucket}\")\n"
             "  |> range(start: -2h)\n"
             "  |> filter(fn: (r) => r[\"_measurement\"] == \"client_metrics\")\n"
+            f"{venue.scope_filter}"
             f"  |> filter(fn: (r) => {filter_str})\n"
-            "  |> group(columns: [\"macAddress\"])\n"
+            "  |> group(columns: [\"macAddress\", \"_field\"])\n"
             "  |> last()\n"
+            f"{row_limit(settings.clients_max_rows)}"
         )
-        rows = influx_service.query_dicts(query)
-        items: list[Client] = []
-        index: dict[str, dict] = {}
-        for r in rows:
-            mac = r.get("macAddress")
-            if mac not in index:
-                index[mac] = {
-                    "hostname": None,
-                    "modelName": None,
-                    "ipAddress": None,
-                    "macAddress": mac,
-                    "wlan": r.get("wlan"),
-                    "apName": r.get("apName"),
-                    "apMac": r.get("apMac"),
-                    "dataUsage": 0.0,
-                    "os": r.get("os"),
-                    "deviceType": r.get("deviceType"),
-                }
-            field_name = r.get("_field")
-            index[mac][field_name] = r.get("_value")
-
-        for v in index.values():
-            items.append(Client(
-                hostname=str(v.get("hostname", "")),
-                modelName=str(v.get("modelName", "Unknown")),
-                ipAddress=str(v.get("ipAddress", "")),
-                macAddress=str(v.get("macAddress", "")),
-                wlan=str(v.get("wlan", "")),
-                apName=str(v.get("apName", "")),
-                apMac=str(v.get("apMac", "")),
-                dataUsage=float(v.get("dataUsage", 0.0)),
-                os=str(v.get("os", "Unknown")),
-                deviceType=str(v.get("deviceType", "other")),
-            ))
+        result = await run_query(
+            query,
+            Bounded(_index_clients, settings.clients_max_rows, settings.clients_max_bytes),
+            cache_ttl=settings.clients_cache_ttl_seconds,
+        )
+        index = unwrap_bounded(result, response)
 
+        items = list(index.values())
         if sort == "hostname":
             items.sort(key=lambda x: x.hostname.lower())
         elif sort == "timestamp":
@@ -79,7 +84,8 @@ async def get_clients(
             items.sort(key=lambda x: x.dataUsage, reverse=True)
 
         total = len(items)
-        page = items[offset: offset + limit]
+        # only the returned page is converted to response models
+        page = [rec.to_model() for rec in items[offset: offset + limit]]
         return ClientResponse(
             data=page,
             pagination={
@@ -87,7 +93,74 @@ async def get_clients(
                 "limit": limit,
                 "offset": offset,
                 "hasMore": (offset + limit) < total,
-            }
+            },
+            truncated=result.truncated,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/usage", response_model=ClientUsageResponse)
+async def get_client_usage(
+    groupBy: str = Query("apMac", description=f'Comma-separated tags: {", ".join(USAGE_GROUP_TAGS)}'),
+    window: str = Query("1h", pattern=r"^\d+[mhdw]$", description='Time range, e.g. "1h", "24h", "7d"'),
+    agg: str = Query("last", description='Usage per client: "last" value or "sum" over the window'),
+    zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
+    limit: int = Query(1000, ge=1, le=10000, description="Number of groups to return"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get client data usage totals per group.
+    
+    Usage is reduced per client (`last` or `sum` over the window), then summed
+    per group together with the client count, all in Flux. Only the top
+    `limit` groups by usage are returned.
+    """
+    dimensions = [d.strip() for d in groupBy.split(",") if d.strip()]
+    unknown = [d for d in dimensions if d not in USAGE_GROUP_TAGS]
+    if not dimensions or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"groupBy must be a comma-separated subset of {', '.join(USAGE_GROUP_TAGS)}",
+        )
+    if agg not in ("last", "sum"):
+        raise HTTPException(status_code=400, detail='agg must be "last" or "sum"')
+    dimensions = list(dict.fromkeys(dimensions))
+    try:
+        group_cols = ", ".join(f'"{d}"' for d in dimensions)
+        zone_filter = f'  |> filter(fn: (r) => r["zoneId"] == "{zoneId}")\n' if zoneId else ""
+        query = (
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: -{window})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"client_metrics\")\n"
+            f"{venue.scope_filter}"
+            "  |> filter(fn: (r) => r[\"_field\"] == \"dataUsage\")\n"
+            f"{zone_filter}"
+            f"  |> group(columns: [\"macAddress\", {group_cols}])\n"
+            f"  |> {agg}()\n"
+            f"  |> group(columns: [{group_cols}])\n"
+            "  |> reduce(\n"
+            "      identity: {usage: 0.0, clients: 0},\n"
+            "      fn: (r, accumulator) => ({usage: accumulator.usage + float(v: r._value), clients: accumulator.clients + 1})\n"
+            "  )\n"
+            "  |> group()\n"
+            "  |> sort(columns: [\"usage\"], desc: true)\n"
+            f"  |> limit(n: {limit})\n"
+        )
+        rows = await run_query(query)
+        groups: dict[str, list[str]] = {d: [] for d in dimensions}
+        usage: list[float] = []
+        clients: list[int] = []
+        for r in rows:
+            for d in dimensions:
+                groups[d].append(str(r.get(d) or ""))
+            usage.append(round(float(r.get("usage") or 0.0), 2))
+            clients.append(int(r.get("clients") or 0))
+        return ClientUsageResponse(
+            groupBy=dimensions, window=window, agg=agg, groups=groups, dataUsage=usage, clients=clients
         )
 
     except HTTPException:
@@ -96,3 +169,32 @@ async def get_clients(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/unique", response_model=UniqueClientsResponse)
+async def get_unique_clients(
+    window: str = Query("7d", pattern=r"^\d+[hdw]$", description='Window in whole hours, e.g. "24h", "7d"'),
+    zoneIds: Optional[str] = Query(None, description="Comma-separated zone IDs (default: all zones)"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get approximate distinct clients over a window, in total and per zone.
+    
+    Merges the hourly per-zone HyperLogLog sketches maintained in the
+    background, so no client data is scanned per request. The total counts
+    a client seen in several zones once.
+    """
+    hours = int(window[:-1]) * {"h": 1, "d": 24, "w": 168}[window[-1]]
+    if not 1 <= hours <= settings.unique_clients_retention_days * 24:
+        raise HTTPException(
+            status_code=400,
+            detail=f"window must be between 1h and {settings.unique_clients_retention_days}d",
+        )
+    zone_ids = [z.strip() for z in zoneIds.split(",") if z.strip()] if zoneIds else None
+    try:
+        stop = (int(time.time()) // HOUR + 1) * HOUR
+        result = unique_clients.estimate(venue.id, stop - hours * HOUR, stop, zone_ids)
+        return UniqueClientsResponse(window=window, zoneIds=zone_ids, **result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,143 @@
+"""Shared route dependencies."""
+import hashlib
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+from fastapi import HTTPException, Response
+from typing import Any, Callable, Dict, Iterator, Optional
+from app.config import settings
+from app.database.influx_client import influx_service
+from app.database.query_cache import CACHE_SCHEMA, query_cache
+from app.database.query_scheduler import BACKGROUND, INTERACTIVE, QueryRejected
+from app.database.result_budget import BoundedResult
+from app.services.venue_registry import VenueScope, venue_registry
+
+
+def venue_scope(venueId: Optional[str] = None) -> VenueScope:
+    """Resolve the venue a request is scoped to.
+
+    Routes mounted under ``/venues/{venueId}`` receive the path parameter;
+    unscoped routes accept an optional ``venueId`` query parameter and fall
+    back to the default venue.
+    """
+    try:
+        return venue_registry.get(venueId)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown venue: {venueId}")
+
+
+def overloaded(exc: QueryRejected) -> HTTPException:
+    """503 response for a query shed by the scheduler."""
+    return HTTPException(
+        status_code=503,
+        detail="Query capacity exhausted, retry later",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+
+@lru_cache(maxsize=None)
+def _code_version(module: str) -> str:
+    """Hash of the consumer's module and the response models.
+
+    Part of the cache key, so a deploy that changes what a consumer returns
+    never unpickles results persisted by the previous code.
+    """
+    digest = hashlib.sha256()
+    spec = importlib.util.find_spec(module)
+    origin = spec.origin if spec is not None else None
+    files = sorted(MODELS_DIR.glob("*.py"))
+    if origin and origin.endswith(".py"):
+        files.append(Path(origin))
+    for path in files:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _consumer_module(consume: Callable[[Iterator[Dict[str, Any]]], Any]) -> str:
+    """Module of the function that shapes the result, looking through wrappers such as ``Bounded``."""
+    while hasattr(consume, "consume"):
+        consume = consume.consume
+    return getattr(consume, "__module__", None) or type(consume).__module__
+
+
+def versioned_cache_key(module: str, *parts: Any) -> str:
+    """Query-cache key for a result built by code in ``module``.
+
+    Prefixed with the API version, ``CACHE_SCHEMA`` and the code version of
+    ``module``, so persisted entries are never read by different code.
+    """
+    return query_cache.make_key(settings.api_version, CACHE_SCHEMA, _code_version(module), *parts)
+
+
+def _cache_key(query: str, consume: Callable[[Iterator[Dict[str, Any]]], Any]) -> str:
+    consumer = getattr(consume, "cache_key", None) or f"{consume.__module__}.{consume.__qualname__}"
+    return versioned_cache_key(_consumer_module(consume), consumer, query)
+
+
+async def run_query(
+    query: str,
+    consume: Callable[[Iterator[Dict[str, Any]]], Any] = list,
+    query_class: str = INTERACTIVE,
+    cache_ttl: float = 0,
+) -> Any:
+    """Run a Flux query through the scheduler, answering 503 when it is shed.
+
+    With ``cache_ttl`` the consumed result goes through the query cache:
+    stale results are served while a background-priority query refreshes
+    them. Results may be shared with concurrent identical requests; treat
+    them as read-only.
+    """
+    try:
+        if not cache_ttl:
+            return await influx_service.query_async(query, consume, query_class)
+        return await query_cache.get(
+            _cache_key(query, consume),
+            lambda: influx_service.query_async(query, consume, query_class),
+            cache_ttl,
+            refresh=lambda: influx_service.query_async(query, consume, BACKGROUND),
+        )
+    except QueryRejected as e:
+        raise overloaded(e)
+
+
+async def refresh_query(
+    query: str,
+    consume: Callable[[Iterator[Dict[str, Any]]], Any] = list,
+    cache_ttl: float = 0,
+) -> Any:
+    """Reload the cached result ``run_query(query, consume, cache_ttl=cache_ttl)`` serves.
+
+    Runs at background priority; used by refresh jobs so requests find the
+    result fresh instead of querying InfluxDB themselves.
+    """
+    return await query_cache.refresh(
+        _cache_key(query, consume),
+        lambda: influx_service.query_async(query, consume, BACKGROUND),
+        cache_ttl,
+    )
+
+
+TRUNCATED_HEADER = "X-Result-Truncated"
+
+
+def row_limit(max_rows: int, newest_first: bool = False) -> str:
+    """Flux tail that stops InfluxDB after ``max_rows`` + 1 rows (one extra to detect truncation).
+
+    With ``newest_first`` rows are sorted by ``_time`` descending first, so a
+    truncated result keeps the most recent ones.
+    """
+    if not max_rows:
+        return ""
+    order = "  |> sort(columns: [\"_time\"], desc: true)\n" if newest_first else ""
+    return f"  |> group()\n{order}  |> limit(n: {max_rows + 1})\n"
+
+
+def unwrap_bounded(result: BoundedResult, response: Response) -> Any:
+    """Return the consumed value, flagging a truncated result with ``X-Result-Truncated``."""
+    if result.truncated:
+        response.headers[TRUNCATED_HEADER] = "true"
+    return result.value
@@ -0,0 +1,181 @@
+"""Streaming export routes."""
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from app.database.influx_client import influx_service
+from app.database.query_scheduler import EXPORT, Lease, QueryRejected
+from app.routes.dependencies import overloaded, venue_scope
+from app.services.venue_registry import VenueScope
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+CLIENT_COLUMNS = [
+    "hostname", "modelName", "ipAddress", "macAddress", "wlan",
+    "apName", "apMac", "zoneId", "dataUsage", "os", "deviceType",
+]
+ANOMALY_COLUMNS = [
+    "id", "timestamp", "type", "severity", "zoneId", "affectedZone",
+    "metric", "value", "description",
+]
+
+
+CLIENT_TAGS = ["apMac", "apName", "zoneId", "wlan", "os", "deviceType"]
+
+
+def _pivot(query: str, row_key: Sequence[str] = ("_time",)) -> str:
+    """Turn per-field records into one row per point."""
+    columns = ", ".join(f'"{c}"' for c in row_key)
+    return query + f"  |> pivot(rowKey: [{columns}], columnKey: [\"_field\"], valueColumn: \"_value\")\n"
+
+
+def _client_rows(venue: VenueScope, zoneId: Optional[str], apId: Optional[str]) -> Iterator[Dict[str, Any]]:
+    filters = []
+    if zoneId:
+        filters.append(f'r["zoneId"] == "{zoneId}"')
+    if apId:
+        filters.append(f'r["apMac"] == "{apId}"')
+    filter_str = " and ".join(filters) if filters else "true"
+    query = _pivot(
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -2h)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"client_metrics\")\n"
+        f"{venue.scope_filter}"
+        f"  |> filter(fn: (r) => {filter_str})\n"
+        # one row per client, as in /clients, even if it roamed or changed tags
+        "  |> group(columns: [\"macAddress\", \"_field\"])\n"
+        "  |> last()\n"
+        "  |> group(columns: [\"macAddress\"])\n",
+        ["_time", "macAddress"] + CLIENT_TAGS,
+    )
+    stream = influx_service.query_stream(query)
+    try:
+        for r in stream:
+            yield {col: r.get(col) for col in CLIENT_COLUMNS}
+    finally:
+        # also when the client disconnects mid-export
+        stream.close()
+
+
+def _anomaly_rows(
+    venue: VenueScope, window: str, severity: Optional[str], zoneId: Optional[str]
+) -> Iterator[Dict[str, Any]]:
+    filters = []
+    if severity:
+        filters.append(f'r["severity"] == "{severity}"')
+    if zoneId:
+        filters.append(f'r["zoneId"] == "{zoneId}"')
+    filter_str = " and ".join(filters) if filters else "true"
+    query = _pivot(
+        f"from(bucket: \"{venue.bucket}\")\n"
+        f"  |> range(start: -{window})\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"anomalies\")\n"
+        f"{venue.scope_filter}"
+        f"  |> filter(fn: (r) => {filter_str})\n"
+    )
+    stream = influx_service.query_stream(query)
+    try:
+        for r in stream:
+            row = {col: r.get(col) for col in ANOMALY_COLUMNS}
+            row["id"] = r.get("anomalyId")
+            row["timestamp"] = r.get("_time")
+            yield row
+    finally:
+        stream.close()
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _ndjson(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=_encode) + "\n"
+
+
+def _csv(rows: Iterator[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else _encode(row[c]) for c in columns])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    # no rows: still emit the header
+    if buf.tell():
+        yield buf.getvalue()
+
+
+class _LeasedStreamingResponse(StreamingResponse):
+    """Holds an export query slot until the response is finished or aborted."""
+
+    def __init__(self, *args: Any, lease: Lease, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lease = lease
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.lease.release()
+
+
+async def _stream(rows: Iterator[Dict[str, Any]], fmt: str, columns: List[str], name: str) -> StreamingResponse:
+    """Stream rows as they are read from InfluxDB.
+
+    The sync generator is pulled from a worker thread one chunk at a time
+    and each chunk is awaited on the socket, so a slow reader slows down the
+    Influx read instead of buffering the export in memory. Exports run in
+    the scheduler's export class and answer 503 when no slot frees up.
+    """
+    try:
+        lease = await influx_service.scheduler.lease(EXPORT)
+    except QueryRejected as e:
+        raise overloaded(e)
+    if fmt == "csv":
+        body, media_type = _csv(rows, columns), "text/csv"
+    else:
+        body, media_type = _ndjson(rows), "application/x-ndjson"
+    return _LeasedStreamingResponse(
+        body,
+        lease=lease,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/clients.{fmt}")
+async def export_clients(
+    fmt: str,
+    zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
+    apId: Optional[str] = Query(None, description="Filter by access point ID"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Export all connected clients as NDJSON (`clients.ndjson`) or CSV (`clients.csv`).
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=404, detail="Export format must be ndjson or csv")
+    return await _stream(_client_rows(venue, zoneId, apId), fmt, CLIENT_COLUMNS, "clients")
+
+
+@router.get("/anomalies.{fmt}")
+async def export_anomalies(
+    fmt: str,
+    window: str = Query("7d", pattern=r"^\d+[mhdw]$", description='History to export, e.g. "24h", "30d"'),
+    severity: Optional[str] = Query(None, description="Filter by severity"),
+    zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Export anomaly history as NDJSON (`anomalies.ndjson`) or CSV (`anomalies.csv`).
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=404, detail="Export format must be ndjson or csv")
+    return await _stream(_anomaly_rows(venue, window, severity, zoneId), fmt, ANOMALY_COLUMNS, "anomalies")
@@ -1,44 +1,66 @@
 """Host usage routes."""
-from fastapi import APIRouter, Query, HTTPException
-from app.models.host_usage import HostUsage
-from app.database.influx_client import influx_service
+from fastapi import APIRouter, Depends, Query, HTTPException
 from app.config import settings
+from app.models.host_usage import HostUsage
+from app.routes.dependencies import refresh_query, run_query, venue_scope
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/hosts", tags=["hosts"])
 
 
+def _hosts_query(venue: VenueScope, limit: int, sort: str, window: str, agg: str) -> str:
+    """Top (or bottom) ``limit`` hosts by data usage, ranked in Flux."""
+    select = "top" if sort == "desc" else "bottom"
+    return (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        f"  |> range(start: -{window})\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"host_usage\")\n"
+        f"{venue.scope_filter}"
+        "  |> filter(fn: (r) => r[\"_field\"] == \"dataUsage\")\n"
+        "  |> group(columns: [\"hostname\"])\n"
+        f"  |> {agg}()\n"
+        "  |> group()\n"
+        f"  |> {select}(n: {limit}, columns: [\"_value\"])\n"
+    )
+
+
+async def refresh_hosts(venue: VenueScope) -> None:
+    """Reload the dashboard's default top-hosts view at background priority (a refresh job)."""
+    await refresh_query(_hosts_query(venue, 10, "desc", "24h", "last"), cache_ttl=settings.hosts_cache_ttl_seconds)
+
+
 @router.get("", response_model=list[HostUsage])
 async def get_hosts(
-    limit: int = Query(10, description="Number of top hosts to return"),
-    sort: str = Query("desc", description='Sort order "desc" | "asc"')
+    limit: int = Query(10, ge=1, le=1000, description="Number of top hosts to return"),
+    sort: str = Query("desc", description='Sort order "desc" | "asc"'),
+    window: str = Query("24h", pattern=r"^\d+[mhdw]$", description='Time range to consider, e.g. "1h", "24h", "7d"'),
+    agg: str = Query("last", description='Usage per host: "last" value or "sum" over the window'),
+    venue: VenueScope = Depends(venue_scope)
 ):
     """
     Get host data usage statistics.
     
     Returns top hosts by data usage, sorted in descending or ascending order.
+    Ranking runs in Flux (`top()`/`bottom()`), so only `limit` rows are
+    returned by InfluxDB regardless of how many hosts exist. Results are
+    cached; the default view is kept fresh by a background refresh job.
     """
+    if sort not in ("desc", "asc"):
+        raise HTTPException(status_code=400, detail='sort must be "desc" or "asc"')
+    if agg not in ("last", "sum"):
+        raise HTTPException(status_code=400, detail='agg must be "last" or "sum"')
     try:
-        query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
-            "  |> range(start: -24h)\n"
-            "  |> filter(fn: (r) => r[\"_measurement\"] == \"host_usage\")\n"
-            "  |> group(columns: [\"hostname\"])\n"
-            "  |> last()\n"
+        rows = await run_query(
+            _hosts_query(venue, limit, sort, window, agg), cache_ttl=settings.hosts_cache_ttl_seconds
         )
-        rows = influx_service.query_dicts(query)
-        by_host: dict[str, float] = {}
-        for r in rows:
-            if r.get("_field") == "dataUsage":
-                by_host[str(r.get("hostname"))] = float(r.get("_value") or 0.0)
-
-        items = [HostUsage(hostname=k, dataUsage=v) for k, v in by_host.items()]
-        reverse = sort == "desc"
-        items.sort(key=lambda x: x.dataUsage, reverse=reverse)
+        items = [
+            HostUsage(hostname=str(r.get("hostname")), dataUsage=float(r.get("_value") or 0.0))
+            for r in rows
+        ]
+        items.sort(key=lambda x: x.dataUsage, reverse=sort == "desc")
         return items[: limit]
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-
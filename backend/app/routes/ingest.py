@@ -0,0 +1,176 @@
+"""Metric ingestion routes."""
+import asyncio
+import json
+import re
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status
+from influxdb_client import Point
+from typing import Any, List, Optional
+from app.config import settings
+from app.database.write_buffer import BufferFull, write_buffer
+from app.models.ingest import IngestResponse, IngestStats
+from app.routes.dependencies import venue_scope
+from app.services.venue_registry import VenueScope
+
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+KNOWN_MEASUREMENTS = frozenset({
+    "venue_metrics",
+    "zone_metrics",
+    "ap_metrics",
+    "radio_metrics",
+    "client_metrics",
+    "disconnect_codes",
+    "anomalies",
+    "host_usage",
+    "os_distribution",
+    "band_load",
+    "metrics",
+})
+PRECISIONS = ("ns", "us", "ms", "s")
+
+_UNESCAPED_SPACE = re.compile(r"(?<!\\) ")
+_UNESCAPED_COMMA = re.compile(r"(?<!\\),")
+
+
+def _check_line(line: str, venue: VenueScope) -> Optional[str]:
+    """Cheap structural check of one line-protocol line; returns an error or None.
+
+    Only the series key is inspected (measurement, venue tag) and a field set
+    must be present; full parsing is left to InfluxDB.
+    """
+    parts = _UNESCAPED_SPACE.split(line, maxsplit=2)
+    if len(parts) < 2 or "=" not in parts[1]:
+        return "missing field set"
+    key = parts[0]
+    measurement = _UNESCAPED_COMMA.split(key, maxsplit=1)[0]
+    if measurement not in KNOWN_MEASUREMENTS:
+        return f"unknown measurement {measurement!r}"
+    if venue.partitioned and f",venueId={venue.id}," not in key + ",":
+        return f"missing tag venueId={venue.id}"
+    return None
+
+
+def _parse_line_protocol(body: str, venue: VenueScope) -> List[str]:
+    lines: List[str] = []
+    errors: List[str] = []
+    for number, raw in enumerate(body.splitlines(), start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        error = _check_line(line, venue)
+        if error:
+            errors.append(f"line {number}: {error}")
+            if len(errors) >= 10:
+                break
+            continue
+        lines.append(line)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+    return lines
+
+
+def _parse_json(body: bytes, venue: VenueScope, precision: str) -> List[str]:
+    try:
+        payload: Any = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    points = payload.get("points") if isinstance(payload, dict) else payload
+    if not isinstance(points, list):
+        raise HTTPException(status_code=400, detail='Expected a list of points or {"points": [...]}')
+
+    lines: List[str] = []
+    for number, p in enumerate(points):
+        if not isinstance(p, dict) or p.get("measurement") not in KNOWN_MEASUREMENTS:
+            raise HTTPException(status_code=400, detail=f"point {number}: unknown or missing measurement")
+        if not isinstance(p.get("fields"), dict) or not p["fields"]:
+            raise HTTPException(status_code=400, detail=f"point {number}: missing fields")
+        if venue.partitioned:
+            p = {**p, "tags": {**(p.get("tags") or {}), "venueId": venue.id}}
+        try:
+            line = Point.from_dict(p, write_precision=precision).to_line_protocol()
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"point {number}: {e}")
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _parse_body(body: bytes, content_type: str, venue: VenueScope, precision: str) -> List[str]:
+    """Validated line-protocol lines of a JSON or line-protocol body."""
+    if content_type.startswith("application/json"):
+        return _parse_json(body, venue, precision)
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8")
+    return _parse_line_protocol(text, venue)
+
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """Read the request body, answering 413 before holding more than ``limit`` bytes."""
+    too_large = HTTPException(status_code=413, detail="Batch too large")
+    declared = request.headers.get("content-length")
+    if declared is not None:
+        try:
+            if int(declared) > limit:
+                raise too_large
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@router.post("", response_model=IngestResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest(
+    request: Request,
+    precision: str = Query("ns", description='Timestamp precision "ns" | "us" | "ms" | "s"'),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Ingest a batch of controller metrics.
+
+    Accepts InfluxDB line protocol (`text/plain`) or JSON (`application/json`,
+    a list of `{measurement, tags, fields, time}` objects). Points are
+    validated, queued and written asynchronously in batches; the response is
+    returned as soon as the batch is queued. When the queue is full the
+    request is rejected with 503 and `Retry-After`.
+    """
+    if precision not in PRECISIONS:
+        raise HTTPException(status_code=400, detail=f"Invalid precision: {precision}")
+    body = await _read_body(request, settings.ingest_max_body_bytes)
+    # a full batch takes seconds to validate; keep it off the event loop
+    lines = await asyncio.to_thread(_parse_body, body, request.headers.get("content-type", ""), venue, precision)
+
+    try:
+        write_buffer.submit(venue.bucket, lines, precision)
+    except BufferFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Ingest buffer full",
+            headers={"Retry-After": str(max(1, int(settings.ingest_flush_interval_seconds)))},
+        )
+    return IngestResponse(accepted=len(lines), pending=write_buffer.pending)
+
+
+@router.get("/stats", response_model=IngestStats)
+async def ingest_stats():
+    """
+    Get write buffer counters.
+    """
+    s = write_buffer.stats
+    return IngestStats(
+        pending=write_buffer.pending,
+        capacity=write_buffer.max_lines,
+        accepted=s.accepted,
+        written=s.written,
+        dropped=s.dropped,
+        rejected=s.rejected,
+        retries=s.retries,
+        batches=s.batches,
+    )
@@ -1,17 +1,58 @@
 """Load/band utilization routes."""
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import List, Optional
+import numpy as np
 from app.models.load import LoadResponse, BandData, LoadDataPoint
-from app.database.influx_client import influx_service
-from app.config import settings
+from app.routes.dependencies import run_query, venue_scope
+from app.services.transforms import (
+    ColumnReader, Columns, codes_in, factorize, first_index, group_keys, pivot, runs, to_datetimes,
+)
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/load", tags=["load"])
 
+LOAD_COLUMNS = ColumnReader(tags=("band", "_field"))
+LOAD_FIELDS = ("band24G", "band5G", "band6G5G")
+BANDS = ("2.4G", "5G", "6G/5G")
+BAND_COLORS = {"2.4G": "#1E3A5F", "5G": "#10B981", "6G/5G": "#3B82F6"}
+
+
+def _band_items(cols: Columns) -> List[BandData]:
+    """One time-sorted series per band, fields pivoted into columns (missing values are 0).
+
+    The three standard bands come first, even without data; other bands
+    follow in order of first appearance.
+    """
+    band_names, band = factorize(cols.tags["band"])
+    times, time = factorize(cols.time)
+    group, n_points, (point_band, point_time) = group_keys((band, len(band_names)), (time, len(times)))
+    grid = pivot(group, n_points, codes_in(cols.tags["_field"], LOAD_FIELDS), len(LOAD_FIELDS), cols.value)
+    grid = np.nan_to_num(grid, nan=0.0)
+    stamps = to_datetimes(times[point_time])
+    bounds = runs(point_band, len(band_names))
+
+    first_seen = first_index(band, len(band_names))
+    position = {name: i for i, name in enumerate(band_names.tolist())}
+    extra = [name for name in band_names[np.argsort(first_seen, kind="stable")].tolist() if name not in BANDS]
+    items: List[BandData] = []
+    for name in BANDS + tuple(extra):
+        points: List[LoadDataPoint] = []
+        if name in position:
+            i = position[name]
+            rows = slice(bounds[i], bounds[i + 1])
+            points = [
+                LoadDataPoint(timestamp=ts, band24G=b24, band5G=b5, band6G5G=b6)
+                for ts, (b24, b5, b6) in zip(stamps[rows], grid[rows].tolist())
+            ]
+        items.append(BandData(band=name, color=BAND_COLORS.get(name, "#999999"), data=points))
+    return items
+
 
 @router.get("", response_model=LoadResponse)
 async def get_load(
     hours: int = Query(1, ge=1, le=24, description="Number of hours of data"),
-    zoneId: Optional[str] = Query(None, description="Filter by zone ID")
+    zoneId: Optional[str] = Query(None, description="Filter by zone ID"),
+    venue: VenueScope = Depends(venue_scope)
 ):
     """
     Get frequency band load data over time.
@@ -21,38 +62,14 @@ async def get_load(
     try:
         filt = f'r["zoneId"] == "{zoneId}"' if zoneId else "true"
         query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
+            f"from(bucket: \"{venue.bucket}\")\n"
             f"  |> range(start: -{hours}h)\n"
-            "  |> filter(fn: (r) => r[\\\"_measurement\\\"] == \\\"band_load\\\")\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"band_load\")\n"
+            f"{venue.scope_filter}"
             f"  |> filter(fn: (r) => {filt})\n"
         )
-        rows = influx_service.query_dicts(query)
-        bands: dict[str, dict[str, list[dict]]] = {"2.4G": {}, "5G": {}, "6G/5G": {}}
-        for r in rows:
-            band = str(r.get("band"))
-            ts = r.get("_time")
-            field_name = r.get("_field")
-            if band not in bands:
-                bands[band] = {}
-            if ts not in bands[band]:
-                bands[band][ts] = {"timestamp": ts, "band24G": 0.0, "band5G": 0.0, "band6G5G": 0.0}
-            bands[band][ts][field_name] = float(r.get("_value") or 0.0)
-
-        band_items: list[BandData] = []
-        color_map = {"2.4G": "#1E3A5F", "5G": "#10B981", "6G/5G": "#3B82F6"}
-        for band, time_map in bands.items():
-            points: list[LoadDataPoint] = []
-            for ts in sorted(time_map.keys()):
-                vals = time_map[ts]
-                points.append(LoadDataPoint(
-                    timestamp=vals["timestamp"],
-                    band24G=float(vals.get("band24G", 0.0)),
-                    band5G=float(vals.get("band5G", 0.0)),
-                    band6G5G=float(vals.get("band6G5G", 0.0)),
-                ))
-            band_items.append(BandData(band=band, color=color_map.get(band, "#999999"), data=points))
-
-        return LoadResponse(bands=band_items)
+        cols = await run_query(query, LOAD_COLUMNS)
+        return LoadResponse(bands=_band_items(cols))
 
     except HTTPException:
         raise
@@ -0,0 +1,109 @@
+"""Deferred mounting of the API routers."""
+import asyncio
+import importlib
+import time
+from typing import Optional
+from fastapi import APIRouter, FastAPI
+from app.config import settings
+
+# Route modules under app.routes mounted at /api
+ROUTERS = (
+    "venue",
+    "venues",
+    "export",
+    "ingest",
+    "access_points",
+    "aps",
+    "cause_codes",
+    "anomalies",
+    "clients",
+    "hosts",
+    "os_distribution",
+    "load",
+    "time_series",
+    "rf",
+    "zones",
+)
+
+# Per-venue routers also mounted at /api/venues/{venueId}
+VENUE_SCOPED_ROUTERS = (
+    "access_points",
+    "aps",
+    "cause_codes",
+    "anomalies",
+    "clients",
+    "hosts",
+    "os_distribution",
+    "load",
+    "time_series",
+    "rf",
+    "zones",
+    "export",
+    "ingest",
+)
+
+# Probes answered without waiting for the routers
+PROBE_PATHS = frozenset({"/", "/health/live", "/health/ready"})
+
+
+class RouterLoader:
+    """Imports the route modules off the event loop and mounts them once.
+
+    Importing the routes pulls in every response model and the analytics
+    dependencies (NumPy, the Influx client), which dominates cold start. The
+    import runs in a worker thread after startup; the finished routes are
+    then added to the app in one step on the loop.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.loaded = False
+        self.seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _build(self) -> APIRouter:
+        api = APIRouter()
+        for name in ROUTERS:
+            module = importlib.import_module(f"app.routes.{name}")
+            api.include_router(module.router, prefix=settings.api_prefix)
+        venue_prefix = f"{settings.api_prefix}/venues/{{venueId}}"
+        for name in VENUE_SCOPED_ROUTERS:
+            module = importlib.import_module(f"app.routes.{name}")
+            api.include_router(module.router, prefix=venue_prefix)
+        return api
+
+    async def _load(self) -> None:
+        started = time.perf_counter()
+        api = await asyncio.to_thread(self._build)
+        self.app.router.routes.extend(api.routes)
+        self.app.openapi_schema = None
+        self.loaded = True
+        self.seconds = time.perf_counter() - started
+
+    async def load(self) -> None:
+        """Mount the routers, or wait for the load already in progress."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._load())
+        await asyncio.shield(self._task)
+
+
+class WaitForRouters:
+    """ASGI middleware holding requests until the API routers are mounted.
+
+    Liveness and readiness probes are answered immediately; any other
+    request triggers (or waits for) the load, so the first API call never
+    sees a 404.
+    """
+
+    def __init__(self, app, loader: RouterLoader):
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            not self.loader.loaded
+            and scope["type"] == "http"
+            and scope["path"] not in PROBE_PATHS
+        ):
+            await self.loader.load()
+        await self.app(scope, receive, send)
@@ -1,32 +1,60 @@
 """OS distribution routes."""
-from fastapi import APIRouter, HTTPException
-from app.models.os_distribution import OSDistribution
-from app.database.influx_client import influx_service
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Any, Dict, Iterator
 from app.config import settings
+from app.database.result_budget import Bounded
+from app.models.os_distribution import OSDistribution
+from app.routes.dependencies import refresh_query, row_limit, run_query, unwrap_bounded, venue_scope
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/os-distribution", tags=["os-distribution"])
 
 
+def _count_os(rows: Iterator[Dict[str, Any]]) -> Dict[str, int]:
+    """Count clients (one row per MAC) per operating system."""
+    counts: Dict[str, int] = {}
+    for r in rows:
+        os_name = str(r.get("os") or "Unknown")
+        counts[os_name] = counts.get(os_name, 0) + 1
+    return counts
+
+
+_OS_COUNTS = Bounded(_count_os, settings.os_distribution_max_rows, settings.os_distribution_max_bytes)
+
+
+def _os_query(venue: VenueScope) -> str:
+    """Latest row per client MAC over the last two hours."""
+    return (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -2h)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"client_metrics\")\n"
+        f"{venue.scope_filter}"
+        "  |> group(columns: [\"macAddress\"])\n"
+        "  |> last()\n"
+        f"{row_limit(settings.os_distribution_max_rows)}"
+    )
+
+
+async def refresh_os_distribution(venue: VenueScope) -> None:
+    """Reload the cached per-OS client counts at background priority (a refresh job)."""
+    await refresh_query(_os_query(venue), _OS_COUNTS, settings.os_distribution_cache_ttl_seconds)
+
+
 @router.get("", response_model=list[OSDistribution])
-async def get_os_distribution():
+async def get_os_distribution(response: Response, venue: VenueScope = Depends(venue_scope)):
     """
     Get operating system distribution percentages.
     
     Returns percentage breakdown of connected clients by operating system.
+    Clients past the configured row/byte budget are not counted and the
+    `X-Result-Truncated` header is set. Counts are cached and kept fresh by
+    a background refresh job.
     """
     try:
-        query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
-            "  |> range(start: -2h)\n"
-            "  |> filter(fn: (r) => r[\"_measurement\"] == \"client_metrics\")\n"
-            "  |> group(columns: [\"macAddress\"])\n"
-            "  |> last()\n"
+        result = await run_query(
+            _os_query(venue), _OS_COUNTS, cache_ttl=settings.os_distribution_cache_ttl_seconds
         )
-        rows = influx_service.query_dicts(query)
-        counts: dict[str, int] = {}
-        for r in rows:
-            os_name = str(r.get("os") or "Unknown")
-            counts[os_name] = counts.get(os_name, 0) + 1
+        counts = unwrap_bounded(result, response)
         total = sum(counts.values()) or 1
         color_map = {
             "iOS": "#8B5CF6",
@@ -0,0 +1,97 @@
+"""RF channel-plan routes."""
+import asyncio
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import Optional
+from app.config import settings
+from app.models.rf import RFAnalysisResponse, ZoneRFAnalysis, ChannelAPsResponse
+from app.routes.dependencies import run_query, venue_scope
+from app.services.rf_analytics import HISTOGRAM_EDGES, RadioSnapshot, SnapshotCache
+from app.services.venue_registry import VenueScope
+
+router = APIRouter(prefix="/rf", tags=["rf"])
+
+snapshots = SnapshotCache(ttl=settings.rf_snapshot_ttl_seconds)
+
+
+async def _snapshot(venue: VenueScope) -> RadioSnapshot:
+    """Latest radio state of ``venue``, rebuilt at most once per TTL."""
+    snapshot = snapshots.get(venue.id)
+    if snapshot is not None:
+        return snapshot
+    radio_query = (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -30m)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"radio_metrics\")\n"
+        f"{venue.scope_filter}"
+        "  |> filter(fn: (r) => r[\"_field\"] == \"channel\" or r[\"_field\"] == \"noiseFloor\")\n"
+        "  |> group(columns: [\"zoneId\", \"apMac\", \"band\", \"_field\"])\n"
+        "  |> last()\n"
+        "  |> pivot(rowKey: [\"apMac\", \"band\"], columnKey: [\"_field\"], valueColumn: \"_value\")\n"
+    )
+    ap_query = (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -30m)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"ap_metrics\")\n"
+        f"{venue.scope_filter}"
+        "  |> filter(fn: (r) => r[\"_field\"] == \"channelUtilization\")\n"
+        "  |> group(columns: [\"zoneId\", \"apMac\"])\n"
+        "  |> last()\n"
+    )
+    radio_rows, ap_rows = await asyncio.gather(run_query(radio_query), run_query(ap_query))
+    snapshot = await asyncio.to_thread(RadioSnapshot, radio_rows, ap_rows)
+    return snapshots.put(venue.id, snapshot)
+
+
+@router.get("/analysis", response_model=RFAnalysisResponse)
+async def get_rf_analysis(
+    zoneId: Optional[str] = Query(None, description="Limit to one zone"),
+    band: Optional[str] = Query(None, description='Limit to one band, e.g. "5GHz"'),
+    outlierScore: float = Query(3.5, gt=0, description="Modified z-score above which a noise floor is an outlier"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get the venue-wide RF channel plan analysis.
+    
+    Per zone: radios sharing a band and channel (co-channel groups), a histogram
+    of AP channel utilization in 10% bins, and radios whose noise floor is far
+    above the zone/band median. Computed over column arrays of the latest radio
+    state, which is cached per venue for `RF_SNAPSHOT_TTL_SECONDS`.
+    """
+    try:
+        snapshot = await _snapshot(venue)
+        zones = snapshot.analyze(zone_id=zoneId, band=band, outlier_z=outlierScore)
+        return RFAnalysisResponse(
+            radios=len(snapshot),
+            histogramEdges=HISTOGRAM_EDGES,
+            zones=[ZoneRFAnalysis(**asdict(z)) for z in zones],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/channels", response_model=ChannelAPsResponse)
+async def get_channel_aps(
+    zoneId: str = Query(..., description="Zone ID"),
+    band: str = Query(..., description='Band, e.g. "5GHz"'),
+    channel: int = Query(..., ge=1, description="Channel number"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get the APs with a radio on one channel of a zone.
+    
+    Answered from the in-memory (zone, band, channel) index.
+    """
+    try:
+        snapshot = await _snapshot(venue)
+        return ChannelAPsResponse(
+            zoneId=zoneId, band=band, channel=channel, aps=snapshot.aps_on(zoneId, band, channel)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
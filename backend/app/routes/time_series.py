@@ -1,26 +1,105 @@
 """Time series routes."""
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+import json
+import re
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from typing import List, Optional
+import numpy as np
 from datetime import datetime
-from app.models.time_series import TimeSeriesPoint
-from app.database.influx_client import influx_service
-from app.config import settings
+from app.models.time_series import TimeSeriesPoint, MultiSeriesResponse, ZoneSeries
+from app.routes.dependencies import run_query, venue_scope
+from app.routes.windows import flux_time, resolve_window, split
+from app.services.transforms import (
+    ColumnReader, Columns, codes_in, factorize, first_index, group_keys, nullable, pivot, runs, to_datetimes,
+)
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/time-series", tags=["time-series"])
 
+METRIC_NAME = re.compile(r"^[A-Za-z0-9_]+$")
+WINDOW_AGGS = ("mean", "min", "max", "median", "sum", "count")
+PERCENTILE = re.compile(r"^p([1-9]\d?)$")
+
+
+def _window_fn(agg: str) -> str:
+    """Return the Flux ``aggregateWindow`` function for an aggregation name."""
+    if agg in WINDOW_AGGS:
+        return agg
+    match = PERCENTILE.match(agg)
+    if not match:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown aggregation '{agg}'; use {', '.join(WINDOW_AGGS)} or p1..p99",
+        )
+    q = int(match.group(1)) / 100
+    return f"(column, tables=<-) => tables |> quantile(q: {q}, column: column)"
+
+
+POINT_COLUMNS = ColumnReader(tags=("_field", "zoneId", "zoneName"))
+SERIES_COLUMNS = ColumnReader(tags=("zoneId", "zoneName", "metric", "agg"))
+
+
+def _points(cols: Columns) -> List[TimeSeriesPoint]:
+    """Points of the ``value`` field, sorted by time (missing values are 0)."""
+    cols = cols.take(cols.tags["_field"] == "value")
+    order = np.argsort(cols.time, kind="stable")
+    zone = np.where(cols.tags["zoneName"] != "", cols.tags["zoneName"], cols.tags["zoneId"])
+    return [
+        TimeSeriesPoint(timestamp=ts, value=value, zone=name)
+        for ts, value, name in zip(
+            to_datetimes(cols.time[order]),
+            np.nan_to_num(cols.value[order], nan=0.0).tolist(),
+            zone[order].tolist(),
+        )
+    ]
+
+
+def _zone_series(cols: Columns, columns: List[str]) -> List[ZoneSeries]:
+    """Pivot ``metric``/``agg`` rows into per-zone columns aligned with the zone's timestamps.
+
+    Zones are sorted by id; each zone's timestamps are the windows where
+    any requested column has a value.
+    """
+    zone_ids, zone = factorize(cols.tags["zoneId"])
+    names = cols.tags["zoneName"][first_index(zone, len(zone_ids))]
+    column = codes_in(np.char.add(np.char.add(cols.tags["metric"], "."), cols.tags["agg"]), columns)
+    keep = (column >= 0) & ~np.isnan(cols.value)
+    times, time = factorize(cols.time[keep])
+    group, n_points, (point_zone, point_time) = group_keys(
+        (zone[keep], len(zone_ids)), (time, len(times))
+    )
+    grid = pivot(group, n_points, column[keep], len(columns), cols.value[keep])
+    stamps = to_datetimes(times[point_time])
+    bounds = runs(point_zone, len(zone_ids))
+
+    result: List[ZoneSeries] = []
+    for i, (zid, name) in enumerate(zip(zone_ids.tolist(), names.tolist())):
+        rows = slice(bounds[i], bounds[i + 1])
+        result.append(ZoneSeries(
+            zoneId=zid,
+            zoneName=name or zid,
+            timestamps=stamps[rows],
+            series={c: nullable(grid[rows, j]) for j, c in enumerate(columns)},
+        ))
+    return result
+
 
 @router.get("", response_model=list[TimeSeriesPoint])
 async def get_time_series(
+    response: Response,
     metric: str = Query(..., description='Metric type: "experienceScore" | "utilization" | "netflixScore"'),
     zoneIds: Optional[str] = Query(None, description="Comma-separated zone IDs"),
     startTime: Optional[datetime] = Query(None, description="Start timestamp (ISO 8601)"),
     endTime: Optional[datetime] = Query(None, description="End timestamp (ISO 8601)"),
-    interval: int = Query(1, description="Data point interval in minutes")
+    range_: str = Query("1h", alias="range", pattern=r"^\d+[mhdw]$", description='Window ending at endTime when startTime is not given, e.g. "6h", "7d"'),
+    interval: int = Query(1, ge=1, description="Data point interval in minutes"),
+    venue: VenueScope = Depends(venue_scope)
 ):
     """
     Get time-series data for metrics.
     
     Returns time-series data for the specified metric, filtered by zones and time range.
+    The interval is widened if the range would exceed the per-series point budget; the
+    interval actually used is returned in the `X-Interval-Minutes` header.
     """
     try:
         filters = [f'r["metric"] == "{metric}"']
@@ -29,27 +108,17 @@ async def get_time_series(
             if zone_list:
                 filters.append(f'r["zoneId"] =~ /{"|".join(zone_list)}/')
         filter_str = " and ".join(filters)
-        start = startTime.isoformat() if startTime else f"-{max(1, interval)}h"
-        stop = endTime.isoformat() if endTime else "now()"
+        start, stop, interval = resolve_window(startTime, endTime, range_, interval)
+        response.headers["X-Interval-Minutes"] = str(interval)
         query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
-            f"  |> range(start: {start}, stop: {stop})\n"
-            "  |> filter(fn: (r) => r[\\\"_measurement\\\"] == \\\"metrics\\\")\n"
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {flux_time(start)}, stop: {flux_time(stop)})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"metrics\")\n"
+            f"{venue.scope_filter}"
             f"  |> filter(fn: (r) => {filter_str})\n"
             f"  |> aggregateWindow(every: {interval}m, fn: mean, createEmpty: false)\n"
         )
-        rows = influx_service.query_dicts(query)
-        items: list[TimeSeriesPoint] = []
-        for r in rows:
-            if r.get("_field") != "value":
-                continue
-            items.append(TimeSeriesPoint(
-                timestamp=r.get("_time"),
-                value=float(r.get("_value") or 0.0),
-                zone=str(r.get("zoneName") or r.get("zoneId") or ""),
-            ))
-        items.sort(key=lambda x: x.timestamp)
-        return items
+        return _points(await run_query(query, POINT_COLUMNS))
 
     except HTTPException:
         raise
@@ -57,3 +126,64 @@ async def get_time_series(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/multi", response_model=MultiSeriesResponse)
+async def get_multi_series(
+    metrics: str = Query(..., description='Comma-separated metrics, e.g. "experienceScore,utilization,netflixScore"'),
+    aggs: str = Query("mean", description='Comma-separated aggregations: mean, min, max, median, sum, count, p1..p99'),
+    zoneIds: Optional[str] = Query(None, description="Comma-separated zone IDs"),
+    startTime: Optional[datetime] = Query(None, description="Start timestamp (ISO 8601)"),
+    endTime: Optional[datetime] = Query(None, description="End timestamp (ISO 8601)"),
+    range_: str = Query("1h", alias="range", pattern=r"^\d+[mhdw]$", description='Window ending at endTime when startTime is not given, e.g. "6h", "7d"'),
+    interval: int = Query(1, ge=1, description="Data point interval in minutes"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Get several metrics and aggregations per zone in one call.
+    
+    The raw series is read once and each aggregation runs as its own
+    `aggregateWindow` over it inside a single Flux `union`. Values come back
+    as columns aligned with a per-zone list of timestamps. `interval` in the
+    response is the one actually used after applying the point budget.
+    """
+    try:
+        metric_list = split(metrics)
+        agg_list = split(aggs)
+        if not metric_list or not agg_list:
+            raise HTTPException(status_code=400, detail="metrics and aggs must not be empty")
+        for m in metric_list:
+            if not METRIC_NAME.match(m):
+                raise HTTPException(status_code=400, detail=f"Invalid metric '{m}'")
+        window_fns = {agg: _window_fn(agg) for agg in agg_list}
+
+        zone_filter = ""
+        if zoneIds:
+            zone_list = split(zoneIds)
+            if zone_list:
+                zone_filter = f"  |> filter(fn: (r) => contains(value: r[\"zoneId\"], set: {json.dumps(zone_list)}))\n"
+        start, stop, interval = resolve_window(startTime, endTime, range_, interval)
+        branches = ",\n".join(
+            f"  data |> aggregateWindow(every: {interval}m, fn: {fn}, createEmpty: false)"
+            f" |> set(key: \"agg\", value: \"{agg}\")"
+            for agg, fn in window_fns.items()
+        )
+        query = (
+            f"data = from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {flux_time(start)}, stop: {flux_time(stop)})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => r[\"_field\"] == \"value\" and contains(value: r[\"metric\"], set: {json.dumps(metric_list)}))\n"
+            f"{zone_filter}"
+            "  |> keep(columns: [\"_start\", \"_stop\", \"_time\", \"_value\", \"metric\", \"zoneId\", \"zoneName\"])\n"
+            "\n"
+            f"union(tables: [\n{branches}\n])\n"
+        )
+
+        columns = [f"{m}.{a}" for m in metric_list for a in agg_list]
+        result = _zone_series(await run_query(query, SERIES_COLUMNS), columns)
+        return MultiSeriesResponse(metrics=metric_list, aggs=agg_list, interval=f"{interval}m", zones=result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
@@ -1,79 +1,121 @@
 """Venue and zone routes."""
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from app.config import settings
 from app.models.venue import VenueResponse, Zone
 from app.database.influx_client import influx_service
-from app.config import settings
+from app.database.query_cache import query_cache
+from app.database.query_scheduler import BACKGROUND, INTERACTIVE, QueryRejected
+from app.routes.dependencies import overloaded, venue_scope, versioned_cache_key
+from app.services.venue_registry import VenueScope
 
 router = APIRouter(prefix="/venue", tags=["venue"])
 
 
+def build_venue_response(venue: VenueScope, query_class: str = INTERACTIVE) -> VenueResponse:
+    """Query and assemble the venue summary and zones for one venue.
+
+    Runs in a worker thread; queries go through the scheduler. Raises
+    ``HTTPException(404)`` when the venue has no recent metrics.
+    """
+    venue_query = (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -2h)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"venue_metrics\")\n"
+        f"{venue.scope_filter}"
+        "  |> last()\n"
+    )
+    latest = {}
+    for r in influx_service.query_scheduled(venue_query, query_class=query_class):
+        latest[r.get("_field")] = r.get("_value")
+
+    if not latest:
+        raise HTTPException(status_code=404, detail="No venue data")
+
+    zone_query = (
+        f"from(bucket: \"{venue.bucket}\")\n"
+        "  |> range(start: -2h)\n"
+        "  |> filter(fn: (r) => r[\"_measurement\"] == \"zone_metrics\")\n"
+        f"{venue.scope_filter}"
+        "  |> group(columns: [\"zoneId\", \"_field\"])\n"
+        "  |> last()\n"
+    )
+    zones_index: dict[str, dict] = {}
+    for r in influx_service.query_scheduled(zone_query, query_class=query_class):
+        zid = r.get("zoneId")
+        if zid not in zones_index:
+            zones_index[zid] = {"id": zid, "name": r.get("zoneName")}
+        zones_index[zid][r.get("_field")] = r.get("_value")
+
+    zones: list[Zone] = []
+    for z in zones_index.values():
+        zones.append(Zone(
+            id=z["id"],
+            name=z.get("name", z["id"]),
+            totalAPs=int(z.get("totalAPs", 0)),
+            connectedAPs=int(z.get("connectedAPs", 0)),
+            disconnectedAPs=int(z.get("disconnectedAPs", 0)),
+            clients=int(z.get("clients", 0)),
+            apAvailability=float(z.get("apAvailability", 0.0)),
+            clientsPerAP=float(z.get("clientsPerAP", 0.0)),
+            experienceScore=float(z.get("experienceScore", 0.0)),
+            utilization=float(z.get("utilization", 0.0)),
+            rxDesense=float(z.get("rxDesense", 0.0)),
+            netflixScore=float(z.get("netflixScore", 0.0)),
+        ))
+
+    return VenueResponse(
+        id=venue.id,
+        name=venue.name,
+        totalZones=int(latest.get("totalZones", len(zones))),
+        totalAPs=int(latest.get("totalAPs", 0)),
+        totalClients=int(latest.get("totalClients", 0)),
+        avgExperienceScore=float(latest.get("avgExperienceScore", 0.0)),
+        slaCompliance=float(latest.get("slaCompliance", 0.0)),
+        zones=sorted(zones, key=lambda z: z.id)
+    )
+
+
+def _venue_cache_key(venue: VenueScope) -> str:
+    return versioned_cache_key(__name__, "venue", venue.id, venue.bucket, venue.scope_filter)
+
+
+async def cached_venue_response(venue: VenueScope) -> VenueResponse:
+    """``build_venue_response`` through the query cache.
+
+    Stale summaries (including ones persisted by a previous process) are
+    served while a background-priority rebuild refreshes them.
+    """
+    if not settings.venue_cache_ttl_seconds:
+        return await asyncio.to_thread(build_venue_response, venue)
+    return await query_cache.get(
+        _venue_cache_key(venue),
+        lambda: asyncio.to_thread(build_venue_response, venue),
+        settings.venue_cache_ttl_seconds,
+        refresh=lambda: asyncio.to_thread(build_venue_response, venue, BACKGROUND),
+    )
+
+
+async def refresh_venue(venue: VenueScope) -> None:
+    """Rebuild the cached venue summary at background priority (a refresh job)."""
+    await query_cache.refresh(
+        _venue_cache_key(venue),
+        lambda: asyncio.to_thread(build_venue_response, venue, BACKGROUND),
+        settings.venue_cache_ttl_seconds,
+    )
+
+
 @router.get("", response_model=VenueResponse)
-async def get_venue():
+async def get_venue(venue: VenueScope = Depends(venue_scope)):
     """
     Get overall venue metrics and all zones.
     """
     try:
-        venue_query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
-            "  |> range(start: -2h)\n"
-            "  |> filter(fn: (r) => r[\"_measurement\"] == \"venue_metrics\")\n"
-            "  |> last()\n"
-        )
-        venue_rows = influx_service.query_dicts(venue_query)
-
-        zone_query = (
-            f"from(bucket: \"{settings.influxdb_bucket}\")\n"
-            "  |> range(start: -2h)\n"
-            "  |> filter(fn: (r) => r[\"_measurement\"] == \"zone_metrics\")\n"
-            "  |> group(columns: [\"zoneId\"])\n"
-            "  |> last()\n"
-        )
-        zone_rows = influx_service.query_dicts(zone_query)
-
-        if not venue_rows:
-            raise HTTPException(status_code=404, detail="No venue data")
-
-        latest = {}
-        for r in venue_rows:
-            latest[r.get("_field")] = r.get("_value")
-
-        zones_index: dict[str, dict] = {}
-        for r in zone_rows:
-            zid = r.get("zoneId")
-            if zid not in zones_index:
-                zones_index[zid] = {"id": zid, "name": r.get("zoneName")}
-            zones_index[zid][r.get("_field")] = r.get("_value")
-
-        zones: list[Zone] = []
-        for z in zones_index.values():
-            zones.append(Zone(
-                id=z["id"],
-                name=z.get("name", z["id"]),
-                totalAPs=int(z.get("totalAPs", 0)),
-                connectedAPs=int(z.get("connectedAPs", 0)),
-                disconnectedAPs=int(z.get("disconnectedAPs", 0)),
-                clients=int(z.get("clients", 0)),
-                apAvailability=float(z.get("apAvailability", 0.0)),
-                clientsPerAP=float(z.get("clientsPerAP", 0.0)),
-                experienceScore=float(z.get("experienceScore", 0.0)),
-                utilization=float(z.get("utilization", 0.0)),
-                rxDesense=float(z.get("rxDesense", 0.0)),
-                netflixScore=float(z.get("netflixScore", 0.0)),
-            ))
-
-        return VenueResponse(
-            name="GA29532-P - Signal House",
-            totalZones=int(latest.get("totalZones", len(zones))),
-            totalAPs=int(latest.get("totalAPs", 0)),
-            totalClients=int(latest.get("totalClients", 0)),
-            avgExperienceScore=float(latest.get("avgExperienceScore", 0.0)),
-            slaCompliance=float(latest.get("slaCompliance", 0.0)),
-            zones=sorted(zones, key=lambda z: z.id)
-        )
+        return await cached_venue_response(venue)
 
+    except QueryRejected as e:
+        raise overloaded(e)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-
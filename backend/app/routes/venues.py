@@ -0,0 +1,80 @@
+"""Venue registry and cross-venue fleet routes."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from app.models.venue import VenueInfo, VenueResponse, VenueSummary, FleetResponse
+from app.database.query_scheduler import QueryRejected
+from app.routes.dependencies import overloaded, venue_scope
+from app.routes.venue import build_venue_response, cached_venue_response
+from app.services.venue_registry import VenueScope, venue_registry
+
+router = APIRouter(prefix="/venues", tags=["venues"])
+
+
+@router.get("", response_model=list[VenueInfo])
+async def list_venues():
+    """
+    List the venues served by this backend.
+    """
+    return [VenueInfo(id=v.id, name=v.name) for v in venue_registry.all()]
+
+
+@router.get("/fleet", response_model=FleetResponse)
+async def get_fleet(
+    venueIds: Optional[str] = Query(None, description="Comma-separated venue IDs (default: all venues)")
+):
+    """
+    Get a rollup across venues.
+
+    Venue summaries are queried concurrently (one query set per venue) and
+    merged. Venues that fail or have no data are listed in `unavailable`.
+    """
+    ids = None
+    if venueIds:
+        ids = [v.strip() for v in venueIds.split(",") if v.strip()]
+        unknown = [v for v in ids if v not in {s.id for s in venue_registry.all()}]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Unknown venue: {', '.join(unknown)}")
+
+    try:
+        results = await venue_registry.fan_out(build_venue_response, ids)
+        summaries: list[VenueSummary] = []
+        unavailable: list[str] = []
+        for scope, result in results:
+            if isinstance(result, BaseException):
+                unavailable.append(scope.id)
+                continue
+            summaries.append(VenueSummary(**result.model_dump(exclude={"zones"})))
+
+        total_zones = sum(v.totalZones for v in summaries)
+        weight = total_zones or 1
+        return FleetResponse(
+            totalVenues=len(summaries),
+            totalZones=total_zones,
+            totalAPs=sum(v.totalAPs for v in summaries),
+            totalClients=sum(v.totalClients for v in summaries),
+            avgExperienceScore=round(sum(v.avgExperienceScore * v.totalZones for v in summaries) / weight, 1),
+            slaCompliance=round(sum(v.slaCompliance * v.totalZones for v in summaries) / weight, 1),
+            venues=summaries,
+            unavailable=unavailable,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{venueId}", response_model=VenueResponse)
+async def get_venue_by_id(venue: VenueScope = Depends(venue_scope)):
+    """
+    Get venue metrics and all zones for one venue.
+    """
+    try:
+        return await cached_venue_response(venue)
+
+    except QueryRejected as e:
+        raise overloaded(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
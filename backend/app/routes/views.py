@@ -0,0 +1,28 @@
+"""Precomputed views kept fresh by the background refresh scheduler."""
+from functools import partial
+from app.config import settings
+from app.routes import cause_codes, hosts, os_distribution, venue
+from app.services.refresh_scheduler import RefreshScheduler
+from app.services.venue_registry import venue_registry
+
+# (job name, refresh interval setting, cache TTL setting, refresh coroutine per venue)
+VIEWS = (
+    ("venue", "venue_refresh_seconds", "venue_cache_ttl_seconds", venue.refresh_venue),
+    ("os-distribution", "os_distribution_refresh_seconds", "os_distribution_cache_ttl_seconds",
+     os_distribution.refresh_os_distribution),
+    ("hosts", "hosts_refresh_seconds", "hosts_cache_ttl_seconds", hosts.refresh_hosts),
+    ("cause-codes", "cause_codes_refresh_seconds", "cause_codes_cache_ttl_seconds", cause_codes.refresh_cause_codes),
+)
+
+
+def register_views(scheduler: RefreshScheduler) -> None:
+    """Register one refresh job per view and venue, named ``<view>:<venueId>``.
+
+    Views whose refresh interval or cache TTL is 0 are served per request.
+    """
+    for name, interval_setting, ttl_setting, refresh in VIEWS:
+        interval = getattr(settings, interval_setting)
+        if not interval or not getattr(settings, ttl_setting):
+            continue
+        for scope in venue_registry.all():
+            scheduler.register(f"{name}:{scope.id}", partial(refresh, scope), interval)
@@ -0,0 +1,54 @@
+"""Request time-window helpers shared by the time-series style routes."""
+import math
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from typing import Optional, Tuple
+from app.config import settings
+
+DURATION_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def split(value: str) -> list[str]:
+    """Split a comma-separated parameter, dropping blanks and duplicates."""
+    return list(dict.fromkeys(v.strip() for v in value.split(",") if v.strip()))
+
+
+def utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def flux_time(value: datetime) -> str:
+    """RFC 3339 literal for a UTC ``datetime`` in a Flux ``range()``."""
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def resolve_window(
+    startTime: Optional[datetime],
+    endTime: Optional[datetime],
+    range_: str,
+    interval: int,
+) -> Tuple[datetime, datetime, int]:
+    """Return ``(start, stop, interval minutes)`` for a request.
+
+    Without ``startTime`` the window is ``range_`` ending at ``endTime`` (or
+    now). The interval is widened when needed so that no series returns
+    more than ``time_series_max_points`` points.
+    """
+    stop = utc(endTime) if endTime else datetime.now(timezone.utc)
+    if startTime:
+        start = utc(startTime)
+    else:
+        start = stop - timedelta(seconds=int(range_[:-1]) * DURATION_SECONDS[range_[-1]])
+    if start >= stop:
+        raise HTTPException(status_code=400, detail="startTime must be before endTime")
+    if stop - start > timedelta(days=settings.time_series_max_range_days):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Time range exceeds {settings.time_series_max_range_days} days",
+        )
+    span_minutes = (stop - start).total_seconds() / 60
+    budget_interval = math.ceil(span_minutes / settings.time_series_max_points)
+    return start, stop, max(interval, budget_interval)
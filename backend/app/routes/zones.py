@@ -0,0 +1,86 @@
+"""Zone comparison routes."""
+import asyncio
+import time
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import Optional
+from app.config import settings
+from app.models.zone_ranking import ZoneRankingsResponse, ZoneRanking
+from app.routes.dependencies import run_query, venue_scope
+from app.services.venue_registry import VenueScope
+from app.services.zone_rankings import HOUR, ZoneDigestStore, collect_samples
+
+router = APIRouter(prefix="/zones", tags=["zones"])
+
+ZONE_METRICS = (
+    "experienceScore", "utilization", "rxDesense", "netflixScore", "apAvailability",
+    "clientsPerAP", "clients", "connectedAPs", "disconnectedAPs", "totalAPs",
+)
+# Metrics where a lower value ranks better by default
+LOWER_IS_BETTER = ("utilization", "rxDesense", "disconnectedAPs")
+DURATION_HOURS = {"h": 1, "d": 24, "w": 168}
+
+digests = ZoneDigestStore(
+    compression=settings.zone_digest_compression,
+    retention_hours=2 * settings.zone_rankings_max_window_days * 24,
+)
+
+
+@router.get("/rankings", response_model=ZoneRankingsResponse)
+async def get_zone_rankings(
+    metric: str = Query("experienceScore", description=f'Zone metric: {", ".join(ZONE_METRICS)}'),
+    window: str = Query("7d", pattern=r"^\d+[hdw]$", description='Window, e.g. "24h", "7d", "4w"'),
+    order: Optional[str] = Query(None, description='"desc" (highest first) or "asc"; defaults to the better end of the metric'),
+    segments: int = Query(7, ge=1, le=48, description="Number of trend points across the window"),
+    venue: VenueScope = Depends(venue_scope)
+):
+    """
+    Rank zones by the median of a metric over a window.
+
+    Returns p5/p50/p95 per zone, a median trend over `segments` equal parts of
+    the window, and the change in median and rank against the preceding window
+    of the same length. Percentiles come from hourly per-zone t-digests kept in
+    memory, so only hours not yet digested are read from Influx (one query).
+    """
+    if metric not in ZONE_METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {', '.join(ZONE_METRICS)}")
+    if order not in (None, "asc", "desc"):
+        raise HTTPException(status_code=400, detail='order must be "asc" or "desc"')
+    window_hours = int(window[:-1]) * DURATION_HOURS[window[-1]]
+    if not 1 <= window_hours <= settings.zone_rankings_max_window_days * 24:
+        raise HTTPException(
+            status_code=400,
+            detail=f"window must be between 1h and {settings.zone_rankings_max_window_days}d",
+        )
+    order = order or ("asc" if metric in LOWER_IS_BETTER else "desc")
+    try:
+        now = time.time()
+        window_start = int(now // HOUR) * HOUR - (window_hours - 1) * HOUR
+        settled_hour = digests.settled_hour(now)
+        fetch_start = digests.fetch_start(venue.id, metric, window_start - window_hours * HOUR, settled_hour)
+        start = datetime.fromtimestamp(fetch_start, timezone.utc).isoformat().replace("+00:00", "Z")
+        query = (
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {start})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"zone_metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => r[\"_field\"] == \"{metric}\")\n"
+            "  |> keep(columns: [\"_time\", \"_value\", \"zoneId\", \"zoneName\"])\n"
+        )
+        samples = await run_query(query, collect_samples)
+        tail = await asyncio.to_thread(digests.ingest, venue.id, metric, samples, fetch_start, settled_hour)
+        zones = await asyncio.to_thread(
+            digests.rank, venue.id, metric, tail, window_start, window_hours, segments, order == "desc"
+        )
+        return ZoneRankingsResponse(
+            metric=metric,
+            window=window,
+            order=order,
+            segments=segments,
+            zones=[ZoneRanking(**z) for z in zones],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,273 @@
+"""Streaming anomaly detection over zone and AP metrics.
+
+Each monitored series (venue, zone or AP, plus metric) keeps an exponentially
+weighted mean and variance in flat ``array('d')`` slots, so an update is
+O(1) and a series costs a few dozen bytes regardless of history length.
+"""
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from influxdb_client import Point
+from app.config import settings
+from app.database.influx_client import influx_service
+from app.database.query_scheduler import BACKGROUND
+from app.services.venue_registry import VenueScope, venue_registry
+
+HIGH = 1
+LOW = -1
+
+
+@dataclass(frozen=True)
+class MetricRule:
+    """How deviations of one measurement field are reported."""
+    type: str
+    metric: str
+    direction: int  # HIGH: alert on spikes, LOW: alert on drops
+    label: str
+
+
+MONITORED: Dict[Tuple[str, str], MetricRule] = {
+    ("zone_metrics", "clientsPerAP"): MetricRule("high_client_density", "clients_per_ap", HIGH, "clients per AP"),
+    ("zone_metrics", "rxDesense"): MetricRule("interference", "rx_desense", HIGH, "RxDesense"),
+    ("zone_metrics", "experienceScore"): MetricRule("poor_experience", "experience_score", LOW, "experience score"),
+    ("zone_metrics", "utilization"): MetricRule("high_utilization", "utilization", HIGH, "utilization"),
+    ("ap_metrics", "clientCount"): MetricRule("high_client_density", "client_count", HIGH, "AP client count"),
+    ("ap_metrics", "channelUtilization"): MetricRule("high_utilization", "channel_utilization", HIGH, "channel utilization"),
+    ("ap_metrics", "cpuUtilization"): MetricRule("ap_resource", "cpu_utilization", HIGH, "AP CPU"),
+    ("ap_metrics", "memoryUtilization"): MetricRule("ap_resource", "memory_utilization", HIGH, "AP memory"),
+}
+
+
+@dataclass
+class Detection:
+    """A single detected anomaly."""
+    timestamp: datetime
+    rule: MetricRule
+    severity: str
+    value: float
+    zscore: float
+    baseline: float
+    zoneId: str
+    zoneName: str
+    apMac: Optional[str]
+    venueId: Optional[str]
+
+    @property
+    def anomaly_id(self) -> str:
+        subject = self.apMac or self.zoneId
+        return f"auto-{self.rule.metric}-{subject}-{int(self.timestamp.timestamp())}"
+
+    def to_point(self) -> Point:
+        where = f"AP {self.apMac}" if self.apMac else self.zoneName
+        point = (
+            Point("anomalies")
+            .tag("anomalyId", self.anomaly_id)
+            .tag("type", self.rule.type)
+            .tag("severity", self.severity)
+            .tag("zoneId", self.zoneId)
+            .tag("affectedZone", self.zoneName)
+            .field(
+                "description",
+                f"Unusual {self.rule.label} in {where}: {self.value:.1f} "
+                f"(baseline {self.baseline:.1f}, z={self.zscore:+.1f})",
+            )
+            .field("metric", self.rule.metric)
+            .field("value", float(f"{self.value:.2f}"))
+            .time(self.timestamp)
+        )
+        if self.venueId:
+            point = point.tag("venueId", self.venueId)
+        return point
+
+
+class AnomalyDetector:
+    """EWMA / z-score detector over many independent series.
+
+    ``observe`` is O(1) per sample. A series is only eligible to alert after
+    ``warmup`` samples, and re-alerts no sooner than ``cooldown`` seconds
+    after its previous alert. New series beyond ``max_series`` are ignored.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        threshold: float = 3.0,
+        warmup: int = 10,
+        cooldown: float = 900.0,
+        max_series: int = 100_000,
+    ):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.cooldown = cooldown
+        self.max_series = max_series
+        self._index: Dict[Tuple[str, ...], int] = {}
+        self._mean = array("d")
+        self._var = array("d")
+        self._count = array("l")
+        self._last_alert = array("d")
+        self._lock = threading.Lock()
+        self.dropped_series = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _slot(self, key: Tuple[str, ...]) -> Optional[int]:
+        slot = self._index.get(key)
+        if slot is None:
+            if len(self._index) >= self.max_series:
+                self.dropped_series += 1
+                return None
+            slot = len(self._mean)
+            self._index[key] = slot
+            self._mean.append(0.0)
+            self._var.append(0.0)
+            self._count.append(0)
+            self._last_alert.append(-math.inf)
+        return slot
+
+    def _severity(self, z: float) -> str:
+        magnitude = abs(z)
+        if magnitude >= self.threshold + 2:
+            return "critical"
+        if magnitude >= self.threshold + 1:
+            return "major"
+        return "warning"
+
+    def observe(
+        self, key: Tuple[str, ...], value: float, ts: float, direction: int = HIGH
+    ) -> Optional[Tuple[float, float]]:
+        """Feed one sample; return ``(zscore, baseline)`` if it is anomalous."""
+        with self._lock:
+            slot = self._slot(key)
+            if slot is None:
+                return None
+            n = self._count[slot]
+            if n == 0:
+                self._mean[slot] = value
+                self._count[slot] = 1
+                return None
+
+            mean = self._mean[slot]
+            var = self._var[slot]
+            delta = value - mean
+            std = math.sqrt(var)
+            z = delta / std if std > 1e-9 else 0.0
+
+            # update after scoring so an outlier does not mask itself
+            incr = self.alpha * delta
+            self._mean[slot] = mean + incr
+            self._var[slot] = (1 - self.alpha) * (var + delta * incr)
+            self._count[slot] = n + 1
+
+            if n < self.warmup or z * direction < self.threshold:
+                return None
+            if ts - self._last_alert[slot] < self.cooldown:
+                return None
+            self._last_alert[slot] = ts
+            return z, mean
+
+    def observe_rows(self, rows: Iterable[Dict[str, Any]], venue_id: str = "") -> List[Detection]:
+        """Feed Influx-style rows (``_measurement``/``_field``/``_value`` + tags).
+
+        Series are keyed by ``venue_id`` as well, since zone ids repeat
+        across venues.
+        """
+        detections: List[Detection] = []
+        for r in rows:
+            rule = MONITORED.get((r.get("_measurement"), r.get("_field")))
+            value = r.get("_value")
+            if rule is None or value is None:
+                continue
+            ts = r.get("_time") or datetime.now(timezone.utc)
+            zone_id = str(r.get("zoneId") or "")
+            ap_mac = r.get("apMac") if r.get("_measurement") == "ap_metrics" else None
+            key = (venue_id, zone_id, ap_mac or "", rule.metric)
+            hit = self.observe(key, float(value), ts.timestamp(), rule.direction)
+            if hit is None:
+                continue
+            z, baseline = hit
+            detections.append(Detection(
+                timestamp=ts,
+                rule=rule,
+                severity=self._severity(z),
+                value=float(value),
+                zscore=z,
+                baseline=baseline,
+                zoneId=zone_id,
+                zoneName=str(r.get("zoneName") or zone_id),
+                apMac=ap_mac,
+                venueId=r.get("venueId"),
+            ))
+        return detections
+
+
+class AnomalyDetectionService:
+    """Polls new zone/AP metrics, runs the detector and writes anomalies."""
+
+    def __init__(self, detector: AnomalyDetector):
+        self.detector = detector
+        self._since: Dict[str, datetime] = {}
+        self.detected = 0
+
+    def _query(self, venue: VenueScope, start: str) -> str:
+        fields = " or ".join(f'r["_field"] == "{f}"' for f in sorted({f for _, f in MONITORED}))
+        return (
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {start})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"zone_metrics\" or r[\"_measurement\"] == \"ap_metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => {fields})\n"
+        )
+
+    def write(self, venue: VenueScope, detections: List[Detection]) -> None:
+        if not detections:
+            return
+        influx_service.write(venue.bucket, [d.to_point() for d in detections])
+        self.detected += len(detections)
+
+    def process(self, venue: VenueScope, rows: Iterable[Dict[str, Any]]) -> List[Detection]:
+        """Run detection over already-available rows and persist the results."""
+        detections = self.detector.observe_rows(rows, venue.id)
+        self.write(venue, detections)
+        return detections
+
+    def poll_venue(self, venue: VenueScope) -> int:
+        """Process metrics written since the previous poll of ``venue``."""
+        since = self._since.get(venue.id)
+        start = since.isoformat() if since else f"-{settings.anomaly_poll_interval_seconds}s"
+        latest = [since]
+
+        def fresh_rows():
+            # range() is inclusive, so skip samples already seen last poll
+            for r in influx_service.query_scheduled(self._query(venue, start), query_class=BACKGROUND):
+                ts = r.get("_time")
+                if ts is None or (since is not None and ts <= since):
+                    continue
+                if latest[0] is None or ts > latest[0]:
+                    latest[0] = ts
+                yield r
+
+        detections = self.process(venue, fresh_rows())
+        if latest[0] is not None:
+            self._since[venue.id] = latest[0]
+        return len(detections)
+
+    async def poll(self) -> None:
+        """Poll every venue once; scheduled by the background refresh scheduler."""
+        for _, result in await venue_registry.fan_out(self.poll_venue):
+            if isinstance(result, Exception):
+                print(f"Warning: anomaly detection poll failed: {result}")
+
+
+# Global instance
+anomaly_service = AnomalyDetectionService(AnomalyDetector(
+    alpha=settings.anomaly_ewma_alpha,
+    threshold=settings.anomaly_z_threshold,
+    warmup=settings.anomaly_warmup_samples,
+    cooldown=settings.anomaly_cooldown_seconds,
+    max_series=settings.anomaly_max_series,
+))
@@ -0,0 +1,238 @@
+"""Recent per-AP metric history kept in fixed-size in-memory ring buffers."""
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import settings
+from app.database.influx_client import influx_service
+from app.database.query_scheduler import BACKGROUND
+from app.services.venue_registry import VenueScope, venue_registry
+
+AP_HISTORY_METRICS = (
+    "cpuUtilization", "memoryUtilization", "channelUtilization", "airtimeUtilization", "clientCount",
+)
+
+
+def _flux_time(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class APRing:
+    """The last ``capacity`` samples of one AP.
+
+    Timestamps (epoch seconds) and one ``float32`` row per metric live in
+    preallocated arrays written round-robin, so appending never allocates
+    and memory per AP is fixed at ``capacity * (8 + 4 * metrics)`` bytes.
+    """
+    __slots__ = ("times", "values", "head", "size", "covered_from")
+
+    def __init__(self, capacity: int, n_metrics: int, covered_from: float):
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.full((n_metrics, capacity), np.nan, dtype=np.float32)
+        self.head = 0
+        self.size = 0
+        # the ring holds every sample of the AP since this time
+        self.covered_from = covered_from
+
+    @property
+    def capacity(self) -> int:
+        return len(self.times)
+
+    @property
+    def last_time(self) -> float:
+        return float(self.times[self.head - 1]) if self.size else -np.inf
+
+    @property
+    def first_time(self) -> float:
+        return float(self.times[(self.head - self.size) % self.capacity]) if self.size else np.inf
+
+    def append(self, times: np.ndarray, values: np.ndarray) -> int:
+        """Append time-sorted samples newer than the last one; returns how many were kept."""
+        newer = times > self.last_time
+        times, values = times[newer][-self.capacity:], values[:, newer][:, -self.capacity:]
+        n = len(times)
+        if n:
+            slots = (self.head + np.arange(n)) % self.capacity
+            self.times[slots] = times
+            self.values[:, slots] = values
+            self.head = (self.head + n) % self.capacity
+            self.size = min(self.size + n, self.capacity)
+        return n
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the stored samples, oldest first."""
+        slots = (self.head - self.size + np.arange(self.size)) % self.capacity
+        return self.times[slots], self.values[:, slots].astype(np.float64)
+
+
+class APHistoryStore:
+    """Per-venue ring buffers of ``AP_HISTORY_METRICS``, one per AP.
+
+    A background task reads the ``ap_metrics`` written since its previous
+    poll (the first poll backfills ``backfill_seconds``) and streams them
+    into each AP's ring, one AP at a time. A window is answered from memory
+    when it starts after the oldest sample the ring holds and after the
+    ring was created; otherwise the route queries Influx.
+
+    At most ``max_aps`` APs per venue are tracked. APs found beyond that
+    are left to Influx, and each such poll evicts as many rings of APs that
+    reported nothing in it, so live APs take their place on the next poll.
+    APs without samples for ``backfill_seconds`` are dropped.
+    """
+
+    def __init__(self, capacity: int, backfill_seconds: float, max_aps: int):
+        self.capacity = capacity
+        self.backfill_seconds = backfill_seconds
+        self.max_aps = max_aps
+        self._rings: Dict[str, Dict[str, APRing]] = {}
+        self._since: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.untracked: Dict[str, int] = {}
+        self.evicted = 0
+
+    def _query(self, venue: VenueScope, start: float) -> str:
+        fields = " or ".join(f'r["_field"] == "{m}"' for m in AP_HISTORY_METRICS)
+        columns = ", ".join(f'"{c}"' for c in ("_time", "apMac") + AP_HISTORY_METRICS)
+        return (
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {_flux_time(start)})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"ap_metrics\")\n"
+            f"{venue.scope_filter}"
+            f"  |> filter(fn: (r) => {fields})\n"
+            # one table per AP in time order, even when its status, ip or name
+            # tags changed within the range (each change starts a new series)
+            "  |> group(columns: [\"apMac\"])\n"
+            "  |> sort(columns: [\"_time\"])\n"
+            "  |> pivot(rowKey: [\"_time\"], columnKey: [\"_field\"], valueColumn: \"_value\")\n"
+            f"  |> keep(columns: [{columns}])\n"
+        )
+
+    def ingest(
+        self,
+        venue_id: str,
+        mac: str,
+        times: Sequence[float],
+        values: Sequence[Sequence[Optional[float]]],
+        covered_from: float,
+    ) -> Optional[int]:
+        """Append samples of one AP (one value row per sample, ``None`` when missing).
+
+        Returns how many were new, or None when the venue is at ``max_aps``
+        and the AP is not tracked. A new ring covers the AP from ``covered_from``.
+        """
+        t = np.asarray(times, dtype=np.float64)
+        v = np.asarray(values, dtype=np.float64).reshape(len(t), len(AP_HISTORY_METRICS)).T
+        order = np.argsort(t, kind="stable")
+        with self._lock:
+            rings = self._rings.setdefault(venue_id, {})
+            ring = rings.get(mac)
+            if ring is None:
+                if len(rings) >= self.max_aps:
+                    return None
+                ring = rings[mac] = APRing(self.capacity, len(AP_HISTORY_METRICS), covered_from)
+            added = ring.append(t[order], v[:, order])
+            self.samples += added
+        return added
+
+    def _consume(self, venue_id: str, covered_from: float, rows: Iterable[Dict[str, Any]]) -> Tuple[int, int, Optional[float]]:
+        """Stream pivoted ``ap_metrics`` rows into the rings.
+
+        The query returns one table per AP, so only the current AP's samples
+        are held. Returns ``(samples added, untracked APs,
+        latest sample time)``.
+        """
+        added = untracked = 0
+        latest: Optional[float] = None
+        mac: Optional[str] = None
+        times: List[float] = []
+        values: List[Tuple[Any, ...]] = []
+
+        def flush() -> None:
+            nonlocal added, untracked
+            if times:
+                result = self.ingest(venue_id, mac, times, values, covered_from)
+                if result is None:
+                    untracked += 1
+                else:
+                    added += result
+
+        for r in rows:
+            row_mac, ts = r.get("apMac"), r.get("_time")
+            if not row_mac or ts is None:
+                continue
+            if row_mac != mac:
+                flush()
+                mac, times, values = str(row_mac), [], []
+            t = ts.timestamp()
+            times.append(t)
+            values.append(tuple(r.get(m) for m in AP_HISTORY_METRICS))
+            latest = t if latest is None else max(latest, t)
+        flush()
+        return added, untracked, latest
+
+    def poll_venue(self, venue: VenueScope, now: Optional[float] = None) -> int:
+        """Append the samples of ``venue`` written since the previous poll."""
+        now = time.time() if now is None else now
+        with self._lock:
+            since = self._since.get(venue.id)
+        # range() is inclusive; rings skip samples they already hold
+        start = since if since is not None else now - self.backfill_seconds
+        added, untracked, latest = influx_service.query_scheduled(
+            self._query(venue, start), partial(self._consume, venue.id, start), query_class=BACKGROUND
+        )
+        with self._lock:
+            self._since[venue.id] = latest if latest is not None else start
+            self.untracked[venue.id] = untracked
+            rings = self._rings.get(venue.id, {})
+            for mac in [m for m, ring in rings.items() if ring.last_time < now - self.backfill_seconds]:
+                del rings[mac]
+            if untracked:
+                # make room for APs that reported over the ones that did not
+                idle = sorted((ring.last_time, m) for m, ring in rings.items() if ring.last_time < start)
+                for _, mac in idle[:untracked]:
+                    del rings[mac]
+                self.evicted += min(untracked, len(idle))
+        return added
+
+    def history(
+        self,
+        venue_id: str,
+        mac: str,
+        start: float,
+        stop: float,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Samples of ``mac`` in ``[start, stop)`` (times, one row per metric), or None when not in memory.
+
+        Memory covers a window that starts no earlier than the ring's
+        creation (the backfill start for rings created by the first poll)
+        or, for a ring that has wrapped, its oldest sample.
+        """
+        with self._lock:
+            ring = self._rings.get(venue_id, {}).get(mac)
+            if ring is None:
+                return None
+            covered_from = ring.covered_from
+            if ring.size == ring.capacity:
+                covered_from = max(covered_from, ring.first_time)
+            if start < covered_from:
+                return None
+            times, values = ring.ordered()
+        selected = (times >= start) & (times < stop)
+        return times[selected], values[:, selected]
+
+    async def poll(self) -> None:
+        """Poll every venue once; scheduled by the background refresh scheduler."""
+        for _, result in await venue_registry.fan_out(self.poll_venue):
+            if isinstance(result, Exception):
+                print(f"Warning: AP history poll failed: {result}")
+
+
+# Global instance
+ap_history = APHistoryStore(
+    capacity=settings.ap_history_capacity,
+    backfill_seconds=settings.ap_history_backfill_hours * 3600,
+    max_aps=settings.ap_history_max_aps,
+)
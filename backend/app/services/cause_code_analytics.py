@@ -0,0 +1,144 @@
+"""Vectorized cause-code trend and impact analytics."""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+import numpy as np
+from app.services.transforms import ColumnReader, Columns, codes_in, factorize, group_keys, pivot
+
+# API grouping dimension -> tag column on disconnect_codes (the series tags)
+GROUP_COLUMNS: Dict[str, str] = {
+    "zone": "zoneId",
+    "code": "code",
+}
+SERIES_TAGS = ("code", "zoneId")
+FIELDS = ("count", "impactScore")
+
+# run_query consumer for the windowed count/impactScore rows
+CAUSE_CODE_COLUMNS = ColumnReader(tags=("_field",) + SERIES_TAGS)
+
+
+@dataclass
+class CauseCodeColumns:
+    """Windowed cause-code rows held as parallel column arrays."""
+    time: np.ndarray            # float64 epoch seconds (window start)
+    count: np.ndarray           # float64 disconnects in the window
+    impact: np.ndarray          # float64 mean impact score in the window
+    tags: Dict[str, np.ndarray]  # string arrays, one per grouping dimension
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @classmethod
+    def from_columns(cls, cols: Columns, dimensions: Sequence[str]) -> "CauseCodeColumns":
+        """Pivot windowed ``count``/``impactScore`` rows into one row per series and window.
+
+        A field missing from a window counts as 0; missing tags become ``"unknown"``.
+        """
+        field = codes_in(cols.tags["_field"], FIELDS)
+        cols, field = cols.take(field >= 0), field[field >= 0]
+        series = [factorize(cols.tags[tag]) for tag in SERIES_TAGS]
+        times, time = factorize(cols.time)
+        group, n_rows, key_codes = group_keys(
+            *((codes, len(values)) for values, codes in series), (time, len(times))
+        )
+        grid = np.nan_to_num(pivot(group, n_rows, field, len(FIELDS), cols.value))
+        tags: Dict[str, np.ndarray] = {}
+        for d in dimensions:
+            i = SERIES_TAGS.index(GROUP_COLUMNS[d])
+            values = series[i][0][key_codes[i]]
+            tags[d] = np.where(values == "", "unknown", values)
+        return cls(
+            time=times[key_codes[-1]].astype(np.int64) / 1e9,
+            count=grid[:, 0],
+            impact=grid[:, 1],
+            tags=tags,
+        )
+
+
+@dataclass
+class CauseCodeRanking:
+    """Per-group analytics, one array entry per group."""
+    groups: List[Dict[str, str]]
+    buckets: np.ndarray   # float64 epoch seconds, ascending
+    series: np.ndarray    # (groups, buckets) disconnect counts
+    total: np.ndarray
+    share: np.ndarray     # fraction of all disconnects (0-1)
+    impact: np.ndarray    # count-weighted mean impact score
+    weighted: np.ndarray  # total * impact / 100
+    trend: np.ndarray     # least-squares slope, disconnects per bucket
+
+
+def _group_index(cols: CauseCodeColumns, dimensions: Sequence[str]):
+    """Return (group index per row, group label dicts) for ``dimensions``."""
+    n = len(cols)
+    if not dimensions:
+        return np.zeros(n, dtype=np.int64), [{}]
+    combined = np.zeros(n, dtype=np.int64)
+    uniques = []
+    for d in dimensions:
+        values, inverse = np.unique(cols.tags[d], return_inverse=True)
+        uniques.append(values)
+        combined = combined * len(values) + inverse
+    keys, group = np.unique(combined, return_inverse=True)
+
+    labels: List[Dict[str, str]] = []
+    for key in keys.tolist():
+        label = {}
+        for d, values in zip(reversed(dimensions), reversed(uniques)):
+            key, idx = divmod(key, len(values))
+            label[d] = str(values[idx])
+        labels.append({d: label[d] for d in dimensions})
+    return group, labels
+
+
+def rank(cols: CauseCodeColumns, dimensions: Sequence[str]) -> CauseCodeRanking:
+    """Compute trend, share-of-total and impact-weighted scores per group."""
+    group, labels = _group_index(cols, dimensions)
+    buckets, bucket = np.unique(cols.time, return_inverse=True)
+    n_groups, n_buckets = len(labels), len(buckets)
+
+    series = np.bincount(
+        group * n_buckets + bucket, weights=cols.count, minlength=n_groups * n_buckets
+    ).reshape(n_groups, n_buckets)
+    total = series.sum(axis=1)
+    grand_total = total.sum()
+    share = total / grand_total if grand_total else np.zeros(n_groups)
+
+    impact_sum = np.bincount(group, weights=cols.count * cols.impact, minlength=n_groups)
+    impact = np.divide(impact_sum, total, out=np.zeros(n_groups), where=total > 0)
+    weighted = total * impact / 100.0
+
+    x = np.arange(n_buckets, dtype=np.float64)
+    x_centered = x - x.mean() if n_buckets else x
+    denom = float((x_centered ** 2).sum())
+    if denom:
+        trend = ((series - series.mean(axis=1, keepdims=True)) * x_centered).sum(axis=1) / denom
+    else:
+        trend = np.zeros(n_groups)
+
+    return CauseCodeRanking(
+        groups=labels,
+        buckets=buckets,
+        series=series,
+        total=total,
+        share=share,
+        impact=impact,
+        weighted=weighted,
+        trend=trend,
+    )
+
+
+SORT_KEYS = ("impact", "count", "share", "trend")
+
+
+def order(ranking: CauseCodeRanking, sort: str, limit: int) -> np.ndarray:
+    """Indices of the top ``limit`` groups by ``sort`` (descending)."""
+    key = {
+        "impact": ranking.weighted,
+        "count": ranking.total,
+        "share": ranking.share,
+        "trend": ranking.trend,
+    }[sort]
+    if limit < len(key):
+        top = np.argpartition(-key, limit - 1)[:limit]
+        return top[np.argsort(-key[top], kind="stable")]
+    return np.argsort(-key, kind="stable")
@@ -0,0 +1,142 @@
+"""In-process scheduler for periodic background refresh jobs."""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config import settings
+
+JobFn = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class JobStats:
+    """Counters for one job, exposed by the health endpoint."""
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    last_started: Optional[float] = None
+    last_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+@dataclass
+class RefreshJob:
+    """A registered job and its schedule."""
+    name: str
+    fn: JobFn
+    interval: float
+    timeout: float
+    jitter: float
+    stats: JobStats = field(default_factory=JobStats)
+    running: bool = False
+    task: Optional[asyncio.Task] = None
+
+
+class RefreshScheduler:
+    """Runs registered coroutine jobs every ``interval`` seconds on the event loop.
+
+    * Each wait is ``interval`` scaled by a random factor in ``1 ± jitter``,
+      and the first run is delayed by up to ``jitter * interval``, so jobs
+      (and workers) started together do not query InfluxDB in lockstep.
+    * Intervals are measured from the start of a run. A job never overlaps
+      itself: a run that outlasts its interval is followed immediately by
+      the next one, and ``run_now`` is skipped while the job is running.
+    * A run still going after ``timeout`` seconds (0: never) is cancelled.
+      Work it already handed to a worker thread finishes there and its
+      result is dropped.
+
+    Failures are logged and counted; the job keeps its schedule. All methods
+    must be called on the event loop.
+    """
+
+    def __init__(self, jitter: float, timeout: float):
+        self.jitter = jitter
+        self.timeout = timeout
+        self.jobs: Dict[str, RefreshJob] = {}
+        self._started = False
+
+    def register(
+        self,
+        name: str,
+        fn: JobFn,
+        interval: float,
+        timeout: Optional[float] = None,
+        jitter: Optional[float] = None,
+    ) -> None:
+        """Run ``fn()`` every ``interval`` seconds once the scheduler is started.
+
+        ``timeout`` and ``jitter`` default to the scheduler's. Jobs registered
+        after ``start`` are scheduled right away.
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        if interval <= 0:
+            raise ValueError(f"Job {name!r} needs a positive interval")
+        job = self.jobs[name] = RefreshJob(
+            name=name,
+            fn=fn,
+            interval=interval,
+            timeout=self.timeout if timeout is None else timeout,
+            jitter=min(max(self.jitter if jitter is None else jitter, 0.0), 1.0),
+        )
+        if self._started:
+            job.task = asyncio.ensure_future(self._loop(job))
+
+    def start(self) -> None:
+        """Schedule every registered job."""
+        self._started = True
+        for job in self.jobs.values():
+            if job.task is None:
+                job.task = asyncio.ensure_future(self._loop(job))
+
+    def stop(self) -> None:
+        """Cancel all jobs, including runs in progress."""
+        self._started = False
+        for job in self.jobs.values():
+            if job.task is not None:
+                job.task.cancel()
+                job.task = None
+
+    async def _loop(self, job: RefreshJob) -> None:
+        await asyncio.sleep(random.uniform(0, job.jitter * job.interval))
+        while True:
+            started = time.monotonic()
+            await self.run_now(job.name)
+            delay = job.interval * random.uniform(1 - job.jitter, 1 + job.jitter)
+            await asyncio.sleep(max(0.0, started + delay - time.monotonic()))
+
+    async def run_now(self, name: str) -> bool:
+        """Run job ``name`` once; returns False when it was already running."""
+        job = self.jobs[name]
+        stats = job.stats
+        if job.running:
+            stats.skipped += 1
+            return False
+        job.running = True
+        stats.runs += 1
+        stats.last_started = time.time()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(job.fn(), job.timeout or None)
+            stats.last_error = None
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            stats.last_error = f"timed out after {job.timeout:g}s"
+            print(f"Warning: background job {name} timed out after {job.timeout:g}s")
+        except Exception as e:
+            stats.failures += 1
+            stats.last_error = str(e)
+            print(f"Warning: background job {name} failed: {e}")
+        finally:
+            job.running = False
+            stats.last_seconds = time.perf_counter() - started
+        return True
+
+
+# Global instance
+refresh_scheduler = RefreshScheduler(
+    jitter=settings.refresh_jitter,
+    timeout=settings.refresh_timeout_seconds,
+)
@@ -0,0 +1,196 @@
+"""Vectorized RF channel-plan analytics over the latest radio state."""
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Channel utilization histogram: ten 10%-wide bins, the last one includes 100
+HISTOGRAM_EDGES = list(range(0, 101, 10))
+
+
+def _codes(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (unique labels, integer code per row)."""
+    return np.unique(values, return_inverse=True)
+
+
+def _group_median(group: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Median of ``values`` per group id in ``[0, n_groups)`` (NaN for empty groups)."""
+    out = np.full(n_groups, np.nan)
+    if not len(values):
+        return out
+    order = np.lexsort((values, group))
+    g, v = group[order], values[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    ends = np.r_[starts[1:], len(g)]
+    lo = v[starts + (ends - starts - 1) // 2]
+    hi = v[starts + (ends - starts) // 2]
+    out[g[starts]] = (lo + hi) / 2.0
+    return out
+
+
+@dataclass
+class ZoneRF:
+    """RF analysis for one zone (plain values, ready for the response model)."""
+    zoneId: str
+    radios: int
+    coChannel: List[Dict[str, Any]]
+    utilizationHistogram: List[int]
+    noiseOutliers: List[Dict[str, Any]]
+
+
+class RadioSnapshot:
+    """Latest radio and AP state of one venue as column arrays.
+
+    ``radio_rows`` carry ``zoneId``/``apMac``/``band`` with pivoted
+    ``channel``/``noiseFloor`` columns; ``ap_rows`` carry the latest
+    ``channelUtilization`` per AP as ``_value``. Built once, then analysed
+    and looked up without further queries. ``index`` maps
+    ``(zoneId, band, channel)`` to the AP MACs whose radio is on that channel.
+    """
+
+    def __init__(self, radio_rows: Iterable[Dict[str, Any]], ap_rows: Iterable[Dict[str, Any]]):
+        self.built_at = time.monotonic()
+
+        zone: List[str] = []
+        ap: List[str] = []
+        band: List[str] = []
+        channel: List[int] = []
+        noise: List[float] = []
+        for r in radio_rows:
+            zone.append(str(r.get("zoneId") or ""))
+            ap.append(str(r.get("apMac") or ""))
+            band.append(str(r.get("band") or ""))
+            channel.append(int(r.get("channel") or 0))
+            noise.append(float(r["noiseFloor"]) if r.get("noiseFloor") is not None else np.nan)
+        self.zone = np.asarray(zone, dtype=object)
+        self.ap = np.asarray(ap, dtype=object)
+        self.band = np.asarray(band, dtype=object)
+        self.channel = np.asarray(channel, dtype=np.int64)
+        self.noise = np.asarray(noise, dtype=np.float64)
+
+        ap_zone: List[str] = []
+        utilization: List[float] = []
+        for r in ap_rows:
+            if r.get("_value") is None:
+                continue
+            ap_zone.append(str(r.get("zoneId") or ""))
+            utilization.append(float(r["_value"]))
+        self.ap_zone = np.asarray(ap_zone, dtype=object)
+        self.utilization = np.asarray(utilization, dtype=np.float64)
+
+        self.zones, self.zone_idx = _codes(np.concatenate([self.zone, self.ap_zone]))
+        self.ap_zone_idx = self.zone_idx[len(self.zone):]
+        self.zone_idx = self.zone_idx[:len(self.zone)]
+        self.bands, self.band_idx = _codes(self.band)
+
+        # (zone, band, channel) -> radio group; channel is already a small integer
+        channels, channel_idx = _codes(self.channel)
+        key = (self.zone_idx * len(self.bands) + self.band_idx) * max(len(channels), 1) + channel_idx
+        self.cell_keys, self.cell = np.unique(key, return_inverse=True)
+        order = np.argsort(self.cell, kind="stable")
+        splits = np.flatnonzero(np.diff(self.cell[order])) + 1
+        self.index: Dict[Tuple[str, str, int], List[str]] = {}
+        for members in np.split(order, splits) if len(order) else []:
+            first = members[0]
+            cell_key = (str(self.zone[first]), str(self.band[first]), int(self.channel[first]))
+            self.index[cell_key] = self.ap[members].tolist()
+
+    def __len__(self) -> int:
+        return len(self.channel)
+
+    def aps_on(self, zone_id: str, band: str, channel: int) -> List[str]:
+        return self.index.get((zone_id, band, channel), [])
+
+    def analyze(
+        self,
+        zone_id: Optional[str] = None,
+        band: Optional[str] = None,
+        outlier_z: float = 3.5,
+    ) -> List[ZoneRF]:
+        """Co-channel groups, utilization histogram and noise outliers per zone."""
+        n_zones, n_bands = len(self.zones), len(self.bands)
+        radio_mask = np.ones(len(self), dtype=bool)
+        if band is not None:
+            radio_mask &= self.band == band
+
+        # co-channel: cells (zone, band, channel) shared by more than one radio
+        cell_radios = np.bincount(self.cell[radio_mask], minlength=len(self.cell_keys))
+        shared = np.flatnonzero(cell_radios > 1)
+        # any radio of a cell carries its zone, band and channel
+        first_radio = np.zeros(len(self.cell_keys), dtype=np.int64)
+        first_radio[self.cell] = np.arange(len(self))
+        shared = shared[np.argsort(-cell_radios[shared], kind="stable")]
+
+        # utilization histogram over APs; the top bin includes 100%
+        bins = np.clip((self.utilization // 10).astype(np.int64), 0, len(HISTOGRAM_EDGES) - 2)
+        n_bins = len(HISTOGRAM_EDGES) - 1
+        histogram = np.bincount(
+            self.ap_zone_idx * n_bins + bins, minlength=n_zones * n_bins
+        ).reshape(n_zones, n_bins)
+
+        # noise floor: modified z-score against the (zone, band) median, high side only
+        valid = radio_mask & ~np.isnan(self.noise)
+        group = self.zone_idx * n_bands + self.band_idx
+        median = _group_median(group[valid], self.noise[valid], n_zones * n_bands)
+        deviation = self.noise - median[group]
+        mad = _group_median(group[valid], np.abs(deviation[valid]), n_zones * n_bands)
+        scale = np.maximum(np.nan_to_num(mad[group], nan=0.0) / 0.6745, 1.0)
+        score = np.where(valid, deviation / scale, 0.0)
+        outliers = np.flatnonzero(score > outlier_z)
+        outliers = outliers[np.argsort(-score[outliers], kind="stable")]
+
+        radios_per_zone = np.bincount(self.zone_idx[radio_mask], minlength=n_zones)
+        results: Dict[int, ZoneRF] = {}
+        for z in range(n_zones):
+            if zone_id is not None and self.zones[z] != zone_id:
+                continue
+            results[z] = ZoneRF(
+                zoneId=str(self.zones[z]),
+                radios=int(radios_per_zone[z]),
+                coChannel=[],
+                utilizationHistogram=histogram[z].tolist(),
+                noiseOutliers=[],
+            )
+        for c in shared.tolist():
+            i = int(first_radio[c])
+            zone = results.get(int(self.zone_idx[i]))
+            if zone is not None:
+                zone.coChannel.append({
+                    "band": str(self.band[i]),
+                    "channel": int(self.channel[i]),
+                    "apCount": int(cell_radios[c]),
+                })
+        for i in outliers.tolist():
+            zone = results.get(int(self.zone_idx[i]))
+            if zone is not None:
+                zone.noiseOutliers.append({
+                    "apMac": str(self.ap[i]),
+                    "band": str(self.band[i]),
+                    "channel": int(self.channel[i]),
+                    "noiseFloor": float(self.noise[i]),
+                    "medianNoiseFloor": float(median[group[i]]),
+                    "score": round(float(score[i]), 2),
+                })
+        return [zone for zone in results.values() if zone.radios or any(zone.utilizationHistogram)]
+
+
+class SnapshotCache:
+    """Latest ``RadioSnapshot`` per venue, reused for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshots: Dict[str, RadioSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def get(self, venue_id: str) -> Optional[RadioSnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(venue_id)
+        if snapshot is None or time.monotonic() - snapshot.built_at > self.ttl:
+            return None
+        return snapshot
+
+    def put(self, venue_id: str, snapshot: RadioSnapshot) -> RadioSnapshot:
+        with self._lock:
+            self._snapshots[venue_id] = snapshot
+        return snapshot
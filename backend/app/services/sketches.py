@@ -0,0 +1,129 @@
+"""Mergeable sketches for long-window statistics.
+
+Quantiles use grouped t-digest centroids: each group (e.g. zone x hour)
+keeps weighted centroids, small near the tails and large around the median.
+Digests of the same metric merge by concatenating their centroids, so a
+window of any length is answered from stored hourly digests without
+re-reading raw data.
+
+Distinct counts use HyperLogLog registers (one ``uint8`` row per group);
+sketches merge with an element-wise maximum.
+
+Everything operates on many groups at once with NumPy.
+"""
+import hashlib
+from typing import Iterable, Sequence, Tuple
+import numpy as np
+
+Centroids = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _sorted_groups(group: np.ndarray, means: np.ndarray, weights: np.ndarray):
+    """Sort by (group, mean); return the arrays plus group starts, per-row base and total weight."""
+    order = np.lexsort((means, group))
+    g, m, w = group[order], means[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    sizes = np.diff(np.r_[starts, len(g)])
+    cum = np.cumsum(w)
+    base = (cum - w)[starts]
+    total = cum[starts + sizes - 1] - base
+    return g, m, w, cum, starts, sizes, np.repeat(base, sizes), np.repeat(total, sizes)
+
+
+def compress(group: np.ndarray, means: np.ndarray, weights: np.ndarray, compression: float) -> Centroids:
+    """Merge the centroids of each group down to about ``compression / 2``.
+
+    Adjacent centroids are merged while they fall in the same unit of the
+    t-digest k1 scale function, which keeps tail centroids small. Raw values
+    are centroids of weight 1. Returns ``(group, means, weights)`` sorted by
+    group, then mean.
+    """
+    if not len(means):
+        return group[:0], means[:0].astype(np.float64), weights[:0].astype(np.float64)
+    g, m, w, cum, _, _, base, total = _sorted_groups(group, means, weights)
+    q = (cum - base - w / 2) / total
+    k = np.floor(compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+    boundary = np.r_[True, (g[1:] != g[:-1]) | (k[1:] != k[:-1])]
+    ids = np.cumsum(boundary) - 1
+    merged_w = np.bincount(ids, weights=w)
+    merged_m = np.bincount(ids, weights=w * m) / merged_w
+    return g[boundary], merged_m, merged_w
+
+
+def grouped_quantiles(
+    group: np.ndarray,
+    means: np.ndarray,
+    weights: np.ndarray,
+    n_groups: int,
+    qs: Sequence[float],
+) -> np.ndarray:
+    """Quantiles ``qs`` of every group in ``[0, n_groups)`` from its centroids.
+
+    Returns an ``(n_groups, len(qs))`` array, NaN for groups without
+    centroids. Interpolates linearly between centroid centres; all groups
+    are answered with one ``searchsorted``.
+    """
+    qs = np.asarray(qs, dtype=np.float64)
+    out = np.full((n_groups, len(qs)), np.nan)
+    if not len(means):
+        return out
+    g, m, w, cum, starts, sizes, base, total = _sorted_groups(group, means, weights)
+    # centre of each centroid in its group's CDF, offset by the group id so the
+    # positions of all groups form one increasing array
+    position = g + (cum - base - w / 2) / total
+    present = g[starts]
+    first = starts[:, None]
+    last = (starts + sizes - 1)[:, None]
+    target = present[:, None] + qs[None, :]
+    idx = np.searchsorted(position, target)
+    hi = np.clip(idx, first, last)
+    lo = np.clip(idx - 1, first, last)
+    span = position[hi] - position[lo]
+    frac = np.clip(np.divide(target - position[lo], span, out=np.zeros_like(span), where=span > 0), 0.0, 1.0)
+    out[present] = m[lo] + frac * (m[hi] - m[lo])
+    return out
+
+
+def hash64(values: Iterable[str]) -> np.ndarray:
+    """Stable 64-bit hashes (identical across processes, unlike ``hash``)."""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(v.encode(), digest_size=8).digest(), "little") for v in values),
+        dtype=np.uint64,
+    )
+
+
+def _leading_zeros(x: np.ndarray) -> np.ndarray:
+    """Leading zero bits of uint64 values (64 for zero); exact via two 32-bit halves."""
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        hi_lz = 31 - np.floor(np.log2(hi))
+        lo_lz = 31 - np.floor(np.log2(lo))
+    return np.where(hi > 0, hi_lz, 32 + np.where(lo > 0, lo_lz, 32)).astype(np.int64)
+
+
+def hll_registers(group: np.ndarray, hashes: np.ndarray, n_groups: int, precision: int) -> np.ndarray:
+    """HyperLogLog registers, shape ``(n_groups, 2**precision)``, from 64-bit hashes.
+
+    The top ``precision`` bits pick the register; it keeps the largest
+    position of the first set bit among the remaining bits.
+    """
+    registers = np.zeros((n_groups, 1 << precision), dtype=np.uint8)
+    if not len(hashes):
+        return registers
+    p = np.uint64(precision)
+    index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+    rank = np.minimum(_leading_zeros(hashes << p) + 1, 64 - precision + 1).astype(np.uint8)
+    np.maximum.at(registers, (group, index), rank)
+    return registers
+
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """Distinct-count estimate per register row (linear counting for small counts)."""
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis=1)
+    zeros = np.count_nonzero(registers == 0, axis=1)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
@@ -0,0 +1,265 @@
+"""Vectorized reshaping of Flux query results.
+
+``ColumnReader`` is a ``run_query`` consumer that reads the streamed
+response into NumPy columns, in the worker thread running the query.
+Routes then group, pivot, sort and window whole arrays instead of looping
+over rows with nested dictionaries; Python objects are only created for
+the values actually returned.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.database.flux_csv import FluxRowStream, converter
+
+
+NAT = np.datetime64("NaT", "ns")
+
+
+@dataclass
+class Columns:
+    """Flux rows held as parallel arrays.
+
+    ``time`` is ``datetime64[ns]`` (NaT when missing). ``value`` is float64
+    (NaN for empty cells) or, for non-numeric readers, the converted values
+    as an object array. Each tag is a NumPy string array (``""`` when
+    missing).
+    """
+    time: np.ndarray
+    value: np.ndarray
+    tags: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def take(self, index: np.ndarray) -> "Columns":
+        """The rows selected by a boolean mask or index array."""
+        return Columns(
+            time=self.time[index],
+            value=self.value[index],
+            tags={name: column[index] for name, column in self.tags.items()},
+        )
+
+
+def to_datetimes(times: np.ndarray) -> List[Optional[datetime]]:
+    """UTC ``datetime`` objects (microsecond precision) for ``datetime64`` values; NaT becomes None.
+
+    Each distinct timestamp is converted once and the objects are shared.
+    """
+    uniques, index = np.unique(times.astype("datetime64[us]"), return_inverse=True)
+    converted = [None if t is None else t.replace(tzinfo=timezone.utc) for t in uniques.astype(object).tolist()]
+    return list(map(converted.__getitem__, index.reshape(-1).tolist()))
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _parse_times(cells: Sequence[str]) -> np.ndarray:
+    # RFC3339 "...Z"; numpy parses the naive form (empty cells become NaT)
+    return np.char.rstrip(np.asarray(cells, dtype=str), "Z").astype("datetime64[ns]")
+
+
+def _parse_numbers(cells: Sequence[str]) -> np.ndarray:
+    # empty cells are NaN (writing "nan" into the array could truncate it to
+    # the width of the longest cell)
+    text = np.asarray(cells, dtype=str)
+    values = np.full(len(text), np.nan)
+    present = text != ""
+    values[present] = text[present].astype(np.float64)
+    return values
+
+
+def _row_getter(names: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+    getter = itemgetter(*names)
+    single = len(names) == 1
+
+    def get(row: Dict[str, Any]) -> Tuple[Any, ...]:
+        try:
+            values = getter(row)
+        except KeyError:
+            # tables of one response may lack some columns
+            return tuple(row.get(name) for name in names)
+        return (values,) if single else values
+
+    return get
+
+
+@dataclass(frozen=True)
+class ColumnReader:
+    """Consume a Flux result into ``Columns`` with the given tag columns.
+
+    From a ``FluxRowStream`` the raw CSV blocks are read directly: each
+    column is transposed out of the block and parsed in one NumPy call, so
+    no per-row dictionaries or ``datetime`` objects are built. Other
+    iterables of row dictionaries are read row by row. Readers are
+    comparable, so the same reader maps to the same query-cache entry.
+    """
+    tags: Tuple[str, ...] = ()
+    value: str = "_value"
+    numeric: bool = True
+
+    @property
+    def cache_key(self) -> str:
+        return f"columns:{','.join(self.tags)}:{self.value}:{int(self.numeric)}"
+
+    def __call__(self, rows: Iterable[Dict[str, Any]]) -> Columns:
+        if isinstance(rows, FluxRowStream):
+            parts = [self._block(columns, data) for columns, data in rows.blocks()]
+        else:
+            parts = [self._rows(rows)]
+        parts = [p for p in parts if len(p)] or parts[:1] or [self._rows(())]
+        if len(parts) == 1:
+            return parts[0]
+        return Columns(
+            time=np.concatenate([p.time for p in parts]),
+            value=np.concatenate([p.value for p in parts]),
+            tags={name: np.concatenate([p.tags[name] for p in parts]) for name in self.tags},
+        )
+
+    def _block(self, columns: List[Tuple[int, str, str, Optional[str]]], data: List[List[str]]) -> Columns:
+        layout = {name: (i, datatype, default) for i, name, datatype, default in columns}
+        wanted = [name for name in ("_time", self.value) + self.tags if name in layout]
+        n = len(data)
+        # transpose only the wanted columns (rows are complete within a block),
+        # one list per column: zip(*rows) allocates a tuple per row and the
+        # garbage collector rescans the block for each batch of them
+        cells = {name: [row[layout[name][0]] for row in data] for name in wanted}
+
+        def column(name: str) -> Optional[Tuple[Sequence[str], str]]:
+            if name not in layout:
+                return None
+            _, datatype, default = layout[name]
+            values = cells[name]
+            if default is not None:
+                values = [v or default for v in values]
+            return values, datatype
+
+        time = column("_time")
+        times = _parse_times(time[0]) if time else np.full(n, NAT)
+        raw = column(self.value)
+        if raw is None:
+            value = np.full(n, np.nan) if self.numeric else np.full(n, None, dtype=object)
+        elif self.numeric:
+            value = _parse_numbers(raw[0])
+        else:
+            convert = converter(raw[1])
+            value = _object_array([None if v == "" else (convert(v) if convert else v) for v in raw[0]])
+        tags = {}
+        for name in self.tags:
+            tag = column(name)
+            tags[name] = np.asarray(tag[0], dtype=str) if tag else np.full(n, "")
+        return Columns(time=times, value=value, tags=tags)
+
+    def _rows(self, rows: Iterable[Dict[str, Any]]) -> Columns:
+        names = ("_time", self.value) + tuple(self.tags)
+        data = list(map(_row_getter(names), rows))
+        columns = list(zip(*data)) if data else [()] * len(names)
+        time = np.array(
+            [NAT if t is None else np.datetime64(t.astimezone(timezone.utc).replace(tzinfo=None), "ns") for t in columns[0]],
+            dtype="datetime64[ns]",
+        )
+        value = _object_array(columns[1])
+        missing = np.equal(value, None)
+        if self.numeric:
+            value[missing] = np.nan
+            value = value.astype(np.float64)
+        tags = {
+            name: np.asarray(["" if v is None else str(v) for v in column], dtype=str)
+            for name, column in zip(self.tags, columns[2:])
+        }
+        return Columns(time=time, value=value, tags=tags)
+
+
+def factorize(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``(sorted unique values, code per element)``."""
+    uniques, codes = np.unique(values, return_inverse=True)
+    return uniques, codes.reshape(-1)
+
+
+def first_index(codes: np.ndarray, n: int) -> np.ndarray:
+    """Index of the first element with each code ``0..n-1``."""
+    first = np.full(n, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+    return first
+
+
+def codes_in(values: np.ndarray, vocabulary: Sequence[str]) -> np.ndarray:
+    """Position of each value in ``vocabulary``, or -1 when it is not listed."""
+    uniques, codes = factorize(values)
+    position = {name: i for i, name in enumerate(vocabulary)}
+    lookup = np.array([position.get(u, -1) for u in uniques.tolist()], dtype=np.int64)
+    return lookup[codes] if len(codes) else codes.astype(np.int64)
+
+
+def group_keys(*codes: Tuple[np.ndarray, int]) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """Group rows by several code columns, given as ``(codes, number of codes)`` pairs.
+
+    Returns ``(group per row, number of groups, codes of each group per
+    column)``; groups are ordered by the columns from left to right.
+    """
+    combined = np.zeros(len(codes[0][0]), dtype=np.int64)
+    for column, n in codes:
+        combined = combined * n + column
+    keys, group = np.unique(combined, return_inverse=True)
+    key_codes: List[np.ndarray] = []
+    for _, n in reversed(codes):
+        keys, column = np.divmod(keys, n)
+        key_codes.append(column)
+    return group.reshape(-1), len(key_codes[0]), key_codes[::-1]
+
+
+def pivot(
+    row: np.ndarray,
+    n_rows: int,
+    column: np.ndarray,
+    n_columns: int,
+    values: np.ndarray,
+    fill: Any = np.nan,
+) -> np.ndarray:
+    """``(n_rows, n_columns)`` grid of ``values``; negative columns are dropped, later rows win."""
+    dtype = values.dtype if values.dtype == object else np.float64
+    grid = np.full((n_rows, n_columns), fill, dtype=dtype)
+    keep = column >= 0
+    grid[row[keep], column[keep]] = values[keep]
+    return grid
+
+
+def runs(sorted_codes: np.ndarray, n: int) -> np.ndarray:
+    """Boundaries of each code's run in sorted codes: code ``i`` spans ``[b[i], b[i + 1])``."""
+    return np.searchsorted(sorted_codes, np.arange(n + 1))
+
+
+def nullable(values: np.ndarray) -> List[Any]:
+    """Float values as a list with ``None`` in place of NaN."""
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def window_means(
+    times: np.ndarray,
+    values: np.ndarray,
+    start: float,
+    stop: float,
+    every: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean of each metric row per ``every``-second window within ``[start, stop)``.
+
+    Windows are aligned to the epoch and stamped with their end (clipped to
+    ``stop``), like Flux ``aggregateWindow``; windows without samples are
+    left out and NaN marks a metric missing from a window.
+    """
+    selected = (times >= start) & (times < stop)
+    t, v = times[selected], values[:, selected]
+    labels, idx = np.unique(np.floor(t / every).astype(np.int64), return_inverse=True)
+    n_metrics, n_windows = v.shape[0], len(labels)
+    present = ~np.isnan(v)
+    slot = (np.arange(n_metrics)[:, None] * n_windows + idx.reshape(-1)[None, :]).ravel()
+    sums = np.bincount(slot, weights=np.where(present, v, 0.0).ravel(), minlength=n_metrics * n_windows)
+    counts = np.bincount(slot, weights=present.ravel(), minlength=n_metrics * n_windows)
+    means = np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
+    return np.minimum((labels + 1) * every, stop), means.reshape(n_metrics, n_windows)
@@ -0,0 +1,147 @@
+"""Hourly per-zone HyperLogLog sketches of distinct client MACs."""
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from app.config import settings
+from app.database.influx_client import influx_service
+from app.database.query_scheduler import BACKGROUND
+from app.services.sketches import hash64, hll_estimate, hll_registers
+from app.services.venue_registry import VenueScope, venue_registry
+
+HOUR = 3600
+
+# Hours ending less than this long ago may still receive points; they are
+# re-read on every poll until settled
+SETTLE_SECONDS = 300
+
+
+def _flux_time(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _zone_macs(rows: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """Consume distinct (zoneId, macAddress) rows into two columns."""
+    zones: List[str] = []
+    macs: List[str] = []
+    for r in rows:
+        mac = r.get("macAddress")
+        if mac:
+            zones.append(str(r.get("zoneId") or ""))
+            macs.append(str(mac))
+    return zones, macs
+
+
+class UniqueClientSketches:
+    """Distinct clients per zone and hour, kept as mergeable HLL registers.
+
+    A background task digests each hour of ``client_metrics`` once per venue
+    (newest first, back to ``retention_hours``) and re-reads the unsettled
+    tail on every poll. Distinct counts for any zone set and window merge
+    the hourly registers (element-wise max) instead of scanning clients.
+    Each zone-hour costs ``2**precision`` bytes.
+    """
+
+    def __init__(self, precision: int, retention_hours: int):
+        self.precision = precision
+        self.retention_hours = retention_hours
+        # venue -> hour start -> (zoneIds, registers with one row per zone)
+        self._hours: Dict[str, Dict[int, Tuple[np.ndarray, np.ndarray]]] = {}
+        self._settled: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def _query(self, venue: VenueScope, start: int, stop: int) -> str:
+        return (
+            f"from(bucket: \"{venue.bucket}\")\n"
+            f"  |> range(start: {_flux_time(start)}, stop: {_flux_time(stop)})\n"
+            "  |> filter(fn: (r) => r[\"_measurement\"] == \"client_metrics\")\n"
+            f"{venue.scope_filter}"
+            "  |> filter(fn: (r) => r[\"_field\"] == \"dataUsage\")\n"
+            "  |> group(columns: [\"zoneId\", \"macAddress\"])\n"
+            "  |> last()\n"
+            "  |> keep(columns: [\"zoneId\", \"macAddress\"])\n"
+        )
+
+    def digest(self, zones: List[str], macs: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Build ``(zoneIds, registers)`` for one hour of (zone, MAC) pairs."""
+        labels, zone_idx = np.unique(np.asarray(zones, dtype=object), return_inverse=True)
+        return labels, hll_registers(zone_idx, hash64(macs), len(labels), self.precision)
+
+    def poll_venue(self, venue: VenueScope, now: Optional[float] = None) -> int:
+        """Digest the hours of ``venue`` not yet settled; returns hours read."""
+        now = time.time() if now is None else now
+        current = int(now // HOUR) * HOUR
+        settled_before = int((now - SETTLE_SECONDS) // HOUR) * HOUR
+        oldest = current - (self.retention_hours - 1) * HOUR
+        with self._lock:
+            done = set(self._settled.get(venue.id, ()))
+        pending = [h for h in range(current, oldest - 1, -HOUR) if h not in done]
+        for hour in pending:
+            zones, macs = influx_service.query_scheduled(
+                self._query(venue, hour, min(hour + HOUR, int(now) + 1)), _zone_macs, query_class=BACKGROUND
+            )
+            sketch = self.digest(zones, macs)
+            with self._lock:
+                self._hours.setdefault(venue.id, {})[hour] = sketch
+                if hour < settled_before:
+                    self._settled.setdefault(venue.id, set()).add(hour)
+        with self._lock:
+            hours = self._hours.get(venue.id, {})
+            for hour in [h for h in hours if h < oldest]:
+                del hours[hour]
+                self._settled[venue.id].discard(hour)
+        self.queries += len(pending)
+        return len(pending)
+
+    def estimate(
+        self,
+        venue_id: str,
+        start: int,
+        stop: int,
+        zone_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Distinct clients over hours in ``[start, stop)``, overall and per zone.
+
+        Also reports how many of the window's hours have been digested, since
+        older hours fill in while the background task catches up.
+        """
+        with self._lock:
+            sketches = [s for h, s in self._hours.get(venue_id, {}).items() if start <= h < stop]
+        zones = np.empty(0, dtype=object)
+        per_zone, total = np.empty(0), 0.0
+        if sketches:
+            labels = np.concatenate([zone_labels for zone_labels, _ in sketches])
+            registers = np.concatenate([zone_registers for _, zone_registers in sketches])
+            if zone_ids:
+                keep = np.isin(labels, np.asarray(zone_ids, dtype=object))
+                labels, registers = labels[keep], registers[keep]
+            if len(labels):
+                zones, zone_idx = np.unique(labels, return_inverse=True)
+                order = np.argsort(zone_idx, kind="stable")
+                starts = np.flatnonzero(np.r_[True, np.diff(zone_idx[order]) != 0])
+                merged = np.maximum.reduceat(registers[order], starts, axis=0)
+                per_zone = hll_estimate(merged)
+                total = float(hll_estimate(merged.max(axis=0))[0])
+        return {
+            "uniqueClients": int(round(total)),
+            "zones": [
+                {"zoneId": str(z), "uniqueClients": int(round(c))} for z, c in zip(zones.tolist(), per_zone.tolist())
+            ],
+            "hoursCovered": len(sketches),
+            "hoursInWindow": (stop - start) // HOUR,
+        }
+
+    async def poll(self) -> None:
+        """Poll every venue once; scheduled by the background refresh scheduler."""
+        for _, result in await venue_registry.fan_out(self.poll_venue):
+            if isinstance(result, Exception):
+                print(f"Warning: unique-client sketch poll failed: {result}")
+
+
+# Global instance
+unique_clients = UniqueClientSketches(
+    precision=settings.unique_clients_hll_precision,
+    retention_hours=settings.unique_clients_retention_days * 24,
+)
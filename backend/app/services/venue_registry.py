@@ -0,0 +1,97 @@
+"""Venue registry and per-venue query routing."""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from app.config import settings, Settings
+
+
+@dataclass(frozen=True)
+class VenueScope:
+    """Where the data for one venue lives.
+
+    ``partitioned`` venues share a bucket with other venues and are selected
+    with a ``venueId`` tag filter; the others own their bucket outright.
+    """
+    id: str
+    name: str
+    bucket: str
+    partitioned: bool = False
+
+    @property
+    def scope_filter(self) -> str:
+        """Flux filter line restricting a query to this venue (may be empty)."""
+        if not self.partitioned:
+            return ""
+        return f"  |> filter(fn: (r) => r[\"venueId\"] == \"{self.id}\")\n"
+
+
+class VenueRegistry:
+    """Registry of the venues served by this backend."""
+
+    def __init__(self, venues: Iterable[VenueScope], default_venue_id: str):
+        self._venues = {v.id: v for v in venues}
+        if default_venue_id not in self._venues:
+            raise ValueError(f"Default venue {default_venue_id!r} is not registered")
+        self.default_venue_id = default_venue_id
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "VenueRegistry":
+        """Build the registry from application settings."""
+        if not config.venues:
+            default = VenueScope(
+                id=config.default_venue_id,
+                name=config.default_venue_name,
+                bucket=config.influxdb_bucket,
+            )
+            return cls([default], config.default_venue_id)
+
+        scopes = [
+            VenueScope(
+                id=v.id,
+                name=v.name,
+                bucket=v.bucket or config.influxdb_bucket,
+                partitioned=v.bucket is None,
+            )
+            for v in config.venues
+        ]
+        default_id = config.default_venue_id
+        if default_id not in {v.id for v in scopes}:
+            default_id = scopes[0].id
+        return cls(scopes, default_id)
+
+    def get(self, venue_id: Optional[str] = None) -> VenueScope:
+        """Return the venue with ``venue_id`` (or the default venue).
+
+        Raises ``KeyError`` for unknown venues.
+        """
+        return self._venues[venue_id or self.default_venue_id]
+
+    def all(self) -> List[VenueScope]:
+        """Return all registered venues ordered by id."""
+        return sorted(self._venues.values(), key=lambda v: v.id)
+
+    async def fan_out(
+        self,
+        fn: Callable[[VenueScope], Any],
+        venue_ids: Optional[Iterable[str]] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[Tuple[VenueScope, Any]]:
+        """Run the blocking ``fn(venue)`` for many venues concurrently.
+
+        Each call runs in a worker thread, at most ``concurrency`` at a time.
+        Returns ``(venue, result)`` pairs in venue order; a failing venue
+        yields its exception as the result instead of aborting the others.
+        """
+        scopes = [self.get(v) for v in venue_ids] if venue_ids else self.all()
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.venue_fanout_concurrency))
+
+        async def run(scope: VenueScope) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(fn, scope)
+
+        results = await asyncio.gather(*(run(s) for s in scopes), return_exceptions=True)
+        return list(zip(scopes, results))
+
+
+# Global instance
+venue_registry = VenueRegistry.from_settings(settings)
@@ -0,0 +1,211 @@
+"""Zone rankings over long windows from stored hourly t-digests."""
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.services.sketches import compress, grouped_quantiles
+
+HOUR = 3600
+
+# Hours ending less than this long ago may still receive points; they are
+# recomputed on every request instead of being stored
+SETTLE_SECONDS = 300
+
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+@dataclass
+class HourCentroids:
+    """t-digest centroids of one metric for many zones and hours."""
+    zones: np.ndarray    # zoneId per centroid (object)
+    hours: np.ndarray    # hour start, epoch seconds
+    means: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "HourCentroids":
+        return cls(
+            np.empty(0, dtype=object), np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64),
+        )
+
+    @classmethod
+    def concat(cls, parts: List["HourCentroids"]) -> "HourCentroids":
+        if not parts:
+            return cls.empty()
+        return cls(
+            np.concatenate([p.zones for p in parts]),
+            np.concatenate([p.hours for p in parts]),
+            np.concatenate([p.means for p in parts]),
+            np.concatenate([p.weights for p in parts]),
+        )
+
+    def select(self, mask: np.ndarray) -> "HourCentroids":
+        return HourCentroids(self.zones[mask], self.hours[mask], self.means[mask], self.weights[mask])
+
+
+def collect_samples(rows: Iterable[Dict[str, Any]]) -> Tuple[List[str], Dict[str, str], List[float], List[float]]:
+    """Consume metric rows into ``(zoneIds, zone names, epoch times, values)``."""
+    zones: List[str] = []
+    names: Dict[str, str] = {}
+    times: List[float] = []
+    values: List[float] = []
+    for r in rows:
+        value = r.get("_value")
+        if value is None or r.get("_time") is None:
+            continue
+        zone = str(r.get("zoneId") or "")
+        if zone not in names:
+            names[zone] = str(r.get("zoneName") or zone)
+        zones.append(zone)
+        times.append(r["_time"].timestamp())
+        values.append(float(value))
+    return zones, names, times, values
+
+
+class ZoneDigestStore:
+    """Hourly per-zone digests of zone metrics, per venue and metric.
+
+    Settled hours are digested once and kept for ``retention_hours``; only
+    hours not yet covered plus the unsettled tail are read from Influx, so a
+    7-day ranking costs one short query once the store is warm. Windows and
+    trend segments are answered by merging hourly digests.
+    """
+
+    def __init__(self, compression: float, retention_hours: int):
+        self.compression = compression
+        self.retention_hours = retention_hours
+        self._hours: Dict[Tuple[str, str], Dict[int, HourCentroids]] = {}
+        self._names: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def settled_hour(now: float) -> int:
+        """Start of the first hour that may still receive points."""
+        return int((now - SETTLE_SECONDS) // HOUR) * HOUR
+
+    def fetch_start(self, venue_id: str, metric: str, start_hour: int, settled_hour: int) -> int:
+        """Earliest hour in ``[start_hour, settled_hour)`` not yet stored (else ``settled_hour``)."""
+        with self._lock:
+            stored = self._hours.get((venue_id, metric), {})
+            for hour in range(start_hour, settled_hour, HOUR):
+                if hour not in stored:
+                    return hour
+        return settled_hour
+
+    def ingest(
+        self,
+        venue_id: str,
+        metric: str,
+        samples: Tuple[List[str], Dict[str, str], List[float], List[float]],
+        fetch_start: int,
+        settled_hour: int,
+    ) -> HourCentroids:
+        """Digest samples read from ``fetch_start`` onwards.
+
+        Settled hours are stored (empty ones too, so they are not queried
+        again); the digests of the unsettled tail are returned instead.
+        """
+        zones, names, times, values = samples
+        zone_labels, zone_idx = np.unique(np.asarray(zones, dtype=object), return_inverse=True)
+        hours = (np.asarray(times, dtype=np.float64) // HOUR).astype(np.int64) * HOUR
+        hour_labels, hour_idx = np.unique(hours, return_inverse=True)
+        group, means, weights = compress(
+            zone_idx.astype(np.int64) * max(len(hour_labels), 1) + hour_idx,
+            np.asarray(values, dtype=np.float64),
+            np.ones(len(values)),
+            self.compression,
+        )
+        digests = HourCentroids(
+            zone_labels[group // max(len(hour_labels), 1)],
+            hour_labels[group % max(len(hour_labels), 1)] if len(hour_labels) else hours[:0],
+            means,
+            weights,
+        )
+
+        with self._lock:
+            self._names.setdefault(venue_id, {}).update(names)
+            stored = self._hours.setdefault((venue_id, metric), {})
+            for hour in range(fetch_start, settled_hour, HOUR):
+                stored[hour] = digests.select(digests.hours == hour)
+            oldest = settled_hour - self.retention_hours * HOUR
+            for hour in [h for h in stored if h < oldest]:
+                del stored[hour]
+        return digests.select(digests.hours >= settled_hour)
+
+    def zone_name(self, venue_id: str, zone_id: str) -> str:
+        return self._names.get(venue_id, {}).get(zone_id, zone_id)
+
+    def rank(
+        self,
+        venue_id: str,
+        metric: str,
+        tail: HourCentroids,
+        window_start: int,
+        window_hours: int,
+        segments: int,
+        descending: bool,
+    ) -> List[Dict[str, Any]]:
+        """Percentiles, trend and rank change per zone.
+
+        The window covers ``window_hours`` hours from ``window_start`` (the
+        last one includes the unsettled tail); it is compared with the
+        window of the same length before it. Zones are ranked by median,
+        best first (highest when ``descending``).
+        """
+        previous_start = window_start - window_hours * HOUR
+        with self._lock:
+            stored = self._hours.get((venue_id, metric), {})
+            parts = [d for h, d in stored.items() if h >= previous_start]
+        data = HourCentroids.concat(parts + [tail])
+        zones, zone_idx = np.unique(data.zones, return_inverse=True)
+        n_zones = len(zones)
+        current = data.hours >= window_start
+        previous = ~current
+
+        now_q = grouped_quantiles(zone_idx[current], data.means[current], data.weights[current], n_zones, QUANTILES)
+        prev_q = grouped_quantiles(zone_idx[previous], data.means[previous], data.weights[previous], n_zones, (0.5,))
+        samples = np.bincount(zone_idx[current], weights=data.weights[current], minlength=n_zones)
+
+        # trend: median per equal-width segment of the current window
+        segment = np.clip((data.hours[current] - window_start) * segments // (window_hours * HOUR), 0, segments - 1)
+        trend = grouped_quantiles(
+            zone_idx[current] * segments + segment, data.means[current], data.weights[current],
+            n_zones * segments, (0.5,),
+        ).reshape(n_zones, segments)
+
+        rank = _ranks(now_q[:, 1], descending)
+        previous_rank = _ranks(prev_q[:, 0], descending)
+        results = []
+        for z in np.argsort(rank, kind="stable").tolist():
+            if not samples[z]:
+                continue
+            p50 = float(now_q[z, 1])
+            prev_p50 = None if np.isnan(prev_q[z, 0]) else float(prev_q[z, 0])
+            prev_rank = int(previous_rank[z]) if previous_rank[z] else None
+            results.append({
+                "zoneId": str(zones[z]),
+                "zoneName": self.zone_name(venue_id, str(zones[z])),
+                "rank": int(rank[z]),
+                "previousRank": prev_rank,
+                "rankChange": prev_rank - int(rank[z]) if prev_rank else None,
+                "p5": round(float(now_q[z, 0]), 2),
+                "p50": round(p50, 2),
+                "p95": round(float(now_q[z, 2]), 2),
+                "previousP50": round(prev_p50, 2) if prev_p50 is not None else None,
+                "change": round(p50 - prev_p50, 2) if prev_p50 is not None else None,
+                "samples": int(samples[z]),
+                "trend": [None if np.isnan(v) else round(float(v), 2) for v in trend[z]],
+            })
+        return results
+
+
+def _ranks(values: np.ndarray, descending: bool) -> np.ndarray:
+    """1-based rank per entry (0 for NaN); ties keep index (zoneId) order."""
+    valid = ~np.isnan(values)
+    key = -values if descending else values
+    order = np.lexsort((np.arange(len(values)), np.where(valid, key, np.inf), ~valid))
+    ranks = np.zeros(len(values), dtype=np.int64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    ranks[~valid] = 0
+    return ranks
@@ -0,0 +1,105 @@
+"""Compare FluxTable materialization with lazy annotated-CSV parsing.
+
+Run:  python -m scripts.bench_flux_parsing --rows 20000
+
+Feeds the same synthetic annotated CSV response to the influxdb-client
+``FluxCsvParser`` in tables mode (the previous ``query_dicts`` path) and to
+``iter_annotated_csv`` (the ``query_stream`` path), aggregating the rows the
+way the clients route does. Reports time to first row, total time and peak
+memory.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List
+
+from influxdb_client.client.flux_csv_parser import FluxCsvParser, FluxSerializationMode
+
+from app.database.flux_csv import iter_annotated_csv
+
+FIELDS = ('hostname', 'ipAddress', 'dataUsage')
+
+
+def make_csv(count: int) -> bytes:
+    """Build one annotated CSV table per (client, field), like ``group(columns: [mac, _field])``."""
+    out = io.StringIO()
+    types = {'hostname': 'string', 'ipAddress': 'string', 'dataUsage': 'double'}
+    table = 0
+    for f in FIELDS:
+        out.write(
+            f"#datatype,string,long,dateTime:RFC3339,{types[f]},string,string,string,string\n"
+            "#group,false,false,false,false,true,true,true,true\n"
+            "#default,_result,,,,,,,\n"
+            ",result,table,_time,_value,_field,_measurement,macAddress,apName\n"
+        )
+        for i in range(count):
+            value = {'hostname': f"host-{i}", 'ipAddress': f"10.0.{i >> 8 & 255}.{i & 255}",
+                     'dataUsage': f"{i * 0.37:.2f}"}[f]
+            mac = f"00:01:{i >> 16 & 255:02X}:{i >> 8 & 255:02X}:{i & 255:02X}:2C"
+            out.write(f",,{table},2024-01-01T05:00:00.123456789Z,{value},{f},client_metrics,{mac},AP-{i % 200:03d}\n")
+            table += 1
+        out.write('\n')
+    return out.getvalue().encode()
+
+
+class _Response:
+    """Minimal stand-in for the urllib3 response the parser reads from."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.body.splitlines(True))
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+def tables_rows(body: bytes) -> Iterator[Dict]:
+    parser = FluxCsvParser(response=_Response(body), serialization_mode=FluxSerializationMode.tables)
+    list(parser.generator())
+    for table in parser.tables:
+        for record in table.records:
+            yield dict(record.values)
+
+
+def csv_rows(body: bytes) -> Iterator[Dict]:
+    lines = (line.decode('utf-8') for line in _Response(body))
+    return iter_annotated_csv(csv.reader(lines))
+
+
+def measure(name: str, fn: Callable[[bytes], Iterator[Dict]], body: bytes) -> None:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    first = None
+    usage: Dict[str, float] = {}
+    for r in fn(body):
+        if first is None:
+            first = time.perf_counter() - t0
+        if r.get('_field') == 'dataUsage':
+            usage[r.get('macAddress')] = r.get('_value')
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<8} first row={(first or 0) * 1000:8.1f} ms  total={elapsed * 1000:8.1f} ms  "
+        f"peak={peak / 2**20:8.1f} MiB  clients={len(usage)}"
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Flux response parsing')
+    parser.add_argument('--rows', type=int, default=20_000, help='Clients in the response')
+    args = parser.parse_args()
+
+    body = make_csv(args.rows)
+    print(f"{args.rows * len(FIELDS)} rows, {len(body) / 2**20:.1f} MiB of CSV")
+    measure('tables', tables_rows, body)
+    measure('stream', csv_rows, body)
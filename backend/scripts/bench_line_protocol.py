@@ -0,0 +1,85 @@
+"""Compare generator write encoding: ``Point`` objects vs the line-protocol fast path.
+
+Run:  python -m scripts.bench_line_protocol --zones 50 --aps-per-zone 100 --clients-per-ap 4 --frames 5
+
+Encodes every series of one generated topology per frame, the way the seed
+and live mode write it: building ``Point`` objects with the ``*_point``
+builders and serializing them (the previous path), and with
+``TopologyFrames`` (pre-escaped series keys, one template per measurement),
+with and without live-mode drift. Also checks that both paths produce the
+same lines and reports the payload size with and without gzip.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import re
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from scripts.generate_data import TopologyFrames, ap_point, client_point, radio_point, venue_point, zone_point
+from scripts.topology import add_topology_arguments, build_topology, spec_from_args
+
+# Point drops the trailing ".0" of whole floats; the fast path keeps it
+WHOLE_FLOAT = re.compile(r'=(-?\d+)\.0(?=[, ])')
+
+
+def point_lines(venue, aps, clients, venue_id: str, ts: datetime) -> List[str]:
+    points = [venue_point(venue, venue_id, ts)]
+    points += [zone_point(z, venue_id, ts) for z in venue['zones']]
+    points += [ap_point(ap, venue_id, ts) for ap in aps]
+    points += [radio_point(ap, radio, venue_id, ts) for ap in aps for radio in ap['radios']]
+    points += [client_point(c, venue_id, ts) for c in clients]
+    return [p.to_line_protocol() for p in points]
+
+
+def timed(fn: Callable[[], List[str]], frames: int):
+    started = time.perf_counter()
+    for _ in range(frames):
+        payload = '\n'.join(fn()).encode()
+    return (time.perf_counter() - started) / frames, payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=5)
+    add_topology_arguments(parser)
+    args = parser.parse_args()
+
+    topology = build_topology(spec_from_args(args))
+    venue, aps, clients = topology.venue, topology.aps, topology.clients
+    ts = datetime.utcnow()
+    encoder = TopologyFrames(venue, aps, clients, 'main-venue', seed=1)
+    expected = point_lines(venue, aps, clients, 'main-venue', ts)
+    actual = [WHOLE_FLOAT.sub(r'=\1', line) for line in encoder.frame(ts, drift=False)]
+    if sorted(actual) != sorted(expected):
+        mismatch = next(a for a, e in zip(sorted(actual), sorted(expected)) if a != e)
+        raise SystemExit(f"Fast path differs from Point output, e.g.:\n  {mismatch}")
+
+    print(f"{len(encoder)} series per frame, {args.frames} frames (output matches Point.to_line_protocol)")
+    results = [
+        ('Point objects', lambda: point_lines(venue, aps, clients, 'main-venue', datetime.utcnow())),
+        ('line protocol', lambda: encoder.frame(datetime.utcnow(), drift=False)),
+        ('line protocol + drift', lambda: encoder.frame(datetime.utcnow())),
+    ]
+    baseline = None
+    for name, fn in results:
+        seconds, payload = timed(fn, args.frames)
+        baseline = baseline or seconds
+        print(
+            f"{name:22s} {seconds * 1000:8.1f} ms/frame  {len(encoder) / seconds:10.0f} lines/s  "
+            f"{baseline / seconds:5.1f}x"
+        )
+
+    started = time.perf_counter()
+    compressed = gzip.compress(payload)
+    gzip_ms = (time.perf_counter() - started) * 1000
+    print(
+        f"payload {len(payload) / 1e6:.2f} MB, gzip {len(compressed) / 1e6:.2f} MB "
+        f"({len(payload) / len(compressed):.1f}x smaller, {gzip_ms:.0f} ms)"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Compare peak memory and GC pauses: dict + Pydantic rows vs slot records.
+
+Run:  python -m scripts.bench_records --clients 50000
+
+Builds synthetic ``query_dicts``-style rows for the clients route and
+aggregates them with the previous dict-of-dicts approach (a ``Client`` model
+per row) and with ``ClientRecord`` (models only for the returned page).
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from app.models.client import Client
+from app.models.records import ClientRecord
+
+FIELDS = ('hostname', 'modelName', 'ipAddress', 'dataUsage')
+
+
+def make_rows(count: int, seed: int = 1) -> List[Dict]:
+    rng = random.Random(seed)
+    aps = [(f"AP-{i:03d}", f"2C:AB:46:08:{i // 256:02X}:{i % 256:02X}") for i in range(200)]
+    rows: List[Dict] = []
+    for i in range(count):
+        mac = f"00:01:{i >> 16 & 255:02X}:{i >> 8 & 255:02X}:{i & 255:02X}:2C"
+        ap_name, ap_mac = rng.choice(aps)
+        # fresh str objects per row, like values parsed from the Influx CSV response
+        tags = {
+            'macAddress': mac,
+            'apName': ''.join(ap_name),
+            'apMac': ''.join(ap_mac),
+            'wlan': ''.join(rng.choice(['LSS VOICE', 'LSS DATA', 'LSS GUEST'])),
+            'os': ''.join(rng.choice(['iOS', 'Android', 'Windows', 'Unknown'])),
+            'deviceType': ''.join(rng.choice(['phone', 'laptop'])),
+        }
+        values = {
+            'hostname': f"host-{i}",
+            'modelName': 'Unknown',
+            'ipAddress': f"10.0.{i >> 8 & 255}.{i & 255}",
+            'dataUsage': rng.random() * 2000,
+        }
+        for f in FIELDS:
+            rows.append({'_field': f, '_value': values[f], **tags})
+    return rows
+
+
+def legacy(rows: List[Dict], limit: int) -> List[Client]:
+    index: Dict[str, dict] = {}
+    for r in rows:
+        mac = r.get('macAddress')
+        if mac not in index:
+            index[mac] = {
+                'hostname': None, 'modelName': None, 'ipAddress': None, 'macAddress': mac,
+                'wlan': r.get('wlan'), 'apName': r.get('apName'), 'apMac': r.get('apMac'),
+                'dataUsage': 0.0, 'os': r.get('os'), 'deviceType': r.get('deviceType'),
+            }
+        index[mac][r.get('_field')] = r.get('_value')
+    items = [
+        Client(
+            hostname=str(v.get('hostname', '')), modelName=str(v.get('modelName', 'Unknown')),
+            ipAddress=str(v.get('ipAddress', '')), macAddress=str(v.get('macAddress', '')),
+            wlan=str(v.get('wlan', '')), apName=str(v.get('apName', '')), apMac=str(v.get('apMac', '')),
+            dataUsage=float(v.get('dataUsage', 0.0)), os=str(v.get('os', 'Unknown')),
+            deviceType=str(v.get('deviceType', 'other')),
+        )
+        for v in index.values()
+    ]
+    items.sort(key=lambda x: x.dataUsage, reverse=True)
+    return items[:limit]
+
+
+def records(rows: List[Dict], limit: int) -> List[Client]:
+    index: Dict[str, ClientRecord] = {}
+    for r in rows:
+        mac = r.get('macAddress')
+        rec = index.get(mac)
+        if rec is None:
+            rec = index[mac] = ClientRecord(
+                mac, r.get('wlan'), r.get('apName'), r.get('apMac'), r.get('os'), r.get('deviceType')
+            )
+        rec.set_field(r.get('_field'), r.get('_value'))
+    items = list(index.values())
+    items.sort(key=lambda x: x.dataUsage, reverse=True)
+    return [rec.to_model() for rec in items[:limit]]
+
+
+def measure(name: str, fn: Callable[[List[Dict], int], List[Client]], rows: List[Dict], limit: int) -> None:
+    pauses: List[float] = []
+    started: List[float] = []
+
+    def on_gc(phase: str, info: Dict) -> None:
+        if phase == 'start':
+            started.append(time.perf_counter())
+        elif started:
+            pauses.append(time.perf_counter() - started.pop())
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(rows, limit)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.remove(on_gc)
+    print(
+        f"{name:<10} time={elapsed * 1000:8.1f} ms  peak={peak / 2**20:8.1f} MiB  "
+        f"gc runs={len(pauses):4d}  gc total={sum(pauses) * 1000:7.1f} ms  "
+        f"gc max={max(pauses, default=0) * 1000:6.2f} ms"
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark client aggregation memory')
+    parser.add_argument('--clients', type=int, default=50_000, help='Number of clients')
+    parser.add_argument('--limit', type=int, default=100, help='Page size returned')
+    args = parser.parse_args()
+
+    rows = make_rows(args.clients)
+    print(f"{args.clients} clients, {len(rows)} rows, page of {args.limit}")
+    measure('legacy', legacy, rows, args.limit)
+    measure('records', records, rows, args.limit)
@@ -0,0 +1,83 @@
+"""Measure API cold start: import time, time to liveness and to the first API response.
+
+Run:  python -m scripts.bench_startup --runs 3
+
+Each run starts a fresh ``uvicorn app.main:app`` process and polls it:
+``/health/live`` is served as soon as the process accepts connections, the
+first ``/api/venues`` call waits for the routers to be mounted, and
+``/health/ready`` additionally needs a reachable InfluxDB (it reports 503
+without one, which does not delay the other two).
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def import_time() -> float:
+    code = 'import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)'
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def wait_for(url: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            if httpx.get(url, timeout=timeout).status_code < 500:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(url)
+
+
+def one_run(timeout: float) -> Dict[str, float]:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        live = wait_for(f"{base}/health/live", started, timeout)
+        first_api = wait_for(f"{base}/api/venues", started, timeout)
+        ready = httpx.get(f"{base}/health/ready", timeout=timeout)
+        return {
+            'live': live,
+            'first_api': first_api,
+            'routes_load': ready.json().get('routesLoadSeconds') or 0.0,
+            'ready': float(ready.status_code == 200),
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark API startup time')
+    parser.add_argument('--runs', type=int, default=3, help='Number of cold starts')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Seconds to wait for each endpoint')
+    args = parser.parse_args()
+
+    imports: List[float] = [import_time() for _ in range(args.runs)]
+    runs = [one_run(args.timeout) for _ in range(args.runs)]
+    print(f"import app.main     median {statistics.median(imports) * 1000:8.1f} ms")
+    for key, label in (('live', 'liveness'), ('first_api', 'first /api call'), ('routes_load', 'routes mounted in')):
+        values = [r[key] for r in runs]
+        print(f"{label:<19} median {statistics.median(values) * 1000:8.1f} ms  (max {max(values) * 1000:.1f} ms)")
+    print(f"ready (InfluxDB reachable): {sum(r['ready'] for r in runs):.0f}/{args.runs} runs")
@@ -0,0 +1,285 @@
+"""Compare per-row loops with the vectorized transforms used by the routes.
+
+Run:  python -m scripts.bench_transforms --rows 10000,100000,1000000
+
+Builds synthetic annotated-CSV responses for ``/api/load``,
+``/api/time-series``, ``/api/time-series/multi`` and
+``/api/zones/{zoneId}/aps`` and turns each into response models twice:
+parsed into row dicts by ``FluxRowStream`` and reshaped by the previous
+row loop (nested dicts, per-row models, sort), and read by the route's
+``ColumnReader`` from a ``FluxRowStream`` and reshaped by its vectorized
+transform. The script checks that both paths return the same models and
+reports the time for each path, parsing included.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import io
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from app.database.flux_csv import FluxRowStream
+from app.models.access_point import AccessPoint, Radio
+from app.models.load import BandData, LoadDataPoint
+from app.models.time_series import TimeSeriesPoint, ZoneSeries
+from app.routes.access_points import AP_COLUMNS, RADIO_COLUMNS, _access_points
+from app.routes.load import LOAD_COLUMNS, _band_items
+from app.routes.time_series import POINT_COLUMNS, SERIES_COLUMNS, _points, _zone_series
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FRAME = {'result': '_result', '_start': START, '_stop': START + timedelta(days=1)}
+
+
+def _times(count: int) -> List[datetime]:
+    return [START + timedelta(minutes=i) for i in range(count)]
+
+
+# ---- synthetic rows --------------------------------------------------------
+
+def load_rows(n: int) -> List[Dict[str, Any]]:
+    times = _times(max(1, n // 9))
+    return [
+        {**FRAME, '_time': ts, '_value': (i * 7 + j) % 100 / 1.0, '_field': field, '_measurement': 'band_load',
+         'band': band, 'zoneId': 'zone-1'}
+        for i, band in enumerate(('2.4G', '5G', '6G/5G'))
+        for j, field in enumerate(('band24G', 'band5G', 'band6G5G'))
+        for ts in times
+    ]
+
+
+def point_rows(n: int) -> List[Dict[str, Any]]:
+    zones = 20
+    times = _times(max(1, n // zones))
+    return [
+        {**FRAME, '_time': ts, '_value': (z * 13 + k) % 100 / 1.0, '_field': 'value', '_measurement': 'metrics',
+         'metric': 'experienceScore', 'zoneId': f'zone-{z}', 'zoneName': f'Zone {z}'}
+        for z in range(zones)
+        for k, ts in enumerate(times)
+    ]
+
+
+def series_rows(n: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+    zones, metrics, aggs = 20, ('experienceScore', 'utilization'), ('mean', 'p95')
+    times = _times(max(1, n // (zones * len(metrics) * len(aggs))))
+    rows = [
+        {**FRAME, '_time': ts, '_value': None if k % 17 == 0 and agg == 'p95' else (z + k) % 100 / 1.0,
+         'metric': metric, 'agg': agg, 'zoneId': f'zone-{z}', 'zoneName': f'Zone {z}'}
+        for z in range(zones)
+        for metric in metrics
+        for agg in aggs
+        for k, ts in enumerate(times)
+    ]
+    return rows, [f'{m}.{a}' for m in metrics for a in aggs]
+
+
+def ap_rows(n: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    count = max(1, n // 15)
+    ints = ('clientCount', 'channelUtilization', 'airtimeUtilization', 'cpuUtilization', 'memoryUtilization')
+    aps, radios = [], []
+    for i in range(count):
+        mac = f'D8:38:FC:{i >> 16 & 255:02X}:{i >> 8 & 255:02X}:{i & 255:02X}'
+        tags = {'apMac': mac, 'apName': f'AP-{i}', 'model': 'R750', 'status': 'online', 'ip': f'10.0.{i >> 8 & 255}.{i & 255}',
+                'zoneId': 'zone-1', 'zoneName': 'Zone 1'}
+        values = dict(zip(ints, (i % 50, i % 90, i % 80, i % 70, i % 60)))
+        values.update(firmwareVersion='6.1.2.0.1234', serialNumber=f'SN{i:08d}')
+        aps += [{**FRAME, '_time': START, '_field': f, '_value': v, **tags} for f, v in values.items()]
+        for band in ('2.4GHz', '5GHz'):
+            fields = {'channel': 36 if band == '5GHz' else 6, 'txPower': 20, 'noiseFloor': -95, 'clientCount': i % 25}
+            radios += [{**FRAME, '_time': START, '_field': f, '_value': v, 'apMac': mac, 'band': band}
+                       for f, v in fields.items()]
+    return aps, radios
+
+
+# ---- annotated CSV -------------------------------------------------------
+
+def _datatype(value: Any) -> str:
+    if isinstance(value, datetime):
+        return 'dateTime:RFC3339'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'long'
+    if isinstance(value, float):
+        return 'double'
+    return 'string'
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+    return str(value)
+
+
+def to_csv(rows: List[Dict[str, Any]]) -> bytes:
+    """Annotated CSV with one block per column layout and ``_value`` type, one table per series."""
+    blocks: Dict[Tuple, List[Dict[str, Any]]] = defaultdict(list)
+    for r in rows:
+        layout = tuple(k for k in r if k != 'result')
+        kind = _datatype(r['_value']) if r.get('_value') is not None else 'double'
+        blocks[layout, kind].append(r)
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    for (layout, kind), block in blocks.items():
+        types = [kind if k == '_value' else _datatype(block[0][k]) for k in layout]
+        writer.writerow(['#datatype', 'string', 'long'] + types)
+        writer.writerow(['', 'result', 'table'] + list(layout))
+        tables: Dict[Tuple, int] = {}
+        for r in block:
+            series = tuple(r[k] for k in layout if k not in ('_time', '_value'))
+            table = tables.setdefault(series, len(tables))
+            writer.writerow(['', '_result', table] + [_cell(r[k]) for k in layout])
+        writer.writerow([])
+    return out.getvalue().encode()
+
+
+class Response:
+    """Stands in for the urllib3 response ``query_raw`` returns."""
+
+    def __init__(self, payload: bytes):
+        self._payload = payload
+
+    def stream(self, amt: int):
+        for i in range(0, len(self._payload), amt):
+            yield self._payload[i:i + amt]
+
+    def release_conn(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def dict_rows(payload: bytes) -> FluxRowStream:
+    return FluxRowStream(Response(payload))
+
+
+def stream(payload: bytes) -> FluxRowStream:
+    return FluxRowStream(Response(payload))
+
+
+# ---- previous row loops ----------------------------------------------------
+
+def load_loop(rows: Iterable[Dict[str, Any]]) -> List[BandData]:
+    bands: dict[str, dict[str, dict]] = {'2.4G': {}, '5G': {}, '6G/5G': {}}
+    for r in rows:
+        band, ts = str(r.get('band')), r.get('_time')
+        bands.setdefault(band, {})
+        if ts not in bands[band]:
+            bands[band][ts] = {'timestamp': ts, 'band24G': 0.0, 'band5G': 0.0, 'band6G5G': 0.0}
+        bands[band][ts][r.get('_field')] = float(r.get('_value') or 0.0)
+    colors = {'2.4G': '#1E3A5F', '5G': '#10B981', '6G/5G': '#3B82F6'}
+    return [
+        BandData(band=band, color=colors.get(band, '#999999'), data=[
+            LoadDataPoint(timestamp=ts, band24G=float(time_map[ts]['band24G']), band5G=float(time_map[ts]['band5G']),
+                          band6G5G=float(time_map[ts]['band6G5G']))
+            for ts in sorted(time_map)
+        ])
+        for band, time_map in bands.items()
+    ]
+
+
+def points_loop(rows: Iterable[Dict[str, Any]]) -> List[TimeSeriesPoint]:
+    items = [
+        TimeSeriesPoint(timestamp=r.get('_time'), value=float(r.get('_value') or 0.0),
+                        zone=str(r.get('zoneName') or r.get('zoneId') or ''))
+        for r in rows if r.get('_field') == 'value'
+    ]
+    items.sort(key=lambda x: x.timestamp)
+    return items
+
+
+def series_loop(rows: Iterable[Dict[str, Any]], columns: List[str]) -> List[ZoneSeries]:
+    zones: dict[str, dict] = {}
+    for r in rows:
+        zid = str(r.get('zoneId') or '')
+        zone = zones.get(zid)
+        if zone is None:
+            zone = zones[zid] = {'name': str(r.get('zoneName') or zid), 'values': {c: {} for c in columns}}
+        column = zone['values'].get(f"{r.get('metric')}.{r.get('agg')}")
+        if column is not None and r.get('_value') is not None:
+            column[r.get('_time')] = float(r.get('_value'))
+    result = []
+    for zid in sorted(zones):
+        values = zones[zid]['values']
+        timestamps = sorted({ts for column in values.values() for ts in column})
+        result.append(ZoneSeries(zoneId=zid, zoneName=zones[zid]['name'], timestamps=timestamps,
+                                 series={c: [values[c].get(ts) for ts in timestamps] for c in columns}))
+    return result
+
+
+def aps_loop(aps: Iterable[Dict[str, Any]], radios: Iterable[Dict[str, Any]]) -> List[AccessPoint]:
+    index: dict[str, dict] = {}
+    for r in aps:
+        rec = index.get(r['apMac'])
+        if rec is None:
+            rec = index[r['apMac']] = {
+                'mac': r['apMac'], 'name': str(r.get('apName')), 'model': r.get('model'), 'status': r.get('status'),
+                'ip': str(r.get('ip')), 'zoneId': r.get('zoneId'), 'zoneName': r.get('zoneName'),
+                'firmwareVersion': '', 'serialNumber': '', 'clientCount': 0, 'channelUtilization': 0,
+                'airtimeUtilization': 0, 'cpuUtilization': 0, 'memoryUtilization': 0, 'radios': {},
+            }
+        field = r.get('_field')
+        if field in ('firmwareVersion', 'serialNumber'):
+            rec[field] = str(r.get('_value'))
+        elif field in rec:
+            rec[field] = int(r.get('_value') or 0)
+    for r in radios:
+        rec = index.get(r.get('apMac'))
+        if rec is not None:
+            radio = rec['radios'].setdefault(r.get('band'), {'band': r.get('band'), 'channel': 0, 'txPower': 0,
+                                                             'noiseFloor': 0, 'clientCount': 0})
+            radio[r.get('_field')] = int(r.get('_value') or 0)
+    return [AccessPoint(**{**rec, 'radios': [Radio(**radio) for radio in rec['radios'].values()]})
+            for rec in index.values()]
+
+
+# ---- driver -----------------------------------------------------------------
+
+def timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    gc.collect()
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def cases(n: int):
+    rows = load_rows(n)
+    data = to_csv(rows)
+    yield 'load', len(rows), lambda: load_loop(dict_rows(data)), lambda: _band_items(LOAD_COLUMNS(stream(data)))
+    rows = point_rows(n)
+    data = to_csv(rows)
+    yield 'time-series', len(rows), lambda: points_loop(dict_rows(data)), lambda: _points(POINT_COLUMNS(stream(data)))
+    rows, columns = series_rows(n)
+    data = to_csv(rows)
+    yield ('time-series/multi', len(rows), lambda: series_loop(dict_rows(data), columns),
+           lambda: _zone_series(SERIES_COLUMNS(stream(data)), columns))
+    aps, radios = ap_rows(n)
+    ap_data, radio_data = to_csv(aps), to_csv(radios)
+    yield ('zones/{id}/aps', len(aps) + len(radios), lambda: aps_loop(dict_rows(ap_data), dict_rows(radio_data)),
+           lambda: _access_points(AP_COLUMNS(stream(ap_data)), RADIO_COLUMNS(stream(radio_data))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', default='10000,100000,1000000', help='comma-separated row counts')
+    args = parser.parse_args()
+
+    print(f"{'route':20s} {'rows':>9s} {'row loop':>10s} {'vectorized':>11s} {'speedup':>8s}")
+    for n in [int(v) for v in args.rows.split(',')]:
+        for name, count, loop, vectorized in cases(n):
+            loop_s, expected = timed(loop)
+            vector_s, actual = timed(vectorized)
+            if [m.model_dump() for m in actual] != [m.model_dump() for m in expected]:
+                raise SystemExit(f'{name}: vectorized output differs from the row loop at {count} rows')
+            print(f'{name:20s} {count:9d} {loop_s * 1000:8.0f}ms {vector_s * 1000:9.0f}ms {loop_s / vector_s:7.1f}x')
+            del expected, actual
+
+
+if __name__ == '__main__':
+    main()
@@ -1,43 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import asyncio
 import random
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Union
 import argparse
 
+import numpy as np
 from influxdb_client import InfluxDBClient, Point
 from influxdb_client.client.write_api import SYNCHRONOUS
 
 from app.config import settings
+from scripts.line_protocol import Schema, escape_string, to_ns
+from scripts.topology import TopologySpec, add_topology_arguments, build_topology, spec_from_args
 
 
-ZONE_NAMES = [
-    'BC83386-P - Dogwood',
-    'CA28283 - Ventana Residences',
-    'FL01313 - Palomar Core MEC',
-    'FL21908-P - Pier Sixty-Six',
-    'FL21966-P - Town Hollywood',
-    'FL28242-P - Serenity Lane',
-    'FL28243-P - Imperial Village',
-    'FL28244-P - Sunpointe Place',
-    'FL28245-P - ParkVillage I and',
-    'FL29325-P - Harbor Cay',
-    'GA29532-P - Signal House',
-    'IL23336-P - Concordia Village',
-    'IL23640-P - Lutheran Hillside',
-    'IL62034-P - Meridian Village',
-    'IN28254-P - EMC2',
-    'MO23626-P - Lenoir Woods',
-    'MO63144-P - Mason Pointe',
-    'MO63304-P - Breeze Park',
-    'MOXXXXX-P - Mason Pointe',
-    'NC29384-P - SAU',
-    'SBA Lab',
-    'Staging Zone',
-    'TN21944-P - Opus East Memphis',
-    'TX29328-P - The Gabriel',
-]
-
 CAUSE_CODE_DESCRIPTIONS: Dict[int, str] = {
     1: 'Unspecified reason',
     2: 'Previous authentication no longer valid',
@@ -53,33 +31,6 @@ CAUSE_CODE_DESCRIPTIONS: Dict[int, str] = {
     47: 'Requested from peer',
 }
 
-VENUE_VALUES: Dict[str, int] = {
-    'BC83386-P - Dogwood': 653,
-    'CA28283 - Ventana Residences': 541,
-    'FL01313 - Palomar Core MEC': 0,
-    'FL21908-P - Pier Sixty-Six': 999,
-    'FL21966-P - Town Hollywood': 2019,
-    'FL28242-P - Serenity Lane': 5,
-    'FL28243-P - Imperial Village': 363,
-    'FL28244-P - Sunpointe Place': 0,
-    'FL28245-P - ParkVillage I and': 2,
-    'FL29325-P - Harbor Cay': 0,
-    'GA29532-P - Signal House': 921,
-    'IL23336-P - Concordia Village': 688,
-    'IL23640-P - Lutheran Hillside': 371,
-    'IL62034-P - Meridian Village': 0,
-    'IN28254-P - EMC2': 23,
-    'MO23626-P - Lenoir Woods': 668,
-    'MO63144-P - Mason Pointe': 0,
-    'MO63304-P - Breeze Park': 402,
-    'MOXXXXX-P - Mason Pointe': 0,
-    'NC29384-P - SAU': 0,
-    'SBA Lab': 0,
-    'Staging Zone': 0,
-    'TN21944-P - Opus East Memphis': 687,
-    'TX29328-P - The Gabriel': 843,
-}
-
 OS_LIST = [
     { 'os': 'iOS', 'percentage': 26.48, 'color': '#8B5CF6' },
     { 'os': 'Android', 'percentage': 18.35, 'color': '#3B82F6' },
@@ -89,218 +40,10 @@ OS_LIST = [
     { 'os': 'Windows', 'percentage': 3.44, 'color': '#6B7280' },
 ]
 
-AP_MODELS = ['R750', 'R850', 'T350', 'T370', 'H550']
-
-
 def rand(min_v: float, max_v: float) -> float:
     return random.random() * (max_v - min_v) + min_v
 
 
-def gen_mac() -> str:
-    chars = '0123456789ABCDEF'
-    return ':'.join(''.join(random.choice(chars) for _ in range(2)) for _ in range(6))
-
-
-def gen_ip(zone_index: int, ap_index: int) -> str:
-    return f"192.168.{(zone_index // 10) + 1}.{ap_index + 100}"
-
-
-def gen_serial() -> str:
-    return ''.join(str(random.randint(0, 9)) for _ in range(10))
-
-
-def gen_fw() -> str:
-    versions = ['6.1.0.0.1234', '6.1.0.0.1235', '6.0.9.0.1200', '6.1.1.0.1240', '6.0.8.0.1199']
-    return random.choice(versions)
-
-
-def generate_zone(name: str, index: int) -> Dict:
-    base_clients = VENUE_VALUES.get(name, int(rand(50, 100)))
-    if base_clients == 0:
-        return {
-            'id': f'zone-{index}',
-            'name': name,
-            'totalAPs': int(rand(10, 50)),
-            'connectedAPs': 0,
-            'disconnectedAPs': int(rand(10, 50)),
-            'clients': 0,
-            'apAvailability': 0.0,
-            'clientsPerAP': 0.0,
-            'experienceScore': 0.0,
-            'utilization': 0.0,
-            'rxDesense': 0.0,
-            'netflixScore': 0.0,
-        }
-
-    total_aps = max(10, int(base_clients / 4) + int(rand(5, 25)))
-    disconnected = int(rand(0, min(3, int(total_aps * 0.05))))
-    connected = total_aps - disconnected
-    clients = base_clients
-    ap_availability = (connected / total_aps) * 100
-    clients_per_ap = clients / connected if connected else 0
-
-    if base_clients > 1500:
-        base_ex = max(20, 40 - (clients_per_ap * 3))
-    elif base_clients > 800:
-        base_ex = max(40, 70 - (clients_per_ap * 4))
-    else:
-        base_ex = max(60, 100 - (clients_per_ap * 5))
-
-    experience = max(0, min(100, base_ex + rand(-5, 5)))
-
-    if base_clients > 1500:
-        utilization = min(99, max(85, clients_per_ap * 20 + rand(5, 15)))
-    elif base_clients > 800:
-        utilization = min(95, max(70, clients_per_ap * 18 + rand(0, 10)))
-    else:
-        utilization = min(95, max(20, clients_per_ap * 15 + rand(-10, 10)))
-
-    rx_desense = rand(2, min(25, clients_per_ap * 3))
-    netflix = max(0, experience - (rx_desense * 2) - (15 if utilization > 70 else 0))
-
-    return {
-        'id': f'zone-{index}',
-        'name': name,
-        'totalAPs': total_aps,
-        'connectedAPs': connected,
-        'disconnectedAPs': disconnected,
-        'clients': clients,
-        'apAvailability': round(ap_availability, 1),
-        'clientsPerAP': float(f"{clients_per_ap:.2f}"),
-        'experienceScore': float(f"{experience:.1f}"),
-        'utilization': float(f"{utilization:.1f}"),
-        'rxDesense': float(f"{rx_desense:.1f}"),
-        'netflixScore': float(f"{netflix:.1f}"),
-    }
-
-
-def generate_venue() -> Dict:
-    zones = [generate_zone(n, i) for i, n in enumerate(ZONE_NAMES)]
-    total_aps = sum(z['totalAPs'] for z in zones)
-    total_clients = sum(z['clients'] for z in zones)
-    avg_ex = sum(z['experienceScore'] for z in zones) / len(zones)
-    sla = len([z for z in zones if z['apAvailability'] >= 95]) / len(zones) * 100
-    return {
-        'name': 'GA29532-P - Signal House',
-        'totalZones': len(zones),
-        'totalAPs': total_aps,
-        'totalClients': total_clients,
-        'avgExperienceScore': float(f"{avg_ex:.1f}"),
-        'slaCompliance': float(f"{sla:.1f}"),
-        'zones': zones,
-    }
-
-
-def generate_ap_data_for_zone(zone: Dict, zone_index: int) -> Dict:
-    ap_count = zone['connectedAPs']
-    ap_list: List[Dict] = []
-    for i in range(ap_count):
-        model = random.choice(AP_MODELS)
-        is_online = i >= zone['disconnectedAPs']
-        clients_5 = int(zone['clients'] * 0.8 / max(1, zone['connectedAPs']))
-        clients_24 = max(0, int(zone['clients'] / max(1, zone['connectedAPs'])) - clients_5)
-        radios = [
-            {
-                'band': '5GHz',
-                'channel': random.choice([36, 40, 44, 48, 149, 153, 157, 161]),
-                'txPower': int(rand(15, 23)),
-                'noiseFloor': int(rand(-100, -80)),
-                'clientCount': max(0, int(clients_5 * rand(0.8, 1.2))),
-            },
-            {
-                'band': '2.4GHz',
-                'channel': random.choice([1, 6, 11]),
-                'txPower': int(rand(12, 20)),
-                'noiseFloor': int(rand(-95, -75)),
-                'clientCount': max(0, int(clients_24 * rand(0.8, 1.2))),
-            },
-        ]
-        ap = {
-            'mac': gen_mac(),
-            'name': f"AP-{zone['name'][:2]}-{str(i + 1).zfill(2)}",
-            'model': model,
-            'status': 'online' if is_online else 'offline',
-            'ip': gen_ip(zone_index, i),
-            'zoneId': zone['id'],
-            'zoneName': zone['name'],
-            'firmwareVersion': gen_fw(),
-            'serialNumber': gen_serial(),
-            'clientCount': int(rand(0, max(1, int(zone['clients'] / max(1, zone['connectedAPs']))))) if is_online else 0,
-            'channelUtilization': int(rand(30, 85)) if is_online else 0,
-            'airtimeUtilization': int(rand(40, 90)) if is_online else 0,
-            'cpuUtilization': int(rand(20, 60)) if is_online else 0,
-            'memoryUtilization': int(rand(40, 75)) if is_online else 0,
-            'radios': radios,
-        }
-        ap_list.append(ap)
-    return { 'total': ap_count, 'list': ap_list }
-
-
-def generate_clients(count: int) -> List[Dict]:
-    ap_list = [
-        { 'name': 'Commons_AP', 'mac': '2C:AB:46:08:B4:10' },
-        { 'name': 'Eastwood_u486', 'mac': '34:15:93:1B:78:42' },
-        { 'name': 'u-C4', 'mac': '34:15:93:1B:5E:8A' },
-        { 'name': 'AL_Room 22', 'mac': 'B0:7C:51:36:0F:92' },
-        { 'name': 'AP144', 'mac': '2C:AB:46:08:9E:11' },
-        { 'name': 'Main_Hall', 'mac': '6A:3D:1C:2F:4E:8D' },
-        { 'name': 'Wing_B', 'mac': '9F:E2:4D:1A:3C:7B' },
-        { 'name': 'Floor_2_North', 'mac': '5C:8A:4E:1F:3D:9A' },
-    ]
-    wlan_list = ['LSS VOICE', 'LSS DATA', 'LSS GUEST']
-
-    def gen_hostname() -> str:
-        types = ['iPhone', 'Samsung', 'DESKTOP-', 'Harry-s-', 'AZULFD']
-        t = random.choice(types)
-        if 'iPhone' in t or 'Samsung' in t:
-            return f"{t}{random.randint(0,9)}"
-        return f"{t}{random.random():.7f}".upper().replace('0.', '')
-
-    def os_from_device(hostname: str) -> str:
-        if 'iPhone' in hostname:
-            return 'iOS'
-        if 'Samsung' in hostname or 'Galaxy' in hostname:
-            return 'Android'
-        if 'DESKTOP-' in hostname:
-            return 'Windows'
-        if 'MacBook' in hostname or 'Mac-' in hostname:
-            return 'macOS'
-        if 'Surface' in hostname or 'ThinkPad' in hostname:
-            return 'Windows'
-        if 'Chromebook' in hostname:
-            return 'Chrome OS'
-        return 'Unknown'
-
-    clients: List[Dict] = []
-    for _ in range(count):
-        hostname = gen_hostname()
-        ap = random.choice(ap_list)
-        wlan = random.choice(wlan_list)
-        os_name = os_from_device(hostname)
-        clients.append({
-            'hostname': hostname,
-            'modelName': 'Unknown',
-            'ipAddress': f"10.{random.randint(160,162)}.{random.randint(15,24)}.{random.randint(100,199)} /::",
-            'macAddress': gen_mac(),
-            'wlan': wlan,
-            'apName': ap['name'],
-            'apMac': ap['mac'],
-            'dataUsage': rand(100, 2000),
-            'os': os_name,
-            'deviceType': 'phone' if ('iPhone' in hostname or 'Samsung' in hostname) else 'laptop',
-        })
-    clients.sort(key=lambda c: c['dataUsage'], reverse=True)
-    return clients
-
-
-def generate_host_usage(count: int = 10) -> List[Dict]:
-    hosts: List[Dict] = []
-    for _ in range(count):
-        hosts.append({ 'hostname': f"HOST-{random.randint(1000,9999)}", 'dataUsage': rand(200, 1500) })
-    hosts.sort(key=lambda h: h['dataUsage'], reverse=True)
-    return hosts
-
-
 def generate_load_points(hours: int = 1) -> List[Dict]:
     data: List[Dict] = []
     start_time = datetime.utcnow() - timedelta(hours=hours)
@@ -320,120 +63,239 @@ def generate_load_points(hours: int = 1) -> List[Dict]:
     return data
 
 
-def write_points(client: InfluxDBClient, points: List[Point], *, org: str, bucket: str):
+def venue_point(venue: Dict, venue_id: str, ts: datetime) -> Point:
+    return (
+        Point('venue_metrics')
+            .tag('venueId', venue_id)
+            .field('totalZones', venue['totalZones'])
+            .field('totalAPs', venue['totalAPs'])
+            .field('totalClients', venue['totalClients'])
+            .field('avgExperienceScore', venue['avgExperienceScore'])
+            .field('slaCompliance', venue['slaCompliance'])
+            .time(ts)
+    )
+
+
+def zone_point(z: Dict, venue_id: str, ts: datetime) -> Point:
+    return (
+        Point('zone_metrics')
+            .tag('zoneId', z['id'])
+            .tag('zoneName', z['name'])
+            .tag('venueId', venue_id)
+            .field('totalAPs', z['totalAPs'])
+            .field('connectedAPs', z['connectedAPs'])
+            .field('disconnectedAPs', z['disconnectedAPs'])
+            .field('clients', z['clients'])
+            .field('apAvailability', z['apAvailability'])
+            .field('clientsPerAP', z['clientsPerAP'])
+            .field('experienceScore', z['experienceScore'])
+            .field('utilization', z['utilization'])
+            .field('rxDesense', z['rxDesense'])
+            .field('netflixScore', z['netflixScore'])
+            .time(ts)
+    )
+
+
+def ap_point(ap: Dict, venue_id: str, ts: datetime) -> Point:
+    return (
+        Point('ap_metrics')
+            .tag('venueId', venue_id)
+            .tag('apMac', ap['mac'])
+            .tag('apName', ap['name'])
+            .tag('model', ap['model'])
+            .tag('zoneId', ap['zoneId'])
+            .tag('zoneName', ap['zoneName'])
+            .tag('status', ap['status'])
+            .tag('ip', ap['ip'])
+            .field('clientCount', ap['clientCount'])
+            .field('channelUtilization', ap['channelUtilization'])
+            .field('airtimeUtilization', ap['airtimeUtilization'])
+            .field('cpuUtilization', ap['cpuUtilization'])
+            .field('memoryUtilization', ap['memoryUtilization'])
+            .field('firmwareVersion', ap['firmwareVersion'])
+            .field('serialNumber', ap['serialNumber'])
+            .time(ts)
+    )
+
+
+def radio_point(ap: Dict, radio: Dict, venue_id: str, ts: datetime) -> Point:
+    return (
+        Point('radio_metrics')
+            .tag('venueId', venue_id)
+            .tag('apMac', ap['mac'])
+            .tag('zoneId', ap['zoneId'])
+            .tag('band', radio['band'])
+            .field('channel', radio['channel'])
+            .field('txPower', radio['txPower'])
+            .field('noiseFloor', radio['noiseFloor'])
+            .field('clientCount', radio['clientCount'])
+            .time(ts)
+    )
+
+
+def client_point(client_row: Dict, venue_id: str, ts: datetime) -> Point:
+    return (
+        Point('client_metrics')
+            .tag('venueId', venue_id)
+            .tag('macAddress', client_row['macAddress'])
+            .tag('apMac', client_row['apMac'])
+            .tag('apName', client_row['apName'])
+            .tag('zoneId', client_row['zoneId'])
+            .tag('wlan', client_row['wlan'])
+            .tag('os', client_row['os'])
+            .tag('deviceType', client_row['deviceType'])
+            .field('hostname', client_row['hostname'])
+            .field('modelName', client_row['modelName'])
+            .field('ipAddress', client_row['ipAddress'])
+            .field('dataUsage', float(f"{client_row['dataUsage']:.1f}"))
+            .time(ts)
+    )
+
+
+VENUE_SCHEMA = Schema('venue_metrics', [
+    ('totalZones', 'i'), ('totalAPs', 'i'), ('totalClients', 'i'), ('avgExperienceScore', 'f'), ('slaCompliance', 'f'),
+])
+ZONE_SCHEMA = Schema('zone_metrics', [
+    ('totalAPs', 'i'), ('connectedAPs', 'i'), ('disconnectedAPs', 'i'), ('clients', 'i'),
+    ('apAvailability', 'f'), ('clientsPerAP', 'f'),
+    ('experienceScore', '.1f'), ('utilization', '.1f'), ('rxDesense', '.1f'), ('netflixScore', '.1f'),
+])
+AP_SCHEMA = Schema('ap_metrics', [
+    ('clientCount', 'i'), ('channelUtilization', 'i'), ('airtimeUtilization', 'i'), ('cpuUtilization', 'i'),
+    ('memoryUtilization', 'i'), ('firmwareVersion', 's'), ('serialNumber', 's'),
+])
+RADIO_SCHEMA = Schema('radio_metrics', [('channel', 'i'), ('txPower', 'i'), ('noiseFloor', 'i'), ('clientCount', 'i')])
+CLIENT_SCHEMA = Schema('client_metrics', [('hostname', 's'), ('modelName', 's'), ('ipAddress', 's'), ('dataUsage', '.1f')])
+
+# Metrics that drift between frames in live mode
+ZONE_DRIFT = ('experienceScore', 'utilization', 'rxDesense', 'netflixScore')
+AP_DRIFT = ('channelUtilization', 'airtimeUtilization', 'cpuUtilization', 'memoryUtilization')
+
+
+class TopologyFrames:
+    """Line protocol for every venue, zone, AP, radio and client series of a fixed topology.
+
+    Series keys (escaped tags) and string fields are encoded once. A frame
+    stamps every series with one timestamp; with ``drift`` the zone scores,
+    AP utilization, radio noise floor and client usage are jittered around
+    their base values with NumPy, and each measurement is formatted with
+    one template. Lines match the ``*_point`` builders above.
+    """
+
+    def __init__(self, venue: Dict, aps: List[Dict], clients: List[Dict], venue_id: str, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+        zones = venue['zones']
+        radios = [(ap, radio) for ap in aps for radio in ap['radios']]
+
+        self.venue_key = VENUE_SCHEMA.series_key({'venueId': venue_id})
+        self.venue_columns = {name: [venue[name]] for name in VENUE_SCHEMA.names}
+
+        self.zone_keys = [
+            ZONE_SCHEMA.series_key({'zoneId': z['id'], 'zoneName': z['name'], 'venueId': venue_id}) for z in zones
+        ]
+        self.zone_columns = {name: [z[name] for z in zones] for name in ZONE_SCHEMA.names}
+        self.zone_base = np.array([self.zone_columns[name] for name in ZONE_DRIFT], dtype=np.float64).reshape(len(ZONE_DRIFT), -1)
+
+        self.ap_keys = [
+            AP_SCHEMA.series_key({
+                'venueId': venue_id, 'apMac': ap['mac'], 'apName': ap['name'], 'model': ap['model'],
+                'zoneId': ap['zoneId'], 'zoneName': ap['zoneName'], 'status': ap['status'], 'ip': ap['ip'],
+            })
+            for ap in aps
+        ]
+        self.ap_columns = {
+            name: [escape_string(ap[name]) if kind == 's' else ap[name] for ap in aps]
+            for name, kind in AP_SCHEMA.fields
+        }
+        self.ap_base = np.array([self.ap_columns[name] for name in AP_DRIFT], dtype=np.float64).reshape(len(AP_DRIFT), -1)
+
+        self.radio_keys = [
+            RADIO_SCHEMA.series_key({'venueId': venue_id, 'apMac': ap['mac'], 'zoneId': ap['zoneId'], 'band': radio['band']})
+            for ap, radio in radios
+        ]
+        self.radio_columns = {name: [radio[name] for _, radio in radios] for name in RADIO_SCHEMA.names}
+        self.radio_noise = np.array(self.radio_columns['noiseFloor'], dtype=np.float64)
+
+        self.client_keys = [
+            CLIENT_SCHEMA.series_key({
+                'venueId': venue_id, 'macAddress': c['macAddress'], 'apMac': c['apMac'], 'apName': c['apName'],
+                'zoneId': c['zoneId'], 'wlan': c['wlan'], 'os': c['os'], 'deviceType': c['deviceType'],
+            })
+            for c in clients
+        ]
+        self.client_columns = {
+            name: [escape_string(c[name]) if kind == 's' else c[name] for c in clients]
+            for name, kind in CLIENT_SCHEMA.fields
+        }
+        self.client_usage = np.array(self.client_columns['dataUsage'], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return 1 + len(self.zone_keys) + len(self.ap_keys) + len(self.radio_keys) + len(self.client_keys)
+
+    def _jitter(self, base: np.ndarray, spread, lo: float, hi: float = np.inf) -> np.ndarray:
+        return np.clip(base + self.rng.uniform(-1.0, 1.0, base.shape) * spread, lo, hi)
+
+    def frame(self, ts: datetime, drift: bool = True) -> List[str]:
+        """One line per series, all at ``ts``."""
+        ts_ns = to_ns(ts)
+        zone_columns, ap_columns = self.zone_columns, self.ap_columns
+        radio_columns, client_columns = self.radio_columns, self.client_columns
+        if drift:
+            zones = np.where(self.zone_base != 0, np.round(self._jitter(self.zone_base, 2.0, 0.0, 100.0), 1), 0.0)
+            zone_columns = dict(zone_columns, **dict(zip(ZONE_DRIFT, zones.tolist())))
+            aps = np.where(self.ap_base != 0, self._jitter(self.ap_base, 5.0, 0.0, 100.0).astype(np.int64), 0)
+            ap_columns = dict(ap_columns, **dict(zip(AP_DRIFT, aps.tolist())))
+            noise = self._jitter(self.radio_noise, 2.0, -110.0, -60.0).astype(np.int64)
+            radio_columns = dict(radio_columns, noiseFloor=noise.tolist())
+            usage = self._jitter(self.client_usage, self.client_usage * 0.1, 0.0)
+            client_columns = dict(client_columns, dataUsage=usage.tolist())
+        return (
+            VENUE_SCHEMA.lines([self.venue_key], self.venue_columns, ts_ns)
+            + ZONE_SCHEMA.lines(self.zone_keys, zone_columns, ts_ns)
+            + AP_SCHEMA.lines(self.ap_keys, ap_columns, ts_ns)
+            + RADIO_SCHEMA.lines(self.radio_keys, radio_columns, ts_ns)
+            + CLIENT_SCHEMA.lines(self.client_keys, client_columns, ts_ns)
+        )
+
+
+def write_points(client: InfluxDBClient, records: List[Union[str, Point]], *, org: str, bucket: str):
+    """Write ``Point`` objects and/or pre-encoded line-protocol strings."""
     write_api = client.write_api(write_options=SYNCHRONOUS)
-    if points:
-        write_api.write(bucket=bucket, org=org, record=points)
+    if records:
+        write_api.write(bucket=bucket, org=org, record=records)
 
 
 def seed_influx(
     hours: int = 1,
-    client_count: int = 100,
+    spec: TopologySpec = TopologySpec(),
     *,
     url: Optional[str] = None,
     token: Optional[str] = None,
     org: Optional[str] = None,
     bucket: Optional[str] = None,
+    venue_id: str = 'main-venue',
+    gzip: bool = True,
 ):
     url = url or settings.influxdb_url
     token = token or settings.influxdb_token
     org = org or settings.influxdb_org
     bucket = bucket or settings.influxdb_bucket
 
-    client = InfluxDBClient(url=url, token=token, org=org)
+    client = InfluxDBClient(url=url, token=token, org=org, enable_gzip=gzip)
     points: List[Point] = []
+    # metrics outside the topology (cause codes, anomalies, load, time series) draw from the same seed
+    random.seed(spec.seed)
 
-    venue = generate_venue()
-
-    # Venue metrics
-    points.append(
-        Point('venue_metrics')
-            .tag('venueId', 'main-venue')
-            .field('totalZones', venue['totalZones'])
-            .field('totalAPs', venue['totalAPs'])
-            .field('totalClients', venue['totalClients'])
-            .field('avgExperienceScore', venue['avgExperienceScore'])
-            .field('slaCompliance', venue['slaCompliance'])
-            .time(datetime.utcnow())
-    )
-
-    # Zone metrics
-    for z in venue['zones']:
-        points.append(
-            Point('zone_metrics')
-                .tag('zoneId', z['id'])
-                .tag('zoneName', z['name'])
-                .tag('venueId', 'main-venue')
-                .field('totalAPs', z['totalAPs'])
-                .field('connectedAPs', z['connectedAPs'])
-                .field('disconnectedAPs', z['disconnectedAPs'])
-                .field('clients', z['clients'])
-                .field('apAvailability', z['apAvailability'])
-                .field('clientsPerAP', z['clientsPerAP'])
-                .field('experienceScore', z['experienceScore'])
-                .field('utilization', z['utilization'])
-                .field('rxDesense', z['rxDesense'])
-                .field('netflixScore', z['netflixScore'])
-                .time(datetime.utcnow())
-        )
-
-    # AP + Radio metrics per zone
-    for idx, z in enumerate(venue['zones']):
-        ap_bundle = generate_ap_data_for_zone(z, idx)
-        for ap in ap_bundle['list']:
-            points.append(
-                Point('ap_metrics')
-                    .tag('apMac', ap['mac'])
-                    .tag('apName', ap['name'])
-                    .tag('model', ap['model'])
-                    .tag('zoneId', ap['zoneId'])
-                    .tag('zoneName', ap['zoneName'])
-                    .tag('status', ap['status'])
-                    .tag('ip', ap['ip'])
-                    .field('clientCount', ap['clientCount'])
-                    .field('channelUtilization', ap['channelUtilization'])
-                    .field('airtimeUtilization', ap['airtimeUtilization'])
-                    .field('cpuUtilization', ap['cpuUtilization'])
-                    .field('memoryUtilization', ap['memoryUtilization'])
-                    .field('firmwareVersion', ap['firmwareVersion'])
-                    .field('serialNumber', ap['serialNumber'])
-                    .time(datetime.utcnow())
-            )
-            for radio in ap['radios']:
-                points.append(
-                    Point('radio_metrics')
-                        .tag('apMac', ap['mac'])
-                        .tag('zoneId', ap['zoneId'])
-                        .tag('band', radio['band'])
-                        .field('channel', radio['channel'])
-                        .field('txPower', radio['txPower'])
-                        .field('noiseFloor', radio['noiseFloor'])
-                        .field('clientCount', radio['clientCount'])
-                        .time(datetime.utcnow())
-                )
-
-    # Client metrics
-    for client_row in generate_clients(client_count):
-        points.append(
-            Point('client_metrics')
-                .tag('macAddress', client_row['macAddress'])
-                .tag('apMac', client_row['apMac'])
-                .tag('apName', client_row['apName'])
-                .tag('zoneId', 'zone-001')
-                .tag('wlan', client_row['wlan'])
-                .tag('os', client_row['os'])
-                .tag('deviceType', client_row['deviceType'])
-                .field('hostname', client_row['hostname'])
-                .field('modelName', client_row['modelName'])
-                .field('ipAddress', client_row['ipAddress'])
-                .field('dataUsage', float(f"{client_row['dataUsage']:.1f}"))
-                .time(datetime.utcnow())
-        )
+    # Venue, zone, AP, radio and client metrics as pre-encoded line protocol
+    topology = build_topology(spec)
+    venue = topology.venue
+    lines = TopologyFrames(venue, topology.aps, topology.clients, venue_id).frame(datetime.utcnow(), drift=False)
 
     # Host usage
-    for host in generate_host_usage(10):
+    for host in topology.hosts:
         points.append(
             Point('host_usage')
+                .tag('venueId', venue_id)
                 .tag('hostname', host['hostname'])
                 .field('dataUsage', float(f"{host['dataUsage']:.1f}"))
                 .time(datetime.utcnow())
@@ -443,6 +305,7 @@ def seed_influx(
     for item in OS_LIST:
         points.append(
             Point('os_distribution')
+                .tag('venueId', venue_id)
                 .tag('os', item['os'])
                 .field('percentage', item['percentage'])
                 .field('color', item['color'])
@@ -457,6 +320,7 @@ def seed_influx(
         impact = rand(70, 95) if code == 25 else rand(20, 60)
         points.append(
             Point('disconnect_codes')
+                .tag('venueId', venue_id)
                 .tag('code', str(code))
                 .tag('zoneId', 'zone-001')
                 .field('description', desc)
@@ -471,6 +335,7 @@ def seed_influx(
         if z['clientsPerAP'] > 4:
             points.append(
                 Point('anomalies')
+                    .tag('venueId', venue_id)
                     .tag('anomalyId', f"anomaly-{i}-1")
                     .tag('type', 'high_client_density')
                     .tag('severity', 'critical' if z['clientsPerAP'] > 5 else 'major')
@@ -484,6 +349,7 @@ def seed_influx(
         if z['rxDesense'] > 10:
             points.append(
                 Point('anomalies')
+                    .tag('venueId', venue_id)
                     .tag('anomalyId', f"anomaly-{i}-2")
                     .tag('type', 'interference')
                     .tag('severity', 'warning')
@@ -497,6 +363,7 @@ def seed_influx(
         if z['experienceScore'] < 70:
             points.append(
                 Point('anomalies')
+                    .tag('venueId', venue_id)
                     .tag('anomalyId', f"anomaly-{i}-3")
                     .tag('type', 'poor_experience')
                     .tag('severity', 'critical')
@@ -512,9 +379,9 @@ def seed_influx(
     load_points = generate_load_points(hours)
     for lp in load_points:
         ts = lp['timestamp']
-        points.append(Point('band_load').tag('band', '2.4G').field('band24G', lp['band24G']).field('band5G', 0.0).field('band6G5G', 0.0).time(ts))
-        points.append(Point('band_load').tag('band', '5G').field('band24G', 0.0).field('band5G', lp['band5G']).field('band6G5G', 0.0).time(ts))
-        points.append(Point('band_load').tag('band', '6G/5G').field('band24G', 0.0).field('band5G', 0.0).field('band6G5G', lp['band6G5G']).time(ts))
+        points.append(Point('band_load').tag('venueId', venue_id).tag('band', '2.4G').field('band24G', lp['band24G']).field('band5G', 0.0).field('band6G5G', 0.0).time(ts))
+        points.append(Point('band_load').tag('venueId', venue_id).tag('band', '5G').field('band24G', 0.0).field('band5G', lp['band5G']).field('band6G5G', 0.0).time(ts))
+        points.append(Point('band_load').tag('venueId', venue_id).tag('band', '6G/5G').field('band24G', 0.0).field('band5G', 0.0).field('band6G5G', lp['band6G5G']).time(ts))
 
     # Time series metrics (experienceScore) per zone hourly for hours
     for z in venue['zones']:
@@ -523,6 +390,7 @@ def seed_influx(
             value = max(0.0, z['experienceScore'] + rand(-5, 5))
             points.append(
                 Point('metrics')
+                    .tag('venueId', venue_id)
                     .tag('metric', 'experienceScore')
                     .tag('zoneId', z['id'])
                     .tag('zoneName', z['name'])
@@ -531,33 +399,160 @@ def seed_influx(
             )
 
     # Write all points
-    write_points(client, points, org=org, bucket=bucket)
+    write_points(client, ['\n'.join(lines)] + points, org=org, bucket=bucket)
     client.close()
 
 
+async def run_live(
+    rate: float,
+    batch_size: int,
+    concurrency: int,
+    duration: float,
+    report_interval: float,
+    spec: TopologySpec = TopologySpec(),
+    *,
+    url: Optional[str] = None,
+    token: Optional[str] = None,
+    org: Optional[str] = None,
+    bucket: Optional[str] = None,
+    venue_id: str = 'main-venue',
+    gzip: bool = True,
+) -> Dict[str, float]:
+    """Write drifting metrics of a fixed topology at ``rate`` points/s until ``duration`` (0: forever).
+
+    A producer encodes whole frames (every series at one timestamp) to line
+    protocol, cuts them into batches stamped with their scheduled time and
+    hands them to ``concurrency`` writers (blocking writes run in threads,
+    gzip-compressed unless ``gzip`` is off). Lag is how far behind its
+    schedule a batch was when its write completed; it grows when Influx
+    cannot absorb the target rate.
+    """
+    org = org or settings.influxdb_org
+    bucket = bucket or settings.influxdb_bucket
+    client = InfluxDBClient(
+        url=url or settings.influxdb_url, token=token or settings.influxdb_token, org=org, enable_gzip=gzip
+    )
+    write_api = client.write_api(write_options=SYNCHRONOUS)
+    topology = build_topology(spec)
+    frames = TopologyFrames(topology.venue, topology.aps, topology.clients, venue_id, seed=spec.seed)
+    pending: List[str] = []
+    batches: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    stats = {'written': 0, 'errors': 0, 'lag_sum': 0.0, 'lag_max': 0.0, 'batches': 0}
+    started = time.monotonic()
+
+    async def produce() -> None:
+        produced = 0
+        while not duration or time.monotonic() - started < duration:
+            size = batch_size
+            due = started + (produced + size) / rate
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            while len(pending) < size:
+                pending.extend(frames.frame(datetime.utcnow()))
+            await batches.put((due, size, '\n'.join(pending[:size])))
+            del pending[:size]
+            produced += size
+        for _ in range(concurrency):
+            await batches.put(None)
+
+    async def write() -> None:
+        while True:
+            item = await batches.get()
+            if item is None:
+                return
+            due, size, payload = item
+            try:
+                await asyncio.to_thread(write_api.write, bucket=bucket, org=org, record=payload)
+                stats['written'] += size
+            except Exception as e:
+                if not stats['errors']:
+                    print(f"Write failed: {e}")
+                stats['errors'] += 1
+            lag = max(0.0, time.monotonic() - due)
+            stats['lag_sum'] += lag
+            stats['lag_max'] = max(stats['lag_max'], lag)
+            stats['batches'] += 1
+
+    async def report() -> None:
+        last_written, last_time = 0, started
+        while True:
+            await asyncio.sleep(report_interval)
+            now = time.monotonic()
+            lag = stats['lag_sum'] / stats['batches'] if stats['batches'] else 0.0
+            print(
+                f"[{now - started:7.1f}s] {(stats['written'] - last_written) / (now - last_time):9.0f} pts/s "
+                f"(target {rate:.0f})  written={stats['written']}  lag avg={lag:.2f}s max={stats['lag_max']:.2f}s  "
+                f"queued={batches.qsize()}  errors={stats['errors']}"
+            )
+            last_written, last_time = stats['written'], now
+            stats['lag_sum'], stats['lag_max'], stats['batches'] = 0.0, 0.0, 0
+
+    print(f"Live mode: {len(frames)} series, target {rate:.0f} pts/s in batches of {batch_size}, {concurrency} writers")
+    reporter = asyncio.create_task(report())
+    try:
+        await asyncio.gather(produce(), *(write() for _ in range(concurrency)))
+    finally:
+        reporter.cancel()
+        client.close()
+    elapsed = time.monotonic() - started
+    summary = {'written': stats['written'], 'seconds': elapsed, 'rate': stats['written'] / elapsed, 'errors': stats['errors']}
+    print(f"Wrote {summary['written']} points in {elapsed:.1f}s ({summary['rate']:.0f} pts/s), {summary['errors']} failed batches")
+    return summary
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Seed InfluxDB with demo data')
     parser.add_argument('--hours', type=int, default=1, help='Hours of time-series data to generate')
-    parser.add_argument('--clients', type=int, default=120, help='Number of client records to generate')
     parser.add_argument('--url', type=str, default=None, help='InfluxDB URL (overrides default)')
     parser.add_argument('--org', type=str, default=None, help='InfluxDB org (overrides default)')
     parser.add_argument('--bucket', type=str, default=None, help='InfluxDB bucket (overrides default)')
     parser.add_argument('--token', type=str, default=None, help='InfluxDB token (overrides default)')
+    parser.add_argument('--venue-id', type=str, default='main-venue', help='venueId tag written on every point')
+    parser.add_argument('--live', action='store_true', help='Keep writing drifting metrics instead of seeding once')
+    parser.add_argument('--rate', type=float, default=5000, help='Live mode: target points per second')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Live mode: points per write')
+    parser.add_argument('--concurrency', type=int, default=4, help='Live mode: concurrent writes')
+    parser.add_argument('--duration', type=float, default=0, help='Live mode: seconds to run (0 = until interrupted)')
+    parser.add_argument('--report-interval', type=float, default=5, help='Live mode: seconds between throughput reports')
+    parser.add_argument('--no-gzip', action='store_true', help='Send writes uncompressed')
+    add_topology_arguments(parser)
     args = parser.parse_args()
-
-    random.seed()
-    print(f"Seeding InfluxDB -> url={args.url or settings.influxdb_url}, org={args.org or settings.influxdb_org}, bucket={args.bucket or settings.influxdb_bucket}")
-    try:
-        seed_influx(
-            hours=max(1, args.hours),
-            client_count=max(1, args.clients),
-            url=args.url,
-            token=args.token,
-            org=args.org,
-            bucket=args.bucket,
-        )
-        print('Seeding completed successfully.')
-    except Exception as e:
-        print(f"Seeding failed: {e}")
-        raise
-
+    spec = spec_from_args(args)
+
+    if args.live:
+        print(f"Live writes -> url={args.url or settings.influxdb_url}, org={args.org or settings.influxdb_org}, bucket={args.bucket or settings.influxdb_bucket}")
+        try:
+            asyncio.run(run_live(
+                rate=max(1.0, args.rate),
+                batch_size=max(1, args.batch_size),
+                concurrency=max(1, args.concurrency),
+                duration=max(0.0, args.duration),
+                report_interval=max(0.5, args.report_interval),
+                spec=spec,
+                url=args.url,
+                token=args.token,
+                org=args.org,
+                bucket=args.bucket,
+                venue_id=args.venue_id,
+                gzip=not args.no_gzip,
+            ))
+        except KeyboardInterrupt:
+            print('Stopped.')
+    else:
+        print(f"Seeding InfluxDB -> url={args.url or settings.influxdb_url}, org={args.org or settings.influxdb_org}, bucket={args.bucket or settings.influxdb_bucket}")
+        try:
+            seed_influx(
+                hours=max(1, args.hours),
+                spec=spec,
+                url=args.url,
+                token=args.token,
+                org=args.org,
+                bucket=args.bucket,
+                venue_id=args.venue_id,
+                gzip=not args.no_gzip,
+            )
+            print('Seeding completed successfully.')
+        except Exception as e:
+            print(f"Seeding failed: {e}")
+            raise
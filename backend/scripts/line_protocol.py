@@ -0,0 +1,72 @@
+"""Fast line-protocol encoding for fixed measurement schemas.
+
+``influxdb_client.Point`` escapes every tag and formats every field per point.
+For the generator's fixed schemas the series key (measurement plus escaped,
+sorted tags) is built once per series and reused for every timestamp, and a
+measurement's lines are produced by one ``%`` template over value columns
+(NumPy arrays converted with ``tolist()``).
+
+Output follows ``Point.to_line_protocol()``: tags and fields sorted by key,
+empty tags omitted, nanosecond timestamps. Floats keep a trailing ``.0``.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import repeat
+from typing import Any, Dict, List, Sequence, Tuple
+
+_ESCAPE_MEASUREMENT = str.maketrans({',': r'\,', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_KEY = str.maketrans({
+    ',': r'\,', ' ': r'\ ', '=': r'\=', '\n': r'\n', '\t': r'\t', '\r': r'\r',
+})
+_ESCAPE_STRING = str.maketrans({'"': r'\"', '\\': '\\\\'})
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# field kind -> value format; "s" values must already be escaped (see escape_string)
+FIELD_FORMATS = {'i': '%di', 'f': '%r', '.1f': '%.1f', '.2f': '%.2f', 's': '"%s"'}
+
+
+def escape_tag(value: Any) -> str:
+    escaped = str(value).translate(_ESCAPE_KEY)
+    return escaped + ' ' if escaped.endswith('\\') else escaped
+
+
+def escape_string(value: Any) -> str:
+    return str(value).translate(_ESCAPE_STRING)
+
+
+def to_ns(ts: datetime) -> int:
+    """Nanoseconds since the epoch; naive datetimes are UTC (as in ``Point``)."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = ts - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+class Schema:
+    """One measurement with a fixed set of typed fields.
+
+    ``fields`` are ``(name, kind)`` pairs with kind ``i`` (integer), ``f``
+    (float, shortest repr), ``.1f``/``.2f`` (float rounded on output) or
+    ``s`` (pre-escaped string).
+    """
+
+    def __init__(self, measurement: str, fields: Sequence[Tuple[str, str]]):
+        self.measurement = measurement.translate(_ESCAPE_MEASUREMENT)
+        self.fields = sorted(fields)
+        self.names = [name for name, _ in self.fields]
+        self.template = '%s ' + ','.join(
+            f'{name.translate(_ESCAPE_KEY)}={FIELD_FORMATS[kind]}' for name, kind in self.fields
+        ) + ' %d'
+
+    def series_key(self, tags: Dict[str, Any]) -> str:
+        """Measurement and escaped tags, sorted by key; built once per series."""
+        return self.measurement + ''.join(
+            f',{escape_tag(k)}={escape_tag(v)}' for k, v in sorted(tags.items()) if v is not None and v != ''
+        )
+
+    def lines(self, keys: Sequence[str], columns: Dict[str, Sequence[Any]], ts_ns: int) -> List[str]:
+        """One line per series key; ``columns`` maps each field name to values aligned with ``keys``."""
+        template = self.template
+        return [template % row for row in zip(keys, *(columns[name] for name in self.names), repeat(ts_ns))]
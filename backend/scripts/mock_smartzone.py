@@ -0,0 +1,148 @@
+"""Local mock of the SmartZone public API for exercising the collector.
+
+Run:  python -m scripts.mock_smartzone --zones 20 --aps 30 --clients 10
+Then: SMARTZONE_URL=http://localhost:8443/wsg/api/public/v9_1 python -m app.collector --once
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import uuid
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException, Query, Body
+
+PREFIX = '/wsg/api/public/v9_1'
+
+app = FastAPI(title='Mock SmartZone')
+state: Dict[str, object] = {'tickets': set(), 'zones': [], 'aps': {}, 'clients': {}, 'drift': 0.1}
+
+
+def gen_mac(rng: random.Random) -> str:
+    return ':'.join(f"{rng.randint(0, 255):02X}" for _ in range(6))
+
+
+def build_topology(zones: int, aps: int, clients: int, seed: int) -> None:
+    rng = random.Random(seed)
+    state['zones'] = [{'id': f'zone-{i}', 'name': f'Mock Zone {i}'} for i in range(zones)]
+    for z in state['zones']:
+        ap_list: List[Dict] = []
+        client_list: List[Dict] = []
+        for a in range(aps):
+            mac = gen_mac(rng)
+            ap_list.append({
+                'apMac': mac,
+                'deviceName': f"AP-{z['id']}-{a:03d}",
+                'model': rng.choice(['R750', 'R850', 'T350']),
+                'status': 'Online' if rng.random() > 0.03 else 'Offline',
+                'ip': f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                'zoneId': z['id'],
+                'zoneName': z['name'],
+                'numClients': clients,
+                'channelUtilization': rng.randint(20, 80),
+                'airtime': rng.randint(30, 90),
+                'cpuPercentage': rng.randint(10, 60),
+                'memoryPercentage': rng.randint(30, 70),
+                'firmwareVersion': '6.1.0.0.1234',
+                'serial': str(rng.randint(10**9, 10**10 - 1)),
+                'radios': [
+                    {'band': '5GHz', 'channel': rng.choice([36, 40, 44, 48, 149]), 'txPower': 20,
+                     'noiseFloor': rng.randint(-100, -85), 'numClients': int(clients * 0.8)},
+                    {'band': '2.4GHz', 'channel': rng.choice([1, 6, 11]), 'txPower': 17,
+                     'noiseFloor': rng.randint(-95, -80), 'numClients': clients - int(clients * 0.8)},
+                ],
+            })
+            for _ in range(clients):
+                client_list.append({
+                    'clientMac': gen_mac(rng),
+                    'hostname': f"host-{rng.randint(1000, 9999)}",
+                    'modelName': 'Unknown',
+                    'ipAddress': f"172.16.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                    'ssid': rng.choice(['LSS VOICE', 'LSS DATA', 'LSS GUEST']),
+                    'apMac': mac,
+                    'apName': ap_list[-1]['deviceName'],
+                    'osType': rng.choice(['iOS', 'Android', 'Windows', 'macOS']),
+                    'deviceType': rng.choice(['phone', 'laptop', 'tablet']),
+                    'rxBytes': rng.randint(10**6, 10**9),
+                    'txBytes': rng.randint(10**6, 10**9),
+                })
+        state['aps'][z['id']] = ap_list
+        state['clients'][z['id']] = client_list
+
+
+def drift(items: List[Dict], keys: List[str]) -> None:
+    """Change a fraction of entities so the collector sees realistic deltas."""
+    for item in items:
+        if random.random() < state['drift']:
+            key = random.choice(keys)
+            if key in ('rxBytes', 'txBytes'):
+                item[key] += random.randint(0, 10**6)
+            else:
+                item[key] = max(0, min(100, item[key] + random.randint(-5, 5)))
+
+
+def check_ticket(ticket: str) -> None:
+    if ticket not in state['tickets']:
+        raise HTTPException(status_code=401, detail='Invalid service ticket')
+
+
+def page(items: List[Dict], limit: int, page_no: int) -> Dict:
+    start = (page_no - 1) * limit
+    chunk = items[start:start + limit]
+    return {'totalCount': len(items), 'hasMore': start + limit < len(items), 'list': chunk}
+
+
+@app.post(f'{PREFIX}/serviceTicket')
+async def service_ticket(body: Dict = Body(...)):
+    ticket = uuid.uuid4().hex
+    state['tickets'].add(ticket)
+    return {'serviceTicket': ticket}
+
+
+@app.get(f'{PREFIX}/rkszones')
+async def rkszones(serviceTicket: str = Query(...), index: int = 0, listSize: int = 100):
+    check_ticket(serviceTicket)
+    zones = state['zones']
+    return {'totalCount': len(zones), 'hasMore': index + listSize < len(zones), 'list': zones[index:index + listSize]}
+
+
+def zone_filter(body: Dict) -> str:
+    for f in body.get('filters') or []:
+        if f.get('type') == 'ZONE':
+            return f.get('value')
+    raise HTTPException(status_code=400, detail='ZONE filter required')
+
+
+@app.post(f'{PREFIX}/query/ap')
+async def query_ap(serviceTicket: str = Query(...), body: Dict = Body(...)):
+    check_ticket(serviceTicket)
+    aps = state['aps'].get(zone_filter(body), [])
+    if body.get('page', 1) == 1:
+        drift(aps, ['channelUtilization', 'airtime', 'cpuPercentage', 'memoryPercentage'])
+    return page(aps, int(body.get('limit', 100)), int(body.get('page', 1)))
+
+
+@app.post(f'{PREFIX}/query/client')
+async def query_client(serviceTicket: str = Query(...), body: Dict = Body(...)):
+    check_ticket(serviceTicket)
+    clients = state['clients'].get(zone_filter(body), [])
+    if body.get('page', 1) == 1:
+        drift(clients, ['rxBytes', 'txBytes'])
+    return page(clients, int(body.get('limit', 100)), int(body.get('page', 1)))
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='Mock SmartZone controller')
+    parser.add_argument('--zones', type=int, default=10, help='Number of zones')
+    parser.add_argument('--aps', type=int, default=20, help='APs per zone')
+    parser.add_argument('--clients', type=int, default=10, help='Clients per AP')
+    parser.add_argument('--drift', type=float, default=0.1, help='Fraction of entities changing per poll')
+    parser.add_argument('--seed', type=int, default=1, help='Topology seed')
+    parser.add_argument('--port', type=int, default=8443, help='Listen port')
+    args = parser.parse_args()
+
+    state['drift'] = args.drift
+    build_topology(args.zones, args.aps, args.clients, args.seed)
+    uvicorn.run(app, host='127.0.0.1', port=args.port)
@@ -0,0 +1,272 @@
+"""Deterministic synthetic venue topology for seeding and benchmarks.
+
+Run:  python -m scripts.topology --seed 1 --zones 50 --aps-per-zone 100 --clients-per-ap 20
+
+Everything derives from one ``numpy.random.Generator`` seeded with
+``--seed``, so the same parameters produce an identical topology on every
+run (the printed fingerprint confirms it). Cross-references are consistent:
+every client is attached to a generated online AP and carries that AP's
+name, MAC and zone, and AP, radio, zone and venue client counts are the
+sums of the attached clients. MACs and hostnames are derived from
+per-entity indexes, so they never collide. Values are drawn as arrays,
+which keeps 100k+ clients to about a second.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+ZONE_NAMES = [
+    'BC83386-P - Dogwood',
+    'CA28283 - Ventana Residences',
+    'FL01313 - Palomar Core MEC',
+    'FL21908-P - Pier Sixty-Six',
+    'FL21966-P - Town Hollywood',
+    'FL28242-P - Serenity Lane',
+    'FL28243-P - Imperial Village',
+    'FL28244-P - Sunpointe Place',
+    'FL28245-P - ParkVillage I and',
+    'FL29325-P - Harbor Cay',
+    'GA29532-P - Signal House',
+    'IL23336-P - Concordia Village',
+    'IL23640-P - Lutheran Hillside',
+    'IL62034-P - Meridian Village',
+    'IN28254-P - EMC2',
+    'MO23626-P - Lenoir Woods',
+    'MO63144-P - Mason Pointe',
+    'MO63304-P - Breeze Park',
+    'MOXXXXX-P - Mason Pointe',
+    'NC29384-P - SAU',
+    'SBA Lab',
+    'Staging Zone',
+    'TN21944-P - Opus East Memphis',
+    'TX29328-P - The Gabriel',
+]
+
+AP_MODELS = ['R750', 'R850', 'T350', 'T370', 'H550']
+FIRMWARE_VERSIONS = ['6.1.0.0.1234', '6.1.0.0.1235', '6.0.9.0.1200', '6.1.1.0.1240', '6.0.8.0.1199']
+CHANNELS_5G = [36, 40, 44, 48, 149, 153, 157, 161]
+CHANNELS_24G = [1, 6, 11]
+WLANS = ['LSS VOICE', 'LSS DATA', 'LSS GUEST']
+AP_OUI = 'D8:38:FC'
+OFFLINE_RATE = 0.03
+
+# (hostname prefix, os, deviceType, weight)
+DEVICE_KINDS = [
+    ('iPhone-', 'iOS', 'phone', 0.30),
+    ('Galaxy-', 'Android', 'phone', 0.22),
+    ('DESKTOP-', 'Windows', 'laptop', 0.18),
+    ('MacBook-', 'macOS', 'laptop', 0.12),
+    ('Chromebook-', 'Chrome OS', 'laptop', 0.08),
+    ('AZULFD', 'Unknown', 'other', 0.10),
+]
+
+
+@dataclass(frozen=True)
+class TopologySpec:
+    """Scale and seed of a generated topology."""
+    seed: int = 1
+    zones: int = 24
+    aps_per_zone: int = 10
+    clients_per_ap: int = 2
+    hosts: int = 10
+
+
+@dataclass
+class Topology:
+    """A generated venue (with its zones), APs, clients and hosts, as generator dicts."""
+    venue: Dict
+    aps: List[Dict]
+    clients: List[Dict]
+    hosts: List[Dict]
+
+    def fingerprint(self) -> str:
+        """Short digest of the whole topology; equal for identical runs."""
+        body = json.dumps([self.venue, self.aps, self.clients, self.hosts], sort_keys=True).encode()
+        return hashlib.sha256(body).hexdigest()[:16]
+
+
+def _mac(prefix: str, index: np.ndarray, salt: int, octets: int) -> List[str]:
+    """Unique MACs: ``prefix`` plus ``octets`` bytes of ``index`` XOR ``salt`` (a bijection)."""
+    values = (index.astype(np.int64) ^ salt).tolist()
+    shifts = [8 * k for k in range(octets - 1, -1, -1)]
+    return [prefix + ''.join(f':{v >> s & 255:02X}' for s in shifts) for v in values]
+
+
+def _zone_name(index: int) -> str:
+    name = ZONE_NAMES[index % len(ZONE_NAMES)]
+    return name if index < len(ZONE_NAMES) else f'{name} #{index // len(ZONE_NAMES) + 1}'
+
+
+def _zone_metrics(rng: np.random.Generator, connected: np.ndarray, clients: np.ndarray):
+    """Experience, utilization, RxDesense and Netflix scores from clients per AP."""
+    n = len(clients)
+    cpa = np.divide(clients, connected, out=np.zeros(n), where=connected > 0)
+    experience = np.clip(np.clip(100 - cpa * 5, 20, 100) + rng.uniform(-5, 5, n), 0, 100)
+    utilization = np.clip(cpa * 15 + rng.uniform(-10, 10, n), 5, 99)
+    rx_desense = rng.uniform(2, np.clip(cpa * 3, 2.5, 25))
+    netflix = np.maximum(0, experience - rx_desense * 2 - np.where(utilization > 70, 15, 0))
+    live = connected > 0
+    return cpa, [np.where(live, np.round(v, 1), 0.0) for v in (experience, utilization, rx_desense, netflix)]
+
+
+def build_topology(spec: TopologySpec) -> Topology:
+    rng = np.random.default_rng(spec.seed)
+    n_zones, per_zone = spec.zones, spec.aps_per_zone
+    n_aps = n_zones * per_zone
+    ap_salt, client_salt = (int(s) for s in rng.integers(0, 2**24, 2))
+
+    # APs
+    ap_zone = np.repeat(np.arange(n_zones), per_zone)
+    ap_index = np.arange(n_aps)
+    online = rng.random(n_aps) >= OFFLINE_RATE
+    models = rng.integers(0, len(AP_MODELS), n_aps).tolist()
+    firmware = rng.integers(0, len(FIRMWARE_VERSIONS), n_aps).tolist()
+    serials = rng.integers(10**9, 10**10, n_aps).tolist()
+    # channel, airtime, CPU and memory utilization (%)
+    usage = np.where(online, rng.integers([[30], [40], [20], [40]], [[86], [91], [61], [76]], (4, n_aps)), 0).tolist()
+    radio_5g = (rng.integers(0, len(CHANNELS_5G), n_aps).tolist(), rng.integers(15, 23, n_aps).tolist(),
+                rng.integers(-100, -80, n_aps).tolist())
+    radio_24g = (rng.integers(0, len(CHANNELS_24G), n_aps).tolist(), rng.integers(12, 20, n_aps).tolist(),
+                 rng.integers(-95, -75, n_aps).tolist())
+
+    # Clients, each on a random online AP
+    online_aps = np.flatnonzero(online)
+    n_clients = n_aps * spec.clients_per_ap if len(online_aps) else 0
+    client_ap = online_aps[rng.integers(0, max(len(online_aps), 1), n_clients)] if n_clients else np.zeros(0, dtype=np.int64)
+    ap_clients = np.bincount(client_ap, minlength=n_aps)
+    ap_clients_5g = np.round(ap_clients * 0.8).astype(np.int64)
+
+    ap_macs = _mac(AP_OUI, ap_index, ap_salt, 3)
+    ap_names = [f'AP-{z:03d}-{i % per_zone + 1:03d}' for z, i in zip(ap_zone.tolist(), ap_index.tolist())]
+    zone_ids = [f'zone-{z}' for z in range(n_zones)]
+    zone_names = [_zone_name(z) for z in range(n_zones)]
+    aps: List[Dict] = []
+    for i in range(n_aps):
+        z = int(ap_zone[i])
+        aps.append({
+            'mac': ap_macs[i],
+            'name': ap_names[i],
+            'model': AP_MODELS[models[i]],
+            'status': 'online' if online[i] else 'offline',
+            'ip': f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}',
+            'zoneId': zone_ids[z],
+            'zoneName': zone_names[z],
+            'firmwareVersion': FIRMWARE_VERSIONS[firmware[i]],
+            'serialNumber': str(serials[i]),
+            'clientCount': int(ap_clients[i]),
+            'channelUtilization': usage[0][i],
+            'airtimeUtilization': usage[1][i],
+            'cpuUtilization': usage[2][i],
+            'memoryUtilization': usage[3][i],
+            'radios': [
+                {
+                    'band': '5GHz',
+                    'channel': CHANNELS_5G[radio_5g[0][i]],
+                    'txPower': radio_5g[1][i],
+                    'noiseFloor': radio_5g[2][i],
+                    'clientCount': int(ap_clients_5g[i]),
+                },
+                {
+                    'band': '2.4GHz',
+                    'channel': CHANNELS_24G[radio_24g[0][i]],
+                    'txPower': radio_24g[1][i],
+                    'noiseFloor': radio_24g[2][i],
+                    'clientCount': int(ap_clients[i] - ap_clients_5g[i]),
+                },
+            ],
+        })
+
+    kinds = rng.choice(len(DEVICE_KINDS), n_clients, p=[k[3] for k in DEVICE_KINDS]).tolist()
+    wlans = rng.integers(0, len(WLANS), n_clients).tolist()
+    data_usage = np.round(rng.uniform(100, 2000, n_clients), 1).tolist()
+    client_macs = _mac('02', np.arange(n_clients), client_salt, 5)
+    clients: List[Dict] = []
+    for j, (a, kind) in enumerate(zip(client_ap.tolist(), kinds)):
+        prefix, os_name, device_type, _ = DEVICE_KINDS[kind]
+        clients.append({
+            'hostname': f'{prefix}{j:06d}',
+            'modelName': 'Unknown',
+            'ipAddress': f'172.{16 + (j >> 16 & 15)}.{j >> 8 & 255}.{j & 255}',
+            'macAddress': client_macs[j],
+            'wlan': WLANS[wlans[j]],
+            'apName': ap_names[a],
+            'apMac': ap_macs[a],
+            'zoneId': aps[a]['zoneId'],
+            'dataUsage': data_usage[j],
+            'os': os_name,
+            'deviceType': device_type,
+        })
+
+    # Zones and venue roll up the APs and clients
+    connected = np.bincount(ap_zone, weights=online, minlength=n_zones).astype(np.int64)
+    zone_clients = np.bincount(ap_zone, weights=ap_clients, minlength=n_zones).astype(np.int64)
+    cpa, (experience, utilization, rx_desense, netflix) = _zone_metrics(rng, connected, zone_clients)
+    zones = [
+        {
+            'id': zone_ids[z],
+            'name': zone_names[z],
+            'totalAPs': per_zone,
+            'connectedAPs': int(connected[z]),
+            'disconnectedAPs': per_zone - int(connected[z]),
+            'clients': int(zone_clients[z]),
+            'apAvailability': round(float(connected[z]) / per_zone * 100, 1) if per_zone else 0.0,
+            'clientsPerAP': round(float(cpa[z]), 2),
+            'experienceScore': float(experience[z]),
+            'utilization': float(utilization[z]),
+            'rxDesense': float(rx_desense[z]),
+            'netflixScore': float(netflix[z]),
+        }
+        for z in range(n_zones)
+    ]
+    venue = {
+        'name': 'GA29532-P - Signal House',
+        'totalZones': n_zones,
+        'totalAPs': n_aps,
+        'totalClients': n_clients,
+        'avgExperienceScore': round(float(experience.mean()), 1) if n_zones else 0.0,
+        'slaCompliance': round(sum(z['apAvailability'] >= 95 for z in zones) / n_zones * 100, 1) if n_zones else 0.0,
+        'zones': zones,
+    }
+
+    host_usage = np.round(np.sort(rng.uniform(200, 1500, spec.hosts))[::-1], 1).tolist()
+    hosts = [{'hostname': f'HOST-{1000 + h}', 'dataUsage': usage_mb} for h, usage_mb in enumerate(host_usage)]
+    return Topology(venue=venue, aps=aps, clients=clients, hosts=hosts)
+
+
+def add_topology_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = TopologySpec()
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='Random seed; equal seeds give identical data')
+    parser.add_argument('--zones', type=int, default=defaults.zones, help='Number of zones')
+    parser.add_argument('--aps-per-zone', type=int, default=defaults.aps_per_zone, help='Access points per zone')
+    parser.add_argument('--clients-per-ap', type=int, default=defaults.clients_per_ap, help='Clients per AP (spread over online APs)')
+    parser.add_argument('--hosts', type=int, default=defaults.hosts, help='Number of hosts for host usage')
+
+
+def spec_from_args(args: argparse.Namespace) -> TopologySpec:
+    return TopologySpec(
+        seed=args.seed,
+        zones=max(1, args.zones),
+        aps_per_zone=max(1, args.aps_per_zone),
+        clients_per_ap=max(0, args.clients_per_ap),
+        hosts=max(0, args.hosts),
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a topology and print its size and fingerprint')
+    add_topology_arguments(parser)
+    spec = spec_from_args(parser.parse_args())
+    started = time.perf_counter()
+    topology = build_topology(spec)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{spec.zones} zones, {len(topology.aps)} APs, {len(topology.clients)} clients, "
+        f"{len(topology.hosts)} hosts in {elapsed:.2f}s (fingerprint {topology.fingerprint()})"
+    )
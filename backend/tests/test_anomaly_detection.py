@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services import anomaly_detection
+from app.services.anomaly_detection import HIGH, LOW, AnomalyDetectionService, AnomalyDetector
+from app.services.venue_registry import VenueScope
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def warm(detector, key, samples=20, direction=HIGH):
+    """Feed a steady series alternating between 10 and 12; returns the next timestamp."""
+    for i in range(samples):
+        assert detector.observe(key, 10.0 + 2 * (i % 2), float(i), direction) is None
+    return float(samples)
+
+
+def row(field, value, minute, zone="zone-0", measurement="zone_metrics", **tags):
+    return dict(
+        _measurement=measurement, _field=field, _value=value, _time=T0 + timedelta(minutes=minute),
+        zoneId=zone, **tags,
+    )
+
+
+def test_no_alert_during_warmup():
+    detector = AnomalyDetector(warmup=5)
+    warm(detector, "k", samples=3)
+    assert detector.observe("k", 100.0, 3.0) is None
+
+    detector = AnomalyDetector(warmup=5)
+    ts = warm(detector, "k", samples=5)
+    z, baseline = detector.observe("k", 100.0, ts)
+    assert z > detector.threshold
+    assert 10.0 <= baseline <= 12.0
+
+
+def test_alerts_only_in_the_rule_direction():
+    high = AnomalyDetector(warmup=5)
+    ts = warm(high, "k")
+    assert high.observe("k", -80.0, ts, HIGH) is None
+    assert high.observe("k", 100.0, ts + 1, HIGH) is not None
+
+    low = AnomalyDetector(warmup=5)
+    ts = warm(low, "k", direction=LOW)
+    assert low.observe("k", 100.0, ts, LOW) is None
+    z, _ = low.observe("k", -80.0, ts + 1, LOW)
+    assert z < -low.threshold
+
+
+def test_cooldown_suppresses_repeated_alerts():
+    detector = AnomalyDetector(warmup=5, cooldown=60.0)
+    ts = warm(detector, "k")
+    assert detector.observe("k", 100.0, ts) is not None
+    assert detector.observe("k", 1_000.0, ts + 30) is None
+    assert detector.observe("k", 10_000.0, ts + 61) is not None
+
+
+def test_series_beyond_max_series_are_ignored():
+    detector = AnomalyDetector(warmup=1, max_series=2)
+    detector.observe("a", 1.0, 0.0)
+    detector.observe("b", 1.0, 0.0)
+    assert detector.observe("c", 1.0, 0.0) is None
+    assert detector.observe("c", 1.0, 1.0) is None
+    assert len(detector) == 2
+    assert detector.dropped_series == 2
+
+
+def test_rows_map_to_rules_and_detections():
+    detector = AnomalyDetector(warmup=5)
+    rows = [row("rxDesense", 10.0 + 2 * (i % 2), i, zoneName="Lobby") for i in range(10)]
+    rows.append(row("unmonitored", 500.0, 10))
+    rows.append(row("rxDesense", 90.0, 11, zoneName="Lobby"))
+
+    detection, = detector.observe_rows(rows, "v1")
+    assert (detection.rule.type, detection.severity) == ("interference", "critical")
+    assert (detection.zoneId, detection.zoneName, detection.apMac) == ("zone-0", "Lobby", None)
+    assert detection.timestamp == T0 + timedelta(minutes=11)
+
+
+def test_series_are_kept_per_venue(monkeypatch):
+    written = []
+    monkeypatch.setattr(anomaly_detection.influx_service, "write", lambda bucket, points: written.append(bucket))
+    service = AnomalyDetectionService(AnomalyDetector(warmup=5))
+    calm = VenueScope(id="calm", name="Calm", bucket="b1")
+    busy = VenueScope(id="busy", name="Busy", bucket="b2")
+
+    service.process(calm, [row("clientsPerAP", 10.0 + 2 * (i % 2), i) for i in range(10)])
+    # the same zone id in another venue starts its own baseline instead of alerting against "calm"
+    assert service.process(busy, [row("clientsPerAP", 40.0 + 2 * (i % 2), i) for i in range(10)]) == []
+    assert len(service.detector) == 2
+
+    detections = service.process(busy, [row("clientsPerAP", 200.0, 11)])
+    assert [d.rule.type for d in detections] == ["high_client_density"]
+    assert written == ["b2"]
@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services import ap_history as ap_history_module
+from app.services.ap_history import AP_HISTORY_METRICS, APHistoryStore, APRing
+from app.services.venue_registry import VenueScope
+
+VENUE = VenueScope(id="v", name="V", bucket="b")
+NOW = 100_000.0
+
+
+def flux(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def rows_for(samples):
+    """Pivoted ap_metrics rows from ``{mac: [epoch times]}``, one table per AP."""
+    for mac, times in samples.items():
+        for t in times:
+            row = {"apMac": mac, "_time": datetime.fromtimestamp(t, timezone.utc)}
+            row.update({m: float(t % 100) for m in AP_HISTORY_METRICS})
+            yield row
+
+
+def poll(monkeypatch, store, samples, now=NOW):
+    queries = []
+
+    def query_scheduled(query, consume, query_class):
+        queries.append(query)
+        return consume(rows_for(samples))
+
+    monkeypatch.setattr(ap_history_module.influx_service, "query_scheduled", query_scheduled)
+    return store.poll_venue(VENUE, now=now), queries
+
+
+def test_ring_keeps_the_latest_samples_in_order():
+    ring = APRing(capacity=3, n_metrics=1, covered_from=0.0)
+    assert ring.append(np.array([1.0, 2.0]), np.array([[10.0, 20.0]])) == 2
+    assert ring.append(np.array([2.0, 3.0, 4.0]), np.array([[20.0, 30.0, 40.0]])) == 2
+    times, values = ring.ordered()
+    assert times.tolist() == [2.0, 3.0, 4.0]
+    assert values.tolist() == [[20.0, 30.0, 40.0]]
+    assert ring.first_time == 2.0 and ring.last_time == 4.0
+
+
+def test_backfill_then_incremental_polls(monkeypatch):
+    store = APHistoryStore(capacity=10, backfill_seconds=3600, max_aps=10)
+    added, queries = poll(monkeypatch, store, {"a": [NOW - 120, NOW - 60], "b": [NOW - 60]})
+    assert added == 3
+    assert f"range(start: {flux(NOW - 3600)})" in queries[0]
+
+    added, queries = poll(monkeypatch, store, {"a": [NOW - 60, NOW]}, now=NOW + 60)
+    assert added == 1
+    assert f"range(start: {flux(NOW - 60)})" in queries[0]  # the latest sample seen
+
+    times, values = store.history("v", "a", NOW - 3600, NOW + 1)
+    assert times.tolist() == [NOW - 120, NOW - 60, NOW]
+    assert values.shape == (len(AP_HISTORY_METRICS), 3)
+    assert store.history("v", "a", NOW - 7200, NOW) is None  # before the backfill
+    assert store.history("v", "missing", NOW - 60, NOW) is None
+
+
+def test_aps_beyond_the_cap_are_left_to_influx_and_idle_rings_evicted(monkeypatch):
+    store = APHistoryStore(capacity=10, backfill_seconds=3600, max_aps=2)
+    poll(monkeypatch, store, {"a": [NOW - 120], "b": [NOW - 60], "c": [NOW - 60]})
+    assert store.untracked["v"] == 1
+    assert store.history("v", "c", NOW - 60, NOW) is None
+    # "a" and "b" both had samples in the backfill, so nothing was idle
+    assert store.evicted == 0
+
+    # only "b" and "c" report; "a" is idle and makes room for "c"
+    poll(monkeypatch, store, {"b": [NOW], "c": [NOW]}, now=NOW + 60)
+    assert store.untracked["v"] == 1
+    assert store.evicted == 1
+    assert store.history("v", "a", NOW - 60, NOW) is None
+
+    poll(monkeypatch, store, {"b": [NOW + 60], "c": [NOW + 60]}, now=NOW + 120)
+    assert store.untracked["v"] == 0
+    # "c" is covered from the poll that created its ring, not from the backfill
+    assert store.history("v", "c", NOW - 3600, NOW + 61) is None
+    times, _ = store.history("v", "c", NOW, NOW + 61)
+    assert times.tolist() == [NOW + 60]
+
+
+def test_silent_aps_are_dropped_after_the_backfill_window(monkeypatch):
+    store = APHistoryStore(capacity=10, backfill_seconds=3600, max_aps=10)
+    poll(monkeypatch, store, {"a": [NOW - 60], "b": [NOW - 60]})
+    poll(monkeypatch, store, {"b": [NOW + 3600]}, now=NOW + 3600)
+    assert store.history("v", "a", NOW - 60, NOW) is None
+    assert store.history("v", "b", NOW - 60, NOW + 3601) is not None
+
+
+def test_an_ap_split_across_series_is_read_as_one_table(monkeypatch):
+    # "a" went offline and back online: Influx keeps one table per tag set,
+    # ordered by group key, so the later "offline" samples come first and
+    # other APs' tables can sit in between
+    tables = [
+        ("a", "offline", [NOW - 60]),
+        ("b", "offline", [NOW - 60]),
+        ("a", "online", [NOW - 180, NOW - 120, NOW]),
+    ]
+
+    def query_scheduled(query, consume, query_class):
+        if '|> group(columns: ["apMac"])\n  |> sort(columns: ["_time"])\n  |> pivot(' in query:
+            merged = {}
+            for mac, _, times in tables:
+                merged.setdefault(mac, []).extend(times)
+            return consume(rows_for({mac: sorted(times) for mac, times in merged.items()}))
+        return consume(row for mac, _, times in tables for row in rows_for({mac: times}))
+
+    monkeypatch.setattr(ap_history_module.influx_service, "query_scheduled", query_scheduled)
+    store = APHistoryStore(capacity=10, backfill_seconds=3600, max_aps=10)
+    assert store.poll_venue(VENUE, now=NOW) == 5
+    times, _ = store.history("v", "a", NOW - 3600, NOW + 1)
+    assert times.tolist() == [NOW - 180, NOW - 120, NOW - 60, NOW]
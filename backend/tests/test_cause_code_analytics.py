@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.services import cause_code_analytics
+from app.services.cause_code_analytics import CauseCodeColumns
+from app.services.transforms import Columns
+
+
+def columns(rows):
+    """``Columns`` from ``(time, field, code, zoneId, value)`` tuples."""
+    time, field, code, zone, value = zip(*rows)
+    return Columns(
+        time=np.array(time, dtype="datetime64[ns]"),
+        value=np.array(value, dtype=np.float64),
+        tags={"_field": np.array(field), "code": np.array(code), "zoneId": np.array(zone)},
+    )
+
+
+T0, T1 = "2024-01-01T00:00", "2024-01-01T01:00"
+ROWS = [
+    (T0, "count", "25", "z1", 10.0),
+    (T0, "impactScore", "25", "z1", 80.0),
+    (T1, "count", "25", "z1", 30.0),
+    (T0, "count", "25", "z2", 5.0),
+    (T0, "impactScore", "25", "z2", 40.0),
+    (T1, "count", "47", "z1", 5.0),
+    (T1, "impactScore", "47", "", 20.0),
+    (T1, "description", "47", "z1", np.nan),
+]
+
+
+def test_from_columns_pivots_fields_per_series_and_window():
+    cols = CauseCodeColumns.from_columns(columns(ROWS), ["code", "zone"])
+    rows = sorted(
+        zip(cols.time.tolist(), cols.tags["code"].tolist(), cols.tags["zone"].tolist(),
+            cols.count.tolist(), cols.impact.tolist())
+    )
+    t0 = np.datetime64(T0, "s").astype(np.int64)
+    assert rows == [
+        (t0, "25", "z1", 10.0, 80.0),
+        (t0, "25", "z2", 5.0, 40.0),
+        (t0 + 3600, "25", "z1", 30.0, 0.0),
+        (t0 + 3600, "47", "unknown", 0.0, 20.0),
+        (t0 + 3600, "47", "z1", 5.0, 0.0),
+    ]
+
+
+def test_rank_per_code():
+    cols = CauseCodeColumns.from_columns(columns(ROWS), ["code"])
+    ranking = cause_code_analytics.rank(cols, ["code"])
+    assert ranking.groups == [{"code": "25"}, {"code": "47"}]
+    assert ranking.series.tolist() == [[15.0, 30.0], [0.0, 5.0]]
+    assert ranking.total.tolist() == [45.0, 5.0]
+    assert ranking.share.tolist() == [0.9, 0.1]
+    # count-weighted: (10 * 80 + 30 * 0 + 5 * 40) / 45
+    assert np.isclose(ranking.impact[0], 1000 / 45)
+    assert ranking.trend.tolist() == [15.0, 5.0]
+    assert cause_code_analytics.order(ranking, "count", 1).tolist() == [0]
+
+
+def test_empty_result():
+    cols = CauseCodeColumns.from_columns(columns([(T0, "description", "25", "z1", np.nan)]), ["zone"])
+    assert len(cols) == 0
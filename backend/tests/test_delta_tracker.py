@@ -0,0 +1,98 @@
+import pytest
+
+from app.collector import collector as collector_module
+from app.collector.collector import DeltaTracker, PollStats, Record, SmartZoneCollector
+from app.services.venue_registry import VenueScope
+
+
+def record(fields, tags=None, key=("ap_metrics", "aa")):
+    return Record(measurement="ap_metrics", key=key, tags=tags or {"apMac": "aa"}, fields=fields)
+
+
+def written(tracker, rec, now):
+    """Diff ``rec`` and commit it as a successful write."""
+    changed = tracker.diff(rec, now)
+    tracker.commit([(rec, changed)], now)
+    return changed
+
+
+def test_first_write_is_full_then_only_changes():
+    tracker = DeltaTracker(full_refresh=600)
+    assert written(tracker, record({"a": 1, "b": 2}), 0) == {"a": 1, "b": 2}
+    assert written(tracker, record({"a": 1, "b": 3}), 10) == {"b": 3}
+    assert written(tracker, record({"a": 1, "b": 3}), 20) == {}
+
+
+def test_tag_change_and_full_refresh_rewrite_everything():
+    tracker = DeltaTracker(full_refresh=600)
+    written(tracker, record({"a": 1, "b": 2}), 0)
+    assert written(tracker, record({"a": 1, "b": 2}, tags={"apMac": "aa", "status": "x"}), 10) == {"a": 1, "b": 2}
+    assert written(tracker, record({"a": 1, "b": 2}, tags={"apMac": "aa", "status": "x"}), 20) == {}
+    assert written(tracker, record({"a": 1, "b": 2}, tags={"apMac": "aa", "status": "x"}), 610) == {"a": 1, "b": 2}
+
+
+def test_uncommitted_changes_are_sent_again():
+    tracker = DeltaTracker(full_refresh=600)
+    written(tracker, record({"a": 1, "b": 2}), 0)
+    assert tracker.diff(record({"a": 5, "b": 2}), 10) == {"a": 5}
+    # the write failed: nothing was committed
+    assert tracker.diff(record({"a": 5, "b": 2}), 20) == {"a": 5}
+    assert len(tracker) == 1
+
+    new = record({"c": 1}, key=("ap_metrics", "bb"))
+    assert tracker.diff(new, 20) == {"c": 1}
+    assert tracker.diff(new, 30) == {"c": 1}
+
+
+def test_retain_forgets_missing_series():
+    tracker = DeltaTracker(full_refresh=600)
+    written(tracker, record({"a": 1}), 0)
+    written(tracker, record({"a": 1}, key=("ap_metrics", "bb")), 0)
+    tracker.retain([("ap_metrics", "bb")])
+    assert len(tracker) == 1
+    assert tracker.diff(record({"a": 1}), 10) == {"a": 1}
+
+
+class FakeSmartZone:
+    def __init__(self):
+        self.clients = 3
+
+    async def zones(self):
+        return [{"id": "z1", "name": "Zone 1"}]
+
+    async def zone_aps(self, zone_id):
+        return [{"apMac": "aa", "zoneId": zone_id, "status": "Online", "numClients": self.clients}]
+
+    async def zone_clients(self, zone_id):
+        return []
+
+
+async def test_failed_write_leaves_tracker_unchanged(monkeypatch):
+    smartzone = FakeSmartZone()
+    collector = SmartZoneCollector(smartzone, VenueScope(id="v", name="V", bucket="b"), full_refresh=600)
+    writes = []
+
+    def fail(bucket, points):
+        raise ConnectionError("influx down")
+
+    monkeypatch.setattr(collector_module.influx_service, "write", lambda bucket, points: writes.append(points))
+    first = await collector.poll_once()
+    assert first.points == 2  # zone and AP
+
+    smartzone.clients = 4
+    monkeypatch.setattr(collector_module.influx_service, "write", fail)
+    with pytest.raises(ConnectionError):
+        await collector.poll_once()
+
+    monkeypatch.setattr(collector_module.influx_service, "write", lambda bucket, points: writes.append(points))
+    retried = await collector.poll_once()
+    assert retried.points == 1
+    assert "clientCount=4i" in writes[-1][0].to_line_protocol()
+
+
+def test_to_points_does_not_update_tracker():
+    collector = SmartZoneCollector(FakeSmartZone(), VenueScope(id="v", name="V", bucket="b"))
+    rec = record({"a": 1})
+    points, pending = collector.to_points([rec], PollStats(), now=0)
+    assert len(points) == 1 and pending == [(rec, {"a": 1})]
+    assert len(collector.tracker) == 0
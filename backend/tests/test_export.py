@@ -0,0 +1,53 @@
+from app.routes import export
+from app.services.venue_registry import VenueScope
+
+VENUE = VenueScope(id="v", name="V", bucket="b")
+
+
+class Stream:
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        self.closed = True
+
+
+def capture(monkeypatch, rows):
+    streams, queries = [], []
+
+    def query_stream(query):
+        queries.append(query)
+        streams.append(Stream(rows))
+        return streams[-1]
+
+    monkeypatch.setattr(export.influx_service, "query_stream", query_stream)
+    return streams, queries
+
+
+def test_client_export_has_one_row_per_client(monkeypatch):
+    _, queries = capture(monkeypatch, [])
+    list(export._client_rows(VENUE, None, None))
+    query = queries[0]
+    assert query.index('group(columns: ["macAddress", "_field"])') < query.index("last()")
+    assert query.index("last()") < query.index('group(columns: ["macAddress"])') < query.index("pivot(")
+    assert 'rowKey: ["_time", "macAddress", "apMac", "apName", "zoneId", "wlan", "os", "deviceType"]' in query
+
+
+def test_abandoned_exports_close_the_stream(monkeypatch):
+    rows = [{"macAddress": f"m{i}", "anomalyId": f"a{i}"} for i in range(3)]
+    streams, _ = capture(monkeypatch, rows)
+    for generator in (export._client_rows(VENUE, None, None), export._anomaly_rows(VENUE, "1d", None, None)):
+        next(generator)
+        assert not streams[-1].closed
+        generator.close()
+        assert streams[-1].closed
+
+
+def test_finished_exports_close_the_stream(monkeypatch):
+    streams, _ = capture(monkeypatch, [{"macAddress": "m", "hostname": "h"}])
+    assert [r["hostname"] for r in export._client_rows(VENUE, "zone-1", None)] == ["h"]
+    assert streams[0].closed
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routes import ingest
+
+
+@pytest.fixture
+def client(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(settings, "ingest_max_body_bytes", 100)
+    monkeypatch.setattr(ingest.write_buffer, "submit", lambda bucket, lines, precision: submitted.append(lines))
+    app = FastAPI()
+    app.include_router(ingest.router)
+    with TestClient(app) as test_client:
+        test_client.submitted = submitted
+        yield test_client
+
+
+LINE = b"ap_metrics,apMac=aa cpuUtilization=5i 1700000000000000000\n"
+
+
+def test_accepts_a_batch_within_the_limit(client):
+    response = client.post("/ingest", content=LINE, headers={"content-type": "text/plain"})
+    assert response.status_code == 202
+    assert client.submitted == [[LINE.decode().strip()]]
+
+
+def test_rejects_a_declared_oversized_body(client):
+    response = client.post("/ingest", content=LINE * 3, headers={"content-type": "text/plain"})
+    assert response.status_code == 413
+    assert client.submitted == []
+
+
+def test_stops_reading_a_chunked_body_past_the_limit(client):
+    def chunks():  # no Content-Length: sent with chunked transfer encoding
+        for _ in range(50):
+            yield LINE
+
+    response = client.post("/ingest", content=chunks(), headers={"content-type": "text/plain"})
+    assert response.status_code == 413
+    assert client.submitted == []
+
+
+def test_parses_the_body_off_the_event_loop(client, monkeypatch):
+    parse = ingest._parse_line_protocol
+    on_loop = []
+
+    def recording(body, venue):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return parse(body, venue)
+
+    monkeypatch.setattr(ingest, "_parse_line_protocol", recording)
+    response = client.post("/ingest", content=LINE, headers={"content-type": "text/plain"})
+    assert response.status_code == 202
+    assert on_loop == [False]
+
+
+def test_rejects_invalid_points(client):
+    response = client.post("/ingest", json=[{"measurement": "nope", "fields": {"x": 1}}])
+    assert response.status_code == 400
+    response = client.post("/ingest", content=b"\xff", headers={"content-type": "text/plain"})
+    assert response.status_code == 400
+    assert client.submitted == []
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from influxdb_client import Point
+
+from scripts.bench_line_protocol import WHOLE_FLOAT, point_lines
+from scripts.generate_data import TopologyFrames
+from scripts.line_protocol import Schema, escape_string, escape_tag, to_ns
+from scripts.topology import TopologySpec, build_topology
+
+
+TS = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+SCHEMA = Schema("ap metrics,v2", [("name", "s"), ("cpu", "i"), ("ratio", "f"), ("score", ".1f")])
+
+
+def point(measurement, tags, fields):
+    p = Point(measurement)
+    for key, value in tags.items():
+        p = p.tag(key, value)
+    for key, value in fields.items():
+        p = p.field(key, value)
+    return p.time(TS).to_line_protocol()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("AP 1", r"AP\ 1"),
+    ("a,b", r"a\,b"),
+    ("x=y", r"x\=y"),
+    ("a\nb\tc\rd", r"a\nb\tc\rd"),
+    ("C:\\dir\\ap", "C:\\dir\\ap"),
+    ("ends\\", "ends\\ "),
+    (42, "42"),
+])
+def test_escape_tag(value, expected):
+    assert escape_tag(value) == expected
+
+
+def test_escape_string():
+    assert escape_string('say "hi" \\o/') == 'say \\"hi\\" \\\\o/'
+
+
+def test_series_key_sorts_tags_and_skips_empty_values():
+    key = SCHEMA.series_key({"zoneName": "Lobby North", "apMac": "aa:bb", "model": "", "ip": None})
+    assert key == r"ap\ metrics\,v2,apMac=aa:bb,zoneName=Lobby\ North"
+
+
+@pytest.mark.parametrize("tags", [
+    {"apName": "AP 1,lobby=north", "zoneId": "z-1"},
+    {"path": "C:\\dir\\", "apName": "a\nb", "empty": ""},
+    {"apMac": "aa:bb:cc", "status": "Online"},
+])
+def test_lines_match_point(tags):
+    name = 'say "hi" \\ ok, =done'
+    fields = {"name": name, "cpu": 5, "ratio": 0.25, "score": 97.26}
+    line, = SCHEMA.lines(
+        [SCHEMA.series_key(tags)],
+        {"name": [escape_string(name)], "cpu": [5], "ratio": [0.25], "score": [97.26]},
+        to_ns(TS),
+    )
+    assert line == point("ap metrics,v2", tags, dict(fields, score=97.3))
+
+
+def test_whole_floats_keep_their_fraction():
+    schema = Schema("m", [("usage", "f")])
+    line, = schema.lines([schema.series_key({})], {"usage": [12.0]}, 0)
+    assert line == "m usage=12.0 0"
+    assert WHOLE_FLOAT.sub(r"=\1", line) == Point("m").field("usage", 12.0).time(0).to_line_protocol()
+
+
+def test_to_ns_treats_naive_datetimes_as_utc():
+    naive = TS.replace(tzinfo=None)
+    assert to_ns(naive) == to_ns(TS) == 1704164645678901000
+    assert to_ns(TS.astimezone(timezone(timedelta(hours=-5)))) == to_ns(TS)
+    assert to_ns(datetime(1969, 12, 31, 23, 59, 59, tzinfo=timezone.utc)) == -1_000_000_000
+
+
+def test_topology_frame_matches_point_builders():
+    topology = build_topology(TopologySpec(seed=3, zones=3, aps_per_zone=4, clients_per_ap=2, hosts=2))
+    venue, aps, clients = topology.venue, topology.aps, topology.clients
+    encoder = TopologyFrames(venue, aps, clients, "main venue", seed=1)
+
+    actual = [WHOLE_FLOAT.sub(r"=\1", line) for line in encoder.frame(TS, drift=False)]
+
+    assert len(actual) == len(encoder)
+    assert sorted(actual) == sorted(point_lines(venue, aps, clients, "main venue", TS))
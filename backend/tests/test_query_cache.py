@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from app.database import query_cache as query_cache_module
+from app.database.query_cache import DiskCache, QueryCache
+from app.database.result_budget import Bounded
+from app.routes import dependencies
+from app.routes import venue as venue_routes
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(query_cache_module.time, "time", fake.time)
+    return fake
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return f"value-{self.calls}"
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_fresh_entries_are_served_from_memory(clock):
+    cache = QueryCache(max_entries=10, max_stale=60)
+    load = Loader()
+    assert await cache.get("k", load, ttl=10) == "value-1"
+    clock.now += 9
+    assert await cache.get("k", load, ttl=10) == "value-1"
+    assert load.calls == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+async def test_stale_entries_are_served_while_refreshing(clock):
+    cache = QueryCache(max_entries=10, max_stale=60)
+    load, refresh = Loader(), Loader()
+    await cache.get("k", load, ttl=10)
+    clock.now += 30
+    assert await cache.get("k", load, ttl=10, refresh=refresh) == "value-1"
+    assert await cache.get("k", load, ttl=10, refresh=refresh) == "value-1"
+    await settle()
+    assert refresh.calls == 1
+    assert cache.stats.stale == 2
+    assert await cache.get("k", load, ttl=10) == "value-1"  # the refreshed value
+    assert cache.stats.hits == 1
+
+
+async def test_too_stale_entries_are_reloaded(clock):
+    cache = QueryCache(max_entries=10, max_stale=60)
+    load = Loader()
+    await cache.get("k", load, ttl=10)
+    clock.now += 71
+    assert await cache.get("k", load, ttl=10) == "value-2"
+    assert cache.stats.misses == 2
+
+
+async def test_concurrent_misses_share_one_load(clock):
+    cache = QueryCache(max_entries=10, max_stale=60)
+    load = Loader()
+    results = await asyncio.gather(*(cache.get("k", load, ttl=10) for _ in range(3)))
+    assert results == ["value-1"] * 3
+    assert load.calls == 1
+
+
+async def test_memory_tier_evicts_least_recently_used(clock):
+    cache = QueryCache(max_entries=2, max_stale=60)
+    loads = {k: Loader() for k in "abc"}
+    for k in "ab":
+        await cache.get(k, loads[k], ttl=10)
+    await cache.get("a", loads["a"], ttl=10)
+    await cache.get("c", loads["c"], ttl=10)
+    await cache.get("b", loads["b"], ttl=10)
+    assert loads["a"].calls == 1
+    assert loads["b"].calls == 2
+
+
+async def test_disk_tier_survives_restart(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    first = QueryCache(max_entries=10, max_stale=60, disk=DiskCache(path, 60))
+    await first.get("k", Loader(), ttl=10)
+    first.close()
+
+    restarted = QueryCache(max_entries=10, max_stale=60, disk=DiskCache(path, 60))
+    load = Loader()
+    clock.now += 30
+    assert await restarted.get("k", load, ttl=10) == "value-1"
+    assert restarted.stats.disk_hits == 1
+    restarted.close()
+
+
+async def test_unreadable_disk_entries_are_misses_and_deleted(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    disk = DiskCache(path, 60)
+    disk.put("k", "old", clock.now + 10)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE cache SET value = ? WHERE key = ?", (b"not a pickle", "k"))
+
+    assert disk.get("k") is None
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM cache").fetchone() == (0,)
+
+    disk.put("k", "old", clock.now + 10)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE cache SET value = ? WHERE key = ?", (b"not a pickle", "k"))
+    cache = QueryCache(max_entries=10, max_stale=60, disk=disk)
+    assert await cache.get("k", Loader(), ttl=10) == "value-1"
+    assert (cache.stats.misses, cache.stats.disk_hits) == (1, 0)
+    cache.close()
+
+
+def test_cache_key_depends_on_code_version(monkeypatch):
+    key = dependencies._cache_key("from(bucket: \"b\")", list)
+    assert key == dependencies._cache_key("from(bucket: \"b\")", list)
+    monkeypatch.setattr(dependencies, "CACHE_SCHEMA", dependencies.CACHE_SCHEMA + 1)
+    assert dependencies._cache_key("from(bucket: \"b\")", list) != key
+
+    monkeypatch.undo()
+    monkeypatch.setattr(dependencies, "_code_version", lambda module: "other")
+    assert dependencies._cache_key("from(bucket: \"b\")", list) != key
+
+
+def test_cache_key_versions_the_wrapped_consumer(monkeypatch):
+    def consume(rows):
+        return list(rows)
+
+    versions = {__name__: "v1"}
+    monkeypatch.setattr(dependencies, "_code_version", lambda module: versions.get(module, "other"))
+    wrapped = Bounded(consume, max_rows=10)
+    key = dependencies._cache_key("from(bucket: \"b\")", wrapped)
+
+    versions[__name__] = "v2"
+    assert dependencies._cache_key("from(bucket: \"b\")", wrapped) != key
+    assert dependencies._cache_key("from(bucket: \"b\")", Bounded(list)) == dependencies._cache_key(
+        "from(bucket: \"b\")", Bounded(list)
+    )
+
+
+def test_venue_cache_key_is_versioned(monkeypatch):
+    venue = SimpleNamespace(id="v", bucket="b", scope_filter="")
+    key = venue_routes._venue_cache_key(venue)
+    monkeypatch.setattr(dependencies, "CACHE_SCHEMA", dependencies.CACHE_SCHEMA + 1)
+    assert venue_routes._venue_cache_key(venue) != key
+
+    monkeypatch.undo()
+    monkeypatch.setattr(dependencies, "_code_version", lambda module: "other")
+    assert venue_routes._venue_cache_key(venue) != key
@@ -0,0 +1,208 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.database.query_scheduler import BACKGROUND, EXPORT, INTERACTIVE, QueryRejected, QueryScheduler
+
+
+def make_scheduler(max_concurrency=2, max_queued=4, queue_timeout=5.0, **limits):
+    class_limits = {INTERACTIVE: max_concurrency, EXPORT: max_concurrency, BACKGROUND: max_concurrency}
+    class_limits.update(limits)
+    return QueryScheduler(max_concurrency, class_limits, max_queued, queue_timeout)
+
+
+class Gate:
+    """A blocking query function that returns ``value`` once opened."""
+
+    def __init__(self, value="result"):
+        self.value = value
+        self.calls = 0
+        self.entered = threading.Event()
+        self.opened = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.entered.set()
+        assert self.opened.wait(5)
+        return self.value
+
+
+async def settle():
+    """Let scheduled tasks reach their next await."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def wait_entered(gate):
+    assert await asyncio.to_thread(gate.entered.wait, 5)
+
+
+async def test_identical_queries_share_one_execution():
+    scheduler = make_scheduler()
+    gate = Gate()
+    first = asyncio.ensure_future(scheduler.run("q", gate))
+    await wait_entered(gate)
+    second = asyncio.ensure_future(scheduler.run("q", gate))
+    await settle()
+    gate.opened.set()
+
+    assert await asyncio.gather(first, second) == ["result", "result"]
+    assert gate.calls == 1
+    assert scheduler.stats.started == 1
+    assert scheduler.stats.deduplicated == 1
+    assert scheduler.stats.running[INTERACTIVE] == 0
+
+
+async def test_errors_reach_every_caller():
+    scheduler = make_scheduler()
+    entered = threading.Event()
+    opened = threading.Event()
+
+    def failing():
+        entered.set()
+        opened.wait(5)
+        raise ValueError("boom")
+
+    first = asyncio.ensure_future(scheduler.run("q", failing))
+    await asyncio.to_thread(entered.wait, 5)
+    second = asyncio.ensure_future(scheduler.run("q", failing))
+    await settle()
+    opened.set()
+
+    results = await asyncio.gather(first, second, return_exceptions=True)
+    assert [type(r) for r in results] == [ValueError, ValueError]
+
+
+async def test_cancelled_leader_does_not_fail_followers():
+    scheduler = make_scheduler()
+    gate = Gate()
+    leader = asyncio.ensure_future(scheduler.run("q", gate))
+    await wait_entered(gate)
+    follower = asyncio.ensure_future(scheduler.run("q", gate))
+    await settle()
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    gate.opened.set()
+
+    assert await follower == "result"
+    assert gate.calls == 1
+
+
+async def test_leader_timeout_does_not_fail_followers():
+    scheduler = make_scheduler()
+    gate = Gate()
+
+    async def refresh_job():
+        await asyncio.wait_for(scheduler.run("q", gate, BACKGROUND), 0.05)
+
+    job = asyncio.ensure_future(refresh_job())
+    await wait_entered(gate)
+    follower = asyncio.ensure_future(scheduler.run("q", gate))
+    with pytest.raises(asyncio.TimeoutError):
+        await job
+    gate.opened.set()
+
+    assert await follower == "result"
+
+
+async def test_query_is_cancelled_when_no_caller_is_left():
+    scheduler = make_scheduler(max_concurrency=1)
+    gate = Gate()
+    running = asyncio.ensure_future(scheduler.run("a", gate))
+    await wait_entered(gate)
+    queued = asyncio.ensure_future(scheduler.run("b", lambda: "b"))
+    await settle()
+    assert scheduler.stats.queued[INTERACTIVE] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    await settle()
+    assert scheduler.stats.queued[INTERACTIVE] == 0
+    assert "b" not in scheduler._inflight
+
+    # a new call with the same key starts over instead of joining the cancelled one
+    retry = asyncio.ensure_future(scheduler.run("b", lambda: "b"))
+    gate.opened.set()
+    assert await running == "result"
+    assert await retry == "b"
+    assert scheduler.stats.running[INTERACTIVE] == 0
+
+
+async def test_full_queue_sheds_lower_priority_waiter():
+    scheduler = make_scheduler(max_concurrency=1, max_queued=1)
+    gate = Gate()
+    running = asyncio.ensure_future(scheduler.run("running", gate))
+    await wait_entered(gate)
+    background = asyncio.ensure_future(scheduler.run("background", lambda: "bg", BACKGROUND))
+    await settle()
+    interactive = asyncio.ensure_future(scheduler.run("interactive", lambda: "ui"))
+    await settle()
+
+    with pytest.raises(QueryRejected) as rejected:
+        await background
+    assert rejected.value.query_class == BACKGROUND
+
+    # nothing lower to shed: the newcomer itself is rejected
+    with pytest.raises(QueryRejected):
+        await scheduler.run("another", lambda: "x")
+
+    gate.opened.set()
+    assert await running == "result"
+    assert await interactive == "ui"
+    assert scheduler.stats.rejected == 2
+
+
+async def test_queue_timeout_rejects():
+    scheduler = make_scheduler(max_concurrency=1, queue_timeout=0.05)
+    gate = Gate()
+    running = asyncio.ensure_future(scheduler.run("running", gate))
+    await wait_entered(gate)
+
+    with pytest.raises(QueryRejected):
+        await scheduler.run("waiting", lambda: "late")
+    assert scheduler.stats.timed_out == 1
+
+    gate.opened.set()
+    await running
+
+
+async def test_freed_slots_go_to_higher_priority_first():
+    scheduler = make_scheduler(max_concurrency=1)
+    gate = Gate()
+    order = []
+    running = asyncio.ensure_future(scheduler.run("running", gate))
+    await wait_entered(gate)
+    background = asyncio.ensure_future(scheduler.run("bg", lambda: order.append(BACKGROUND), BACKGROUND))
+    await settle()
+    interactive = asyncio.ensure_future(scheduler.run("ui", lambda: order.append(INTERACTIVE)))
+    await settle()
+
+    gate.opened.set()
+    await asyncio.gather(running, background, interactive)
+    assert order == [INTERACTIVE, BACKGROUND]
+
+
+async def test_cancelled_query_holds_its_slot_until_the_thread_returns():
+    scheduler = make_scheduler(max_concurrency=1)
+    gate = Gate()
+    abandoned = asyncio.ensure_future(scheduler.run("a", gate))
+    await wait_entered(gate)
+    abandoned.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+    await settle()
+    assert "a" not in scheduler._inflight
+
+    # the worker thread is still running the query, so the retry has to wait
+    retry = asyncio.ensure_future(scheduler.run("a", lambda: "retried"))
+    await settle()
+    assert scheduler.stats.running[INTERACTIVE] == 1
+    assert scheduler.stats.queued[INTERACTIVE] == 1
+
+    gate.opened.set()
+    assert await retry == "retried"
+    assert scheduler.stats.running[INTERACTIVE] == 0
@@ -0,0 +1,108 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.services.sketches import _leading_zeros, compress, grouped_quantiles, hash64, hll_estimate, hll_registers
+
+QS = [0.01, 0.1, 0.5, 0.9, 0.99]
+
+
+def rank_error(values, estimates, qs):
+    """Largest distance between ``qs`` and the true ranks of the estimates."""
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    return np.abs(ranks - np.asarray(qs)).max()
+
+
+def digest(values, compression=100, group=0):
+    n = len(values)
+    return compress(np.full(n, group, dtype=np.int64), values, np.ones(n), compression)
+
+
+@pytest.mark.parametrize("distribution", ["normal", "exponential", "uniform"])
+def test_tdigest_quantiles_within_rank_error(distribution):
+    rng = np.random.default_rng(42)
+    values = {
+        "normal": lambda: rng.normal(50, 10, 100_000),
+        "exponential": lambda: rng.exponential(5, 100_000),
+        "uniform": lambda: rng.uniform(0, 100, 100_000),
+    }[distribution]()
+    group, means, weights = digest(values)
+    assert len(means) <= 100
+    assert weights.sum() == len(values)
+
+    estimates = grouped_quantiles(group, means, weights, 1, QS)[0]
+    assert rank_error(values, estimates, QS) < 0.005
+
+
+def test_tdigest_merged_digests_match_a_single_digest():
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(3, 1, 100_000)
+    parts = [digest(chunk) for chunk in np.array_split(values, 24)]
+    merged = compress(*(np.concatenate(column) for column in zip(*parts)), compression=100)
+
+    estimates = grouped_quantiles(*merged, 1, QS)[0]
+    assert rank_error(values, estimates, QS) < 0.005
+
+
+def test_tdigest_groups_are_independent():
+    rng = np.random.default_rng(3)
+    low, high = rng.uniform(0, 10, 5000), rng.uniform(90, 100, 5000)
+    group = np.r_[np.zeros(5000, dtype=np.int64), np.full(5000, 2, dtype=np.int64)]
+    centroids = compress(group, np.r_[low, high], np.ones(10_000), 100)
+
+    medians = grouped_quantiles(*centroids, 3, [0.5])[:, 0]
+    assert medians[0] == pytest.approx(np.median(low), abs=0.2)
+    assert np.isnan(medians[1])
+    assert medians[2] == pytest.approx(np.median(high), abs=0.2)
+
+
+def test_tdigest_small_inputs():
+    group, means, weights = digest(np.array([5.0]))
+    assert grouped_quantiles(group, means, weights, 1, [0.0, 0.5, 1.0]).tolist() == [[5.0, 5.0, 5.0]]
+    empty = digest(np.array([], dtype=np.float64))
+    assert np.isnan(grouped_quantiles(*empty, 2, [0.5])).all()
+
+
+def registers(keys, precision=12, n_groups=1, group=None):
+    hashes = hash64(keys)
+    group = np.zeros(len(hashes), dtype=np.int64) if group is None else group
+    return hll_registers(group, hashes, n_groups, precision)
+
+
+@pytest.mark.parametrize("n", [10, 1000, 20_000, 200_000])
+def test_hll_estimate_within_error_bound(n):
+    # standard error at precision 12 is 1.04 / sqrt(4096) = 1.6%; allow 3 sigma
+    estimate = hll_estimate(registers(f"client-{i}" for i in range(n)))[0]
+    assert estimate == pytest.approx(n, rel=0.05)
+
+
+def test_hll_ignores_duplicates_and_merges_by_maximum():
+    first = registers([f"client-{i}" for i in range(6000)] * 3)
+    second = registers(f"client-{i}" for i in range(4000, 10_000))
+    union = registers(f"client-{i}" for i in range(10_000))
+
+    assert np.array_equal(np.maximum(first, second), union)
+    assert hll_estimate(first)[0] == pytest.approx(6000, rel=0.05)
+    assert hll_estimate(union)[0] == pytest.approx(10_000, rel=0.05)
+
+
+def test_hll_groups_are_independent():
+    keys = [f"client-{i}" for i in range(3000)]
+    group = np.r_[np.zeros(1000, dtype=np.int64), np.full(2000, 1, dtype=np.int64)]
+    estimates = hll_estimate(registers(keys, n_groups=3, group=group))
+    assert estimates[0] == pytest.approx(1000, rel=0.05)
+    assert estimates[1] == pytest.approx(2000, rel=0.05)
+    assert estimates[2] == 0
+
+
+def test_hash64_is_stable():
+    assert hash64(["a", "a", "b"]).tolist()[0] == hash64(["a"]).tolist()[0]
+    assert hash64(["a"]).tolist() != hash64(["b"]).tolist()
+    assert hash64(["client"]).tolist() == [int.from_bytes(hashlib.blake2b(b"client", digest_size=8).digest(), "little")]
+
+
+def test_leading_zeros_is_exact():
+    values = [0, 1, 2**31, 2**32 - 1, 2**32, 2**53 + 1, 2**63, 2**64 - 1]
+    expected = [64 - v.bit_length() for v in values]
+    assert _leading_zeros(np.array(values, dtype=np.uint64)).tolist() == expected
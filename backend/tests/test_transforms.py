@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.database.flux_csv import FluxRowStream
+from app.services.transforms import (
+    ColumnReader, first_index, group_keys, pivot, runs, to_datetimes, window_means,
+)
+
+# two tables with different layouts: the second lacks the "ap" tag, has an
+# empty value cell and a #default for "zone"
+RESPONSE = (
+    "#datatype,string,long,dateTime:RFC3339,double,string,string,string\r\n"
+    "#group,false,false,false,false,true,true,true\r\n"
+    "#default,_result,,,,,,\r\n"
+    ",result,table,_time,_value,_field,zone,ap\r\n"
+    ",,0,2024-01-01T00:00:00Z,1.5,cpu,z1,a\r\n"
+    ",,0,2024-01-01T00:01:00.123456Z,2,cpu,z1,b\r\n"
+    "\r\n"
+    "#datatype,string,long,dateTime:RFC3339,long,string,string\r\n"
+    "#group,false,false,false,false,true,true\r\n"
+    "#default,_result,,,,,z0\r\n"
+    ",result,table,_time,_value,_field,zone\r\n"
+    ",,1,2024-01-01T00:02:00Z,7,clients,\r\n"
+    ",,1,2024-01-01T00:03:00Z,,clients,z2\r\n"
+    ",,1,,9,clients,z2\r\n"
+)
+
+
+class Response:
+    """Streams the body in small chunks, like urllib3."""
+
+    def __init__(self, body):
+        self.body = body.encode()
+
+    def stream(self, size):
+        for i in range(0, len(self.body), 7):
+            yield self.body[i:i + 7]
+
+    def release_conn(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def read_both(reader):
+    return reader(FluxRowStream(Response(RESPONSE))), reader(list(FluxRowStream(Response(RESPONSE))))
+
+
+@pytest.mark.parametrize("reader", [
+    ColumnReader(tags=("_field", "zone", "ap")),
+    ColumnReader(tags=("zone", "missing")),
+    ColumnReader(tags=("zone",), numeric=False),
+])
+def test_block_reader_matches_row_reader(reader):
+    blocks, rows = read_both(reader)
+    assert len(blocks) == len(rows) == 5
+    assert np.array_equal(blocks.time, rows.time, equal_nan=True)
+    if reader.numeric:
+        assert np.array_equal(blocks.value, rows.value, equal_nan=True)
+    else:
+        assert blocks.value.tolist() == rows.value.tolist() == [1.5, 2.0, 7, None, 9]
+    assert blocks.tags.keys() == rows.tags.keys()
+    for name in reader.tags:
+        assert blocks.tags[name].tolist() == rows.tags[name].tolist()
+
+
+def test_block_reader_values():
+    cols, _ = read_both(ColumnReader(tags=("zone", "ap")))
+    assert cols.time[1] == np.datetime64("2024-01-01T00:01:00.123456", "ns")
+    assert np.isnat(cols.time[4])
+    assert np.array_equal(cols.value, [1.5, 2.0, 7.0, np.nan, 9.0], equal_nan=True)
+    assert cols.tags["zone"].tolist() == ["z1", "z1", "z0", "z2", "z2"]
+    assert cols.tags["ap"].tolist() == ["a", "b", "", "", ""]
+
+
+def test_empty_response():
+    cols = ColumnReader(tags=("zone",))(FluxRowStream(Response("")))
+    assert len(cols) == 0 and cols.tags["zone"].tolist() == []
+
+
+def test_to_datetimes_shares_objects_and_maps_nat_to_none():
+    times = np.array(["2024-01-01T00:00:00.5", "NaT", "2024-01-01T00:00:00.5"], dtype="datetime64[ns]")
+    first, missing, again = to_datetimes(times)
+    assert first == datetime(2024, 1, 1, 0, 0, 0, 500000, tzinfo=timezone.utc)
+    assert missing is None and again is first
+
+
+def test_group_keys_round_trip():
+    rng = np.random.default_rng(0)
+    a, b = rng.integers(0, 3, 50), rng.integers(0, 4, 50)
+    group, n, (key_a, key_b) = group_keys((a, 3), (b, 4))
+    assert n == len({*zip(a.tolist(), b.tolist())})
+    assert np.array_equal(key_a[group], a) and np.array_equal(key_b[group], b)
+    # groups are ordered by the first column, then the second
+    assert list(zip(key_a.tolist(), key_b.tolist())) == sorted(zip(key_a.tolist(), key_b.tolist()))
+
+
+def test_pivot_drops_unlisted_columns_and_later_rows_win():
+    grid = pivot(np.array([0, 1, 0, 1]), 2, np.array([1, -1, 1, 0]), 2, np.array([1.0, 2.0, 3.0, 4.0]))
+    assert np.array_equal(grid, [[np.nan, 3.0], [4.0, np.nan]], equal_nan=True)
+
+
+def test_runs_and_first_index():
+    assert runs(np.array([0, 0, 2]), 3).tolist() == [0, 2, 2, 3]
+    assert first_index(np.array([1, 0, 1, 0]), 3).tolist() == [1, 0, 4]
+
+
+def test_window_means_edges():
+    times = np.array([0.0, 9.99, 10.0, 25.0, 30.0])
+    values = np.array([[1.0, 3.0, 5.0, 7.0, 100.0]])
+    ends, means = window_means(times, values, 0.0, 30.0, 10.0)
+    # windows are [start, end) and stamped with their end; samples at stop are left out
+    assert ends.tolist() == [10.0, 20.0, 30.0]
+    assert means.tolist() == [[2.0, 5.0, 7.0]]
+
+    ends, means = window_means(times, values, 5.0, 26.0, 10.0)
+    # the last window is stamped with stop; samples before start are left out
+    assert ends.tolist() == [10.0, 20.0, 26.0]
+    assert means.tolist() == [[3.0, 5.0, 7.0]]
+
+
+def test_window_means_skips_empty_windows_and_nan():
+    times = np.array([0.0, 5.0, 35.0])
+    values = np.array([[1.0, np.nan, 4.0], [np.nan, np.nan, 2.0]])
+    ends, means = window_means(times, values, 0.0, 50.0, 10.0)
+    assert ends.tolist() == [10.0, 40.0]
+    assert np.array_equal(means, [[1.0, 4.0], [np.nan, 2.0]], equal_nan=True)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.database import write_buffer as write_buffer_module
+from app.database.write_buffer import BufferFull, WriteBuffer
+
+
+class FakeInflux:
+    """Records writes; ``fail`` makes the next writes raise."""
+
+    def __init__(self):
+        self.writes = []
+        self.fail = 0
+        self.block = None
+
+    def write(self, bucket, record, precision):
+        if self.block is not None:
+            self.block.wait(5)
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("influx down")
+        self.writes.append((bucket, precision, record.split("\n")))
+
+
+@pytest.fixture
+def influx(monkeypatch):
+    fake = FakeInflux()
+    monkeypatch.setattr(write_buffer_module.influx_service, "write", fake.write)
+    return fake
+
+
+def make_buffer(max_lines=100, batch_size=3, flush_interval=60.0, max_retries=2, retry_backoff=0.01):
+    return WriteBuffer(max_lines, batch_size, flush_interval, max_retries, retry_backoff)
+
+
+def lines(prefix, n):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+async def test_flush_batches_per_destination_in_order(influx):
+    buffer = make_buffer()
+    buffer.submit("a", lines("a", 2))
+    buffer.submit("b", lines("b", 1), precision="s")
+    buffer.submit("a", lines("x", 3))
+    await buffer.flush()
+
+    assert influx.writes == [
+        ("a", "ns", ["a0", "a1", "x0"]),
+        ("b", "s", ["b0"]),
+        ("a", "ns", ["x1", "x2"]),
+    ]
+    assert buffer.pending == 0
+    assert buffer.stats.written == 6
+    assert buffer.stats.batches == 3
+
+
+async def test_submit_rejects_when_full(influx):
+    buffer = make_buffer(max_lines=4)
+    buffer.submit("a", lines("a", 3))
+    with pytest.raises(BufferFull):
+        buffer.submit("a", lines("b", 2))
+    assert buffer.stats.rejected == 2
+    assert buffer.pending == 3
+
+
+async def test_failed_writes_are_retried_then_dropped(influx):
+    buffer = make_buffer(max_retries=2)
+    influx.fail = 2
+    buffer.submit("a", lines("a", 2))
+    await buffer.flush()
+    assert influx.writes == [("a", "ns", ["a0", "a1"])]
+    assert buffer.stats.retries == 2
+
+    influx.fail = 3
+    buffer.submit("a", lines("b", 2))
+    await buffer.flush()
+    assert buffer.stats.dropped == 2
+    assert buffer.pending == 0
+
+
+async def test_stop_writes_everything_queued(influx):
+    buffer = make_buffer(batch_size=2)
+    buffer.start()
+    buffer.submit("a", lines("a", 5))
+    await buffer.stop()
+
+    assert [line for _, _, batch in influx.writes for line in batch] == lines("a", 5)
+    assert buffer.pending == 0
+
+
+async def test_stop_waits_for_the_flush_in_progress(influx):
+    buffer = make_buffer(batch_size=2, max_retries=3)
+    influx.fail = 2
+    buffer.start()
+    buffer.submit("a", lines("a", 4))  # a full batch wakes the flusher
+    await asyncio.sleep(0)
+    await buffer.stop()
+
+    assert [line for _, _, batch in influx.writes for line in batch] == lines("a", 4)
+    assert buffer.stats.dropped == 0
+    assert buffer.pending == 0
+
+
+async def test_cancelled_flush_requeues_its_batch(influx):
+    buffer = make_buffer(batch_size=2)
+    influx.block = threading.Event()
+    buffer.submit("a", lines("a", 3))
+    flush = asyncio.ensure_future(buffer.flush())
+    await asyncio.sleep(0.05)
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+    assert buffer.pending == 3
+
+    influx.block.set()
+    influx.writes.clear()
+    await asyncio.sleep(0.05)  # let the abandoned worker-thread write finish
+    influx.writes.clear()
+    await buffer.flush()
+    assert [line for _, _, batch in influx.writes for line in batch] == lines("a", 3)
+    assert buffer.pending == 0